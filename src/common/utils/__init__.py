@@ -8,6 +8,8 @@ from .file_utils import (
     is_image_file,
     is_video_file,
     get_file_size,
+    map_file,
+    ViewReader,
 )
 # Image utilities are conditionally available
 try:
@@ -45,6 +47,8 @@ __all__ = [
     "is_image_file",
     "is_video_file",
     "get_file_size",
+    "map_file",
+    "ViewReader",
     # Image utilities
     "load_image",
     "save_image",
@@ -3,6 +3,8 @@ File utility functions.
 """
 
 # Removed unused import os
+import io
+import mmap
 from pathlib import Path
 from typing import Union, List
 import mimetypes
@@ -128,3 +130,58 @@ def safe_filename(filename: str) -> str:
         safe_name = 'unnamed'
 
     return safe_name
+
+
+def map_file(file_path: Union[str, Path]) -> memoryview:
+    """Map a file into memory read-only, without copying it.
+
+    Pages are read on first access and shared with the OS page cache. The
+    mapping lives as long as the returned view (or slices of it); callers that
+    need to modify the data copy it with ``bytearray(view)``. The file must
+    not be truncated while mapped.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        Read-only memoryview of the file content
+    """
+    with open(file_path, 'rb') as f:
+        if Path(file_path).stat().st_size == 0:
+            return memoryview(b'')  # empty files cannot be mapped
+        # The mapping stays valid after the file is closed
+        return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+class ViewReader(io.RawIOBase):
+    """Seekable binary file over a bytes-like object that reads without copying it whole.
+
+    ``io.BytesIO(view)`` copies the whole buffer; decoders such as PIL only
+    need ``read``/``seek``/``tell``, so this copies just the chunks they read.
+    Each reader has its own position, so one view can be read by several
+    threads at once.
+    """
+
+    def __init__(self, content: Union[bytes, bytearray, memoryview]):
+        self._view = memoryview(content).cast('B')
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        n = max(0, min(len(buffer), len(self._view) - self._pos))
+        buffer[:n] = self._view[self._pos:self._pos + n]
+        self._pos += n
+        return n
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: len(self._view)}[whence]
+        self._pos = max(0, base + offset)
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
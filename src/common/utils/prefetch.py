@@ -0,0 +1,225 @@
+"""
+Bounded, backpressure-aware batch prefetching.
+
+A feeder thread pulls items from a source iterator, groups them into batches
+and submits each batch to a worker pool. The number of batches submitted but
+not yet consumed is capped, so a slow consumer blocks the feeder instead of
+dropping work or growing memory. End-of-stream and errors are explicit: the
+iterator stops only when the source is exhausted, and any exception raised by
+the source or a worker is re-raised in the consumer.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set
+
+from .logging_utils import get_logger
+
+
+def batched(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Group an iterable into lists of at most ``size`` items.
+
+    Args:
+        items: Items to group
+        size: Maximum items per list
+
+    Returns:
+        Iterator of lists
+    """
+    batch: List[Any] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class _EndOfStream:
+    """Marker put on the result queue after the last batch."""
+
+    def __init__(self, batches: int):
+        self.batches = batches
+
+
+class _SourceError:
+    """Marker carrying an exception raised while reading the source."""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+@dataclass
+class PrefetchStats:
+    """Queue-depth and wait-time metrics for one prefetch run."""
+    batches: int = 0
+    items: int = 0
+    max_in_flight: int = 0
+    ready_depth_total: int = 0  # sum over consumer reads of batches already finished
+    producer_blocked_seconds: float = 0.0  # feeder waiting on backpressure: consumer-bound
+    consumer_wait_seconds: float = 0.0  # consumer waiting on results: producer-bound
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summary for run reports."""
+        return {
+            'batches': self.batches,
+            'items': self.items,
+            'max_in_flight': self.max_in_flight,
+            'mean_ready_depth': self.ready_depth_total / self.batches if self.batches else 0.0,
+            'producer_blocked_seconds': self.producer_blocked_seconds,
+            'consumer_wait_seconds': self.consumer_wait_seconds,
+        }
+
+
+class BatchPrefetcher:
+    """Run ``func`` over batches of a source on N workers, ahead of the consumer.
+
+    Example:
+        prefetcher = BatchPrefetcher(load_batch, batch_size=32, workers=4)
+        for result in prefetcher.map(paths):
+            ...
+    """
+
+    def __init__(self, func: Callable[[List[Any]], Any], batch_size: int = 1,
+                 workers: int = 1, prefetch: Optional[int] = None, ordered: bool = True,
+                 use_processes: bool = False, name: str = "prefetch"):
+        """Initialize the prefetcher.
+
+        Args:
+            func: Called with each batch (a list of source items); must be
+                picklable when ``use_processes`` is set
+            batch_size: Source items per batch
+            workers: Worker threads or processes
+            prefetch: Maximum batches submitted but not yet consumed
+                (default: twice the worker count)
+            ordered: Yield results in source order; otherwise as they finish
+            use_processes: Use a process pool instead of threads
+            name: Name for the feeder thread and log messages
+        """
+        if batch_size < 1 or workers < 1:
+            raise ValueError("batch_size and workers must be at least 1")
+        self.func = func
+        self.batch_size = batch_size
+        self.workers = workers
+        self.prefetch = max(1, prefetch if prefetch is not None else 2 * workers)
+        self.ordered = ordered
+        self.use_processes = use_processes
+        self.name = name
+        self.stats = PrefetchStats()
+        self.logger = get_logger(f"wildlife_pipeline.{name}")
+        self._lock = threading.Lock()
+        self._in_flight = 0
+
+    def map(self, source: Iterable[Any]) -> Iterator[Any]:
+        """Yield ``func(batch)`` for each batch of ``source``.
+
+        Args:
+            source: Items to batch; iterated on the feeder thread
+
+        Returns:
+            Iterator of batch results
+        """
+        self.stats = PrefetchStats()
+        self._in_flight = 0
+        stop = threading.Event()
+        slots = threading.Semaphore(self.prefetch)
+        results: queue.Queue = queue.Queue()
+        pending: Set[Future] = set()
+        executor = self._executor()
+        feeder = threading.Thread(
+            target=self._feed, args=(source, executor, slots, results, stop, pending),
+            name=f"{self.name}-feeder", daemon=True
+        )
+        feeder.start()
+
+        try:
+            yield from self._consume(results, slots)
+            self.logger.debug(f"📊 {self.name}: {self.stats.to_dict()}")
+        finally:
+            stop.set()
+            feeder.join()
+            # Drop batches no worker has started (shutdown's cancel_futures needs Python 3.9)
+            for future in list(pending):
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    def _executor(self) -> Executor:
+        """Worker pool for one ``map`` call."""
+        if self.use_processes:
+            return ProcessPoolExecutor(max_workers=self.workers)
+        return ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=self.name)
+
+    def _feed(self, source: Iterable[Any], executor: Executor, slots: threading.Semaphore,
+              results: queue.Queue, stop: threading.Event, pending: Set[Future]) -> None:
+        """Batch the source and submit batches while slots are free."""
+        submitted = 0
+        try:
+            for batch in batched(source, self.batch_size):
+                if not self._submit(batch, executor, slots, results, stop, pending):
+                    return
+                submitted += 1
+        except BaseException as e:
+            results.put(_SourceError(e))
+            return
+        results.put(_EndOfStream(submitted))
+
+    def _submit(self, batch: List[Any], executor: Executor, slots: threading.Semaphore,
+                results: queue.Queue, stop: threading.Event, pending: Set[Future]) -> bool:
+        """Wait for a free slot and submit one batch; False when stopped."""
+        start = time.perf_counter()
+        while not slots.acquire(timeout=0.1):
+            if stop.is_set():
+                return False
+        self.stats.producer_blocked_seconds += time.perf_counter() - start
+        if stop.is_set():
+            slots.release()
+            return False
+
+        with self._lock:
+            self._in_flight += 1
+            self.stats.max_in_flight = max(self.stats.max_in_flight, self._in_flight)
+        self.stats.items += len(batch)
+
+        future = executor.submit(self.func, batch)
+        pending.add(future)
+        future.add_done_callback(pending.discard)
+        if self.ordered:
+            results.put(future)
+        else:
+            future.add_done_callback(results.put)
+        return True
+
+    def _consume(self, results: queue.Queue, slots: threading.Semaphore) -> Iterator[Any]:
+        """Yield batch results until end-of-stream, re-raising errors."""
+        expected: Optional[int] = None
+        consumed = 0
+
+        while expected is None or consumed < expected:
+            with results.mutex:
+                self.stats.ready_depth_total += sum(
+                    1 for item in results.queue if isinstance(item, Future) and item.done()
+                )
+
+            start = time.perf_counter()
+            message = results.get()
+            if isinstance(message, _SourceError):
+                raise message.error
+            if isinstance(message, _EndOfStream):
+                expected = message.batches
+                continue
+
+            try:
+                result = message.result()
+            finally:
+                self.stats.consumer_wait_seconds += time.perf_counter() - start
+                with self._lock:
+                    self._in_flight -= 1
+                slots.release()
+
+            consumed += 1
+            self.stats.batches += 1
+            yield result
@@ -0,0 +1,118 @@
+"""
+Shared-memory ring buffer for fixed-shape frames.
+
+Decode processes write uint8 frames into slots of one shared-memory block and
+pass only the slot index to the consumer, which reads the frame as a NumPy
+view without copying or pickling pixel data. Free slots circulate through a
+multiprocessing queue, so producers block when every slot is in use.
+"""
+
+import multiprocessing as mp
+import queue
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Optional, Tuple
+
+import numpy as np
+
+
+@dataclass
+class SharedFrameRingHandle:
+    """Picklable description of a ring, for attaching in worker processes."""
+    name: str
+    slots: int
+    shape: Tuple[int, ...]
+    dtype: str
+    free_slots: Any  # multiprocessing queue of free slot indices
+
+
+class SharedFrameRing:
+    """Fixed pool of shared-memory frame slots.
+
+    Example:
+        ring = SharedFrameRing(slots=32, shape=(640, 640, 3))
+        # worker: slot = ring.acquire(); ring.write(slot, frame); send slot
+        # consumer: frame = ring.view(slot); ...; ring.release(slot)
+    """
+
+    def __init__(self, slots: int, shape: Tuple[int, ...], dtype: str = "uint8",
+                 context: Optional[Any] = None):
+        """Create the shared block and fill the free-slot queue.
+
+        Args:
+            slots: Number of frame slots
+            shape: Shape of one slot (frames may be smaller, see ``view``)
+            dtype: Frame dtype
+            context: Multiprocessing context the workers will use
+        """
+        if slots < 1:
+            raise ValueError("slots must be at least 1")
+        self.slots = slots
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.slot_bytes = int(np.prod(self.shape)) * self.dtype.itemsize
+        self._owner = True
+        self._shm = shared_memory.SharedMemory(create=True, size=self.slot_bytes * slots)
+        self._free = (context or mp).Queue()
+        for slot in range(slots):
+            self._free.put(slot)
+
+    @classmethod
+    def attach(cls, handle: SharedFrameRingHandle) -> "SharedFrameRing":
+        """Attach to a ring created in another process."""
+        ring = cls.__new__(cls)
+        ring.slots = handle.slots
+        ring.shape = tuple(handle.shape)
+        ring.dtype = np.dtype(handle.dtype)
+        ring.slot_bytes = int(np.prod(ring.shape)) * ring.dtype.itemsize
+        ring._owner = False
+        # Workers started by multiprocessing share the creator's resource
+        # tracker, so the block is still unlinked exactly once, by the creator
+        ring._shm = shared_memory.SharedMemory(name=handle.name)
+        ring._free = handle.free_slots
+        return ring
+
+    def handle(self) -> SharedFrameRingHandle:
+        """Handle to pass to worker processes (e.g. as initializer args)."""
+        return SharedFrameRingHandle(self._shm.name, self.slots, self.shape, self.dtype.str, self._free)
+
+    def acquire(self, timeout: Optional[float] = None) -> int:
+        """Take a free slot, blocking until one is released.
+
+        Raises:
+            TimeoutError: No slot became free within ``timeout`` seconds
+        """
+        try:
+            return self._free.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No free frame slot within {timeout}s") from None
+
+    def release(self, slot: int) -> None:
+        """Return a slot to the pool once its frame has been consumed."""
+        self._free.put(slot)
+
+    def write(self, slot: int, frame: np.ndarray) -> Tuple[int, ...]:
+        """Copy a frame into a slot and return its shape for ``view``."""
+        if frame.dtype != self.dtype or frame.size > int(np.prod(self.shape)):
+            raise ValueError(f"Frame {frame.shape} {frame.dtype} does not fit slot {self.shape} {self.dtype}")
+        self.view(slot, frame.shape)[...] = frame
+        return frame.shape
+
+    def view(self, slot: int, shape: Optional[Tuple[int, ...]] = None) -> np.ndarray:
+        """Zero-copy NumPy view of a slot; valid until the slot is released."""
+        if not 0 <= slot < self.slots:
+            raise IndexError(f"Slot {slot} out of range (0-{self.slots - 1})")
+        shape = tuple(shape) if shape is not None else self.shape
+        return np.ndarray(shape, dtype=self.dtype, buffer=self._shm.buf, offset=slot * self.slot_bytes)
+
+    def close(self) -> None:
+        """Detach, and free the block when this process created it."""
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+    def __enter__(self) -> "SharedFrameRing":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
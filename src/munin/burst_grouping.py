@@ -0,0 +1,157 @@
+"""
+Burst grouping for camera-trap image sequences.
+
+Camera traps fire bursts of 3-10 shots seconds apart. Frames are grouped per
+camera by timestamp gap and perceptual-hash (dHash) distance, computed on the
+EXIF thumbnail when present and a reduced JPEG decode otherwise, so detection
+can run on one representative frame per burst.
+"""
+
+from __future__ import annotations
+
+import io
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+import exifread
+import numpy as np
+from PIL import Image
+
+from ..common.utils.file_utils import ViewReader
+from .exif_extractor import get_timestamp_from_exif
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# dHash grid: (HASH_SIZE + 1) x HASH_SIZE grayscale pixels -> HASH_SIZE**2 bits
+HASH_SIZE = 8
+
+
+@dataclass
+class BurstConfig:
+    """Configuration for burst grouping."""
+    enabled: bool = False
+    max_gap_seconds: float = 5.0
+    max_hash_distance: int = 12  # Hamming distance out of 64 bits
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> BurstConfig:
+        """Create from stage configuration."""
+        return cls(**{k: v for k, v in data.items() if k in cls.__dataclass_fields__})
+
+
+@dataclass
+class FrameSignature:
+    """Per-frame data used for grouping."""
+    key: Any  # caller's handle for the frame, e.g. a StorageLocation
+    camera_id: str
+    timestamp: datetime | None
+    dhash: int
+    sort_key: str = ""
+
+
+@dataclass
+class Burst:
+    """Frames from one trigger of one camera."""
+    burst_id: str
+    frames: list[FrameSignature] = field(default_factory=list)
+
+    @property
+    def representative(self) -> FrameSignature:
+        """Middle frame: least likely to catch an animal half out of view."""
+        return self.frames[len(self.frames) // 2]
+
+    @property
+    def others(self) -> list[FrameSignature]:
+        """Frames other than the representative, in capture order."""
+        rep = self.representative
+        return [frame for frame in self.frames if frame is not rep]
+
+
+def dhash(image: Image.Image, hash_size: int = HASH_SIZE) -> int:
+    """Difference hash of an image."""
+    pixels = np.asarray(image.convert('L').resize((hash_size + 1, hash_size), Image.BILINEAR), dtype=np.int16)
+    bits = (pixels[:, 1:] > pixels[:, :-1]).flatten()
+    return int(sum(1 << i for i, bit in enumerate(bits) if bit))
+
+
+def hamming(a: int, b: int) -> int:
+    """Number of differing bits between two hashes."""
+    return bin(a ^ b).count('1')
+
+
+def frame_signature(content: bytes | memoryview, key: Any, camera_id: str, sort_key: str = "",
+                    fetch: Callable[[], bytes | memoryview] | None = None) -> FrameSignature:
+    """
+    Read timestamp and dHash for a frame.
+
+    Uses the EXIF thumbnail when the file carries one, otherwise a draft-mode
+    (1/8 scale) JPEG decode.
+
+    Args:
+        content: The image, or just its header when ``fetch`` is given
+        key: Caller's handle for the frame
+        camera_id: Camera the frame belongs to
+        sort_key: Tie-breaker for frames with equal timestamps
+        fetch: Reads the whole image for the draft decode when the header
+            carries no EXIF thumbnail
+    """
+    try:
+        tags = exifread.process_file(ViewReader(content), details=False, extract_thumbnail=True)
+    except Exception:
+        tags = {}
+
+    # exifread keys look like "EXIF DateTimeOriginal"
+    exif = {str(k).split(' ', 1)[-1]: str(v) for k, v in tags.items() if k != 'JPEGThumbnail'}
+    timestamp = get_timestamp_from_exif(exif)
+
+    thumbnail = tags.get('JPEGThumbnail')
+    try:
+        if thumbnail:
+            source = Image.open(io.BytesIO(thumbnail))
+        else:
+            source = Image.open(ViewReader(fetch() if fetch is not None else content))
+        source.draft('L', (64, 64))
+        frame_hash = dhash(source)
+    except Exception:
+        frame_hash = 0
+
+    return FrameSignature(key=key, camera_id=camera_id, timestamp=timestamp, dhash=frame_hash, sort_key=sort_key)
+
+
+def group_bursts(frames: list[FrameSignature], config: BurstConfig) -> list[Burst]:
+    """
+    Group frames into bursts per camera.
+
+    A frame joins the current burst when it follows the previous frame within
+    ``max_gap_seconds`` and its hash is within ``max_hash_distance``. Frames
+    without a timestamp always start a new burst.
+    """
+    by_camera: dict[str, list[FrameSignature]] = {}
+    for frame in frames:
+        by_camera.setdefault(frame.camera_id, []).append(frame)
+
+    bursts: list[Burst] = []
+    for camera_id in sorted(by_camera):
+        camera_frames = sorted(
+            by_camera[camera_id],
+            key=lambda f: (f.timestamp is None, f.timestamp or datetime.min, f.sort_key)
+        )
+
+        current: Burst | None = None
+        for frame in camera_frames:
+            if current is not None and _continues_burst(current.frames[-1], frame, config):
+                current.frames.append(frame)
+                continue
+            current = Burst(burst_id=f"{camera_id}:{len(bursts):06d}", frames=[frame])
+            bursts.append(current)
+
+    return bursts
+
+
+def _continues_burst(previous: FrameSignature, frame: FrameSignature, config: BurstConfig) -> bool:
+    if previous.timestamp is None or frame.timestamp is None:
+        return False
+    gap = (frame.timestamp - previous.timestamp).total_seconds()
+    return 0 <= gap <= config.max_gap_seconds and hamming(previous.dhash, frame.dhash) <= config.max_hash_distance
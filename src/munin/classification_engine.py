@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Sequence
+
+import numpy as np
 
 if TYPE_CHECKING:
     from PIL import Image
@@ -22,10 +24,34 @@ class YOLOClassifier:
 
     def predict_image(self, img: Image.Image) -> ClsResult:
         r = self.model.predict(img, conf=self.conf, verbose=False)[0]
+        return self._to_result(r)
+
+    def predict_batch(self, crops: Any | Sequence[Any]) -> list[ClsResult]:
+        """Classify a whole batch of crops in one model call.
+
+        Args:
+            crops: Stacked float tensor (N, 3, H, W) in [0, 1], stacked uint8
+                array (N, H, W, 3), or a list of RGB uint8 arrays / PIL images
+
+        Returns:
+            One ClsResult per crop, in input order
+        """
+        if len(crops) == 0:
+            return []
+
+        if hasattr(crops, 'ndim') and crops.ndim == 4 and not isinstance(crops, np.ndarray):
+            # torch tensor, already normalized BCHW
+            source = crops
+        else:
+            # Ultralytics treats numpy inputs as BGR; our crops are decoded as RGB
+            source = [np.ascontiguousarray(np.asarray(crop)[..., ::-1]) for crop in crops]
+
+        results = self.model.predict(source, conf=self.conf, verbose=False)
+        return [self._to_result(r) for r in results]
+
+    def _to_result(self, r) -> ClsResult:
         # Ultralytics cls: r.probs.top1, r.names, r.probs.top1conf
         top1 = int(r.probs.top1)
         name = r.names[top1]
         conf = float(r.probs.top1conf)
         return ClsResult(label=name, confidence=conf)
-
-
@@ -15,19 +15,39 @@ Usage:
     python -m wildlife_pipeline.cloud.cli stage1 --profile cloud --input s3://bucket/data --output s3://bucket/results
 """
 
+from .checkpoint import RunCheckpoint
 from .cli import main
 from .config import CloudConfig
+from .gating import GatingStats, Stage2GatingPolicy
+from .inference_cache import InferenceCache
+from .inference_server import (
+    InferenceClient,
+    InferenceServer,
+    InferenceServerConfig,
+    RemoteModel,
+)
 from .interfaces import (
     ManifestEntry,
     ModelProvider,
+    ObjectInfo,
     PipelineConfig,
     QueueAdapter,
     Runner,
     Stage2Entry,
     StorageAdapter,
     StorageLocation,
+    UploadStream,
+)
+from .manifest_io import EntryWriter, read_entries, write_entries
+from .metadata import ImageMetadata, iter_image_metadata
+from .models import (
+    CloudModelProvider,
+    LocalModelProvider,
+    ModelVariant,
+    ModelVariantRegistry,
+    OnnxModel,
+    create_model_provider,
 )
-from .models import CloudModelProvider, LocalModelProvider, create_model_provider
 from .queue import (
     NoQueueAdapter,
     PubSubAdapter,
@@ -37,23 +57,36 @@ from .queue import (
 )
 from .runners import CloudBatchRunner, EventDrivenRunner, LocalRunner, create_runner
 from .storage import GCSAdapter, LocalFSAdapter, S3Adapter, create_storage_adapter
+from .storage_cache import CachingStorageAdapter
 
 __all__ = [
     # Interfaces
     'StorageAdapter', 'QueueAdapter', 'ModelProvider', 'Runner',
-    'StorageLocation', 'ManifestEntry', 'Stage2Entry', 'PipelineConfig',
+    'StorageLocation', 'ObjectInfo', 'UploadStream', 'ManifestEntry', 'Stage2Entry', 'PipelineConfig',
 
     # Storage
-    'create_storage_adapter', 'LocalFSAdapter', 'S3Adapter', 'GCSAdapter',
+    'create_storage_adapter', 'LocalFSAdapter', 'S3Adapter', 'GCSAdapter', 'CachingStorageAdapter',
+    'ImageMetadata', 'iter_image_metadata',
+
+    # Manifest and predictions files
+    'EntryWriter', 'read_entries', 'write_entries',
 
     # Queue
     'create_queue_adapter', 'NoQueueAdapter', 'RedisQueueAdapter', 'SQSAdapter', 'PubSubAdapter',
 
     # Models
     'create_model_provider', 'LocalModelProvider', 'CloudModelProvider',
+    'ModelVariant', 'ModelVariantRegistry', 'OnnxModel',
+
+    # Inference cache and server
+    'InferenceCache',
+    'InferenceServer', 'InferenceServerConfig', 'InferenceClient', 'RemoteModel',
+
+    # Stage-2 gating
+    'Stage2GatingPolicy', 'GatingStats',
 
     # Runners
-    'create_runner', 'LocalRunner', 'CloudBatchRunner', 'EventDrivenRunner',
+    'create_runner', 'LocalRunner', 'CloudBatchRunner', 'EventDrivenRunner', 'RunCheckpoint',
 
     # Configuration
     'CloudConfig',
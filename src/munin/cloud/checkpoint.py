@@ -0,0 +1,105 @@
+"""
+Progressive checkpoints for resumable Stage-1/Stage-2 runs.
+
+Every N inputs a runner appends a shard of finished output rows and then a
+progress marker naming the inputs the shard covers. The marker is written
+last, so a shard only counts once it is complete. After a crash or a spot
+interruption the next run loads the committed shards and processes only the
+inputs they do not cover; the checkpoint is cleared once the final output has
+been written.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Any
+
+from ...common.utils.logging_utils import get_logger
+from .interfaces import StorageLocation
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+
+logger = get_logger("wildlife_pipeline.cloud.checkpoint")
+
+MARKER_SUFFIX = ".done.json"
+
+
+class RunCheckpoint:
+    """Output shards and progress markers for one stage of one run."""
+
+    def __init__(self, storage, prefix: str, run_hash: str, every: int = 1000):
+        """
+        Args:
+            storage: Storage adapter holding the checkpoint
+            prefix: Checkpoint location, e.g. ``<output>/stage1/checkpoint``
+            run_hash: Hash of everything that changes the output; shards
+                written under a different hash are discarded
+            every: Inputs per shard
+        """
+        self.storage = storage
+        self.every = max(1, every)
+        self.prefix = prefix.rstrip("/")
+        self.run_hash = run_hash
+        self.shards = 0
+        self.resumed_inputs = 0
+
+    def load(self) -> tuple[list[dict[str, Any]], set[str]]:
+        """Rows and input ids of every committed shard, in shard order."""
+        rows: list[dict[str, Any]] = []
+        done: set[str] = set()
+        markers = sorted(self.storage.list(StorageLocation.from_url(self.prefix), f"*{MARKER_SUFFIX}"),
+                         key=lambda location: location.path)
+        for marker_location in markers:
+            marker = json.loads(self.storage.get(marker_location))
+            if marker.get('run_hash') != self.run_hash:
+                logger.info(f"Discarding checkpoint {self.prefix}: written by a different run")
+                self.clear()
+                return [], set()
+
+            content = str(self.storage.get_view(self._location(marker['shard'])), 'utf-8')
+            rows.extend(json.loads(line) for line in content.splitlines() if line)
+            done.update(marker['inputs'])
+            self.shards = max(self.shards, marker['index'] + 1)
+
+        self.resumed_inputs = len(done)
+        if done:
+            logger.info(f"Resuming from checkpoint: {len(done)} inputs in {len(markers)} shards")
+        return rows, done
+
+    def write_shard(self, rows: Iterable[dict[str, Any]], inputs: Iterable[str]) -> None:
+        """Append a shard of output rows, then the marker that commits it."""
+        index = self.shards
+        shard = f"shard-{index:05d}.jsonl"
+        self.storage.put(self._location(shard), "\n".join(json.dumps(row) for row in rows).encode('utf-8'))
+        marker = {'run_hash': self.run_hash, 'index': index, 'shard': shard, 'inputs': list(inputs)}
+        self.storage.put(self._location(f"shard-{index:05d}{MARKER_SUFFIX}"), json.dumps(marker).encode('utf-8'))
+        self.shards += 1
+
+    def chunks(self, items: list[Any], size_of: Callable[[Any], int] = lambda item: 1) -> Iterator[list[Any]]:
+        """Split work items into shards of at least ``every`` inputs each."""
+        chunk: list[Any] = []
+        count = 0
+        for item in items:
+            chunk.append(item)
+            count += size_of(item)
+            if count >= self.every:
+                yield chunk
+                chunk, count = [], 0
+        if chunk:
+            yield chunk
+
+    def clear(self) -> None:
+        """Delete all shards and markers, markers first so no marker outlives its shard."""
+        prefix = StorageLocation.from_url(self.prefix)
+        for pattern in (f"*{MARKER_SUFFIX}", "shard-*.jsonl"):
+            for location in self.storage.list(prefix, pattern):
+                self.storage.delete(location)
+        self.shards = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Summary for the run report."""
+        return {'shards': self.shards, 'resumed_inputs': self.resumed_inputs}
+
+    def _location(self, name: str) -> StorageLocation:
+        return StorageLocation.from_url(f"{self.prefix}/{name}")
@@ -16,6 +16,13 @@ from typing import Any
 from ...common.utils.logging_utils import get_logger
 from .config import CloudConfig
 from .interfaces import ManifestEntry, Stage2Entry
+from .manifest_io import (
+    STAGE2_MANIFEST_COLUMNS,
+    STAGE3_MANIFEST_COLUMNS,
+    STAGE3_PREDICTION_COLUMNS,
+    find_entries_file,
+    read_entries,
+)
 from .stage3_reporting import Stage3Reporter
 
 # Initialize logger for cloud CLI
@@ -46,6 +53,10 @@ def create_parser() -> argparse.ArgumentParser:
     stage1_parser.add_argument("--max-aspect", type=float, help="Maximum aspect ratio")
     stage1_parser.add_argument("--edge-margin", type=int, help="Edge margin in pixels")
     stage1_parser.add_argument("--crop-padding", type=float, help="Crop padding ratio")
+    stage1_parser.add_argument("--fused", action="store_true",
+                              help="Run Stage-2 on crops in memory in the same pass (local runner)")
+    stage1_parser.add_argument("--save-crops", action="store_true",
+                              help="With --fused, persist all crops, not only those needing review")
 
     # Stage-2 command
     stage2_parser = subparsers.add_parser("stage2", help="Run Stage-2 processing")
@@ -73,6 +84,12 @@ def create_parser() -> argparse.ArgumentParser:
     stage3_parser.add_argument("--min-duration", type=float, default=5.0,
                               help="Minimum duration in seconds (default: 5.0)")
 
+    # Inference server command
+    serve_parser = subparsers.add_parser("serve", help="Run the local dynamic-batching inference server")
+    serve_parser.add_argument("--address", help="Unix socket path")
+    serve_parser.add_argument("--max-batch-size", type=int, help="Maximum batch size")
+    serve_parser.add_argument("--max-queue-delay-ms", type=float, help="Maximum queue delay in milliseconds")
+
     # Status command
     status_parser = subparsers.add_parser("status", help="Check pipeline status")
     status_parser.add_argument("--output", required=True, help="Output prefix to check")
@@ -155,6 +172,9 @@ def run_stage1(args, config: CloudConfig) -> list[ManifestEntry]:
         if args.crop_padding:
             stage1_config['crop_padding'] = args.crop_padding
 
+        if args.fused:
+            return run_fused(args, config, stage1_config)
+
         # Run Stage-1
         manifest_entries = config.runner.run_stage1(args.input, args.output, stage1_config)
 
@@ -168,13 +188,30 @@ def run_stage1(args, config: CloudConfig) -> list[ManifestEntry]:
         raise
 
 
+def run_fused(args, config: CloudConfig, stage1_config: dict[str, Any]) -> list[ManifestEntry]:
+    """Run Stage-1 and Stage-2 in a single in-memory pass."""
+    if not hasattr(config.runner, 'run_fused'):
+        raise ValueError("--fused is only supported by the local runner")
+
+    manifest_entries, stage2_entries = config.runner.run_fused(
+        args.input, args.output, stage1_config, config.get_stage2_config(), save_crops=args.save_crops
+    )
+
+    logger.log_stage_complete("stage1", crops_generated=len(manifest_entries),
+                              predictions_generated=len(stage2_entries))
+    logger.info(f"✅ Fused Stage-1/Stage-2 completed: {len(manifest_entries)} crops, "
+                f"{len(stage2_entries)} predictions generated")
+
+    return manifest_entries
+
+
 def run_stage2(args, config: CloudConfig) -> list[Stage2Entry]:
     """Run Stage-2 processing."""
     logger.log_stage_start("stage2", profile=config.profile, manifest=args.manifest, output=args.output)
 
     try:
         # Load manifest entries
-        manifest_entries = load_manifest_entries(args.manifest, config)
+        manifest_entries = load_manifest_entries(args.manifest, config, STAGE2_MANIFEST_COLUMNS)
 
         if not manifest_entries:
             logger.warning("No manifest entries found", manifest_path=args.manifest)
@@ -223,8 +260,9 @@ def materialize_results(args, config: CloudConfig):
     print(f"Results materialized to {args.output}")
 
 
-def load_manifest_entries(manifest_path: str, config: CloudConfig) -> list[ManifestEntry]:
-    """Load manifest entries from storage."""
+def load_manifest_entries(manifest_path: str, config: CloudConfig,
+                          columns: tuple[str, ...] | None = None) -> list[ManifestEntry]:
+    """Load manifest entries (.parquet or .jsonl) from storage, optionally only some columns."""
     from .interfaces import StorageLocation
 
     manifest_location = StorageLocation.from_url(manifest_path)
@@ -233,23 +271,12 @@ def load_manifest_entries(manifest_path: str, config: CloudConfig) -> list[Manif
         print(f"Manifest file not found: {manifest_path}")
         return []
 
-    manifest_content = config.storage_adapter.get(manifest_location)
-    entries = []
-
-    for line in manifest_content.decode('utf-8').strip().split('\n'):
-        if line:
-            try:
-                entry_data = json.loads(line)
-                entries.append(ManifestEntry.from_dict(entry_data))
-            except Exception as e:
-                print(f"Error parsing manifest line: {e}")
-                continue
+    return read_entries(config.storage_adapter, manifest_path, ManifestEntry, columns)
 
-    return entries
 
-
-def load_predictions_entries(predictions_path: str, config: CloudConfig) -> list[Stage2Entry]:
-    """Load predictions entries from storage."""
+def load_predictions_entries(predictions_path: str, config: CloudConfig,
+                             columns: tuple[str, ...] | None = None) -> list[Stage2Entry]:
+    """Load predictions entries (.parquet or .jsonl) from storage, optionally only some columns."""
     from .interfaces import StorageLocation
 
     predictions_location = StorageLocation.from_url(predictions_path)
@@ -258,19 +285,7 @@ def load_predictions_entries(predictions_path: str, config: CloudConfig) -> list
         print(f"Predictions file not found: {predictions_path}")
         return []
 
-    predictions_content = config.storage_adapter.get(predictions_location)
-    entries = []
-
-    for line in predictions_content.decode('utf-8').strip().split('\n'):
-        if line:
-            try:
-                entry_data = json.loads(line)
-                entries.append(Stage2Entry.from_dict(entry_data))
-            except Exception as e:
-                print(f"Error parsing predictions line: {e}")
-                continue
-
-    return entries
+    return read_entries(config.storage_adapter, predictions_path, Stage2Entry, columns)
 
 
 def create_final_results(manifest_entries: list[ManifestEntry], predictions_entries: list[Stage2Entry]) -> list[dict[str, Any]]:
@@ -328,29 +343,46 @@ def save_results(results: list[dict[str, Any]], output_path: str, format: str):
         raise ValueError(f"Unsupported format: {format}")
 
 
+def run_inference_server(args, config: CloudConfig) -> None:
+    """Run the shared inference server until interrupted."""
+    from .inference_server import InferenceServer, InferenceServerConfig
+
+    server_config = config.get_inference_server_config() or InferenceServerConfig()
+    if args.address:
+        server_config.address = args.address
+    if args.max_batch_size:
+        server_config.max_batch_size = args.max_batch_size
+    if args.max_queue_delay_ms is not None:
+        server_config.max_queue_delay_ms = args.max_queue_delay_ms
+
+    server = InferenceServer(config.model_provider, server_config)
+    try:
+        server.serve_forever()
+    finally:
+        logger.info(f"📊 Inference server stats: {json.dumps(server.stats(), indent=2)}")
+
+
 def check_status(args, config: CloudConfig):
     """Check pipeline status."""
     print(f"Checking status for: {args.output}")
 
-    from .interfaces import StorageLocation
-
-    # Check Stage-1 status
-    stage1_manifest = StorageLocation.from_url(f"{args.output}/stage1/manifest.jsonl")
-    stage1_exists = config.storage_adapter.exists(stage1_manifest)
+    # Check Stage-1 status (Parquet or JSONL)
+    stage1_manifest = find_entries_file(config.storage_adapter, f"{args.output}/stage1/manifest")
+    stage1_exists = stage1_manifest is not None
 
     # Check Stage-2 status
-    stage2_predictions = StorageLocation.from_url(f"{args.output}/stage2/predictions.jsonl")
-    stage2_exists = config.storage_adapter.exists(stage2_predictions)
+    stage2_predictions = find_entries_file(config.storage_adapter, f"{args.output}/stage2/predictions")
+    stage2_exists = stage2_predictions is not None
 
     print(f"Stage-1 manifest: {'✓' if stage1_exists else '✗'}")
     print(f"Stage-2 predictions: {'✓' if stage2_exists else '✗'}")
 
     if stage1_exists:
-        manifest_entries = load_manifest_entries(f"{args.output}/stage1/manifest.jsonl", config)
+        manifest_entries = load_manifest_entries(stage1_manifest, config, ('crop_path',))
         print(f"Stage-1 crops: {len(manifest_entries)}")
 
     if stage2_exists:
-        predictions_entries = load_predictions_entries(f"{args.output}/stage2/predictions.jsonl", config)
+        predictions_entries = load_predictions_entries(stage2_predictions, config, ('crop_path',))
         print(f"Stage-2 predictions: {len(predictions_entries)}")
 
 
@@ -361,11 +393,11 @@ def run_stage3(args, config: CloudConfig) -> None:
 
     try:
         # Load manifest entries
-        manifest_entries = load_manifest_entries(args.manifest, config)
+        manifest_entries = load_manifest_entries(args.manifest, config, STAGE3_MANIFEST_COLUMNS)
         logger.info(f"📋 Loaded {len(manifest_entries)} manifest entries")
 
         # Load Stage-2 predictions
-        predictions_entries = load_predictions_entries(args.predictions, config)
+        predictions_entries = load_predictions_entries(args.predictions, config, STAGE3_PREDICTION_COLUMNS)
         logger.info(f"🔮 Loaded {len(predictions_entries)} Stage-2 predictions")
 
         # Initialize Stage-3 reporter
@@ -626,6 +658,8 @@ def main():
         run_stage3(args, config)
     elif args.command == "materialize":
         materialize_results(args, config)
+    elif args.command == "serve":
+        run_inference_server(args, config)
     elif args.command == "status":
         check_status(args, config)
     elif args.command == "batch":
@@ -5,14 +5,19 @@ Configuration loader for cloud-optional pipeline.
 from __future__ import annotations
 
 import os
+from pathlib import Path
 from typing import Any
 
 import yaml
 
+from ...common.exceptions import ConfigurationError
+from .inference_cache import InferenceCache
+from .inference_server import InferenceClient, InferenceServerConfig
 from .models import create_model_provider
 from .queue import create_queue_adapter
 from .runners import create_runner
 from .storage import create_storage_adapter
+from .storage_cache import CachingStorageAdapter
 
 
 class CloudConfig:
@@ -22,6 +27,7 @@ class CloudConfig:
         self.profile = profile
         self.config_path = config_path or f"profiles/{profile}.yaml"
         self.config = self._load_config()
+        self._resolve_gating_path()
 
         # Initialize adapters
         self.storage_adapter = self._create_storage_adapter()
@@ -46,6 +52,22 @@ class CloudConfig:
             print(f"Error loading configuration: {e}")
             return self._get_default_config()
 
+    def _resolve_gating_path(self) -> None:
+        """Resolve the Stage-2 gating species config relative to the profile file and check it exists."""
+        stage2_config = self.get_stage2_config()
+        gating = stage2_config.get('gating')
+        if not gating or not isinstance(gating, str):
+            return
+
+        path = Path(gating)
+        if not path.is_absolute():
+            path = (Path(self.config_path).resolve().parent / path).resolve()
+        if not path.exists():
+            raise ConfigurationError(
+                f"Stage-2 gating config not found: {path} (pipeline.stage2.gating in {self.config_path})"
+            )
+        stage2_config['gating'] = str(path)
+
     def _apply_env_overrides(self, config: dict[str, Any]) -> dict[str, Any]:
         """Apply environment variable overrides."""
         # Storage overrides
@@ -112,8 +134,22 @@ class CloudConfig:
             kwargs['region'] = storage_config.get('region', 'eu-north-1')
         elif adapter_type == 'gcs':
             kwargs['project_id'] = storage_config.get('project_id')
-
-        return create_storage_adapter(adapter_type, **kwargs)
+        if adapter_type in ('s3', 'gcs'):
+            for key in ('max_concurrency', 'retry_attempts', 'retry_backoff'):
+                if key in storage_config:
+                    kwargs[key] = storage_config[key]
+
+        storage = create_storage_adapter(adapter_type, **kwargs)
+
+        cache_config = storage_config.get('cache', {})
+        if cache_config.get('enabled', False):
+            storage = CachingStorageAdapter(
+                storage,
+                cache_config.get('path', 'file://./cache/storage'),
+                max_size_mb=cache_config.get('max_size_mb', 2048),
+                validate=cache_config.get('validate', True)
+            )
+        return storage
 
     def _create_queue_adapter(self):
         """Create queue adapter from config."""
@@ -159,6 +195,17 @@ class CloudConfig:
         kwargs = {}
         if runner_type == 'local':
             kwargs['max_workers'] = runner_config.get('max_workers', 4)
+            kwargs['writer_workers'] = runner_config.get('writer_workers')
+            kwargs['manifest_formats'] = tuple(self.get_manifest_config().get('formats', ['jsonl']))
+            server_config = self.get_inference_server_config()
+            if server_config is not None:
+                kwargs['inference_client'] = InferenceClient(server_config.address, server_config.authkey)
+            cache_config = runner_config.get('inference_cache', {})
+            if cache_config.get('enabled', False):
+                kwargs['inference_cache'] = InferenceCache(
+                    cache_config.get('path', 'file://./cache/inference.sqlite'),
+                    max_size_mb=cache_config.get('max_size_mb', 512)
+                )
         elif runner_type == 'cloud_batch':
             kwargs.update({
                 'job_definition': runner_config.get('job_definition', 'wildlife-detection-job'),
@@ -176,6 +223,13 @@ class CloudConfig:
             **kwargs
         )
 
+    def get_inference_server_config(self) -> InferenceServerConfig | None:
+        """Get shared inference server configuration, if enabled."""
+        server_config = self.config.get('runner', {}).get('inference_server', {})
+        if not server_config.get('enabled', False):
+            return None
+        return InferenceServerConfig.from_dict(server_config)
+
     def get_pipeline_config(self) -> dict[str, Any]:
         """Get pipeline configuration."""
         return self.config.get('pipeline', {})
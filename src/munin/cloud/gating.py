@@ -0,0 +1,81 @@
+"""
+Stage-2 gating policy.
+
+Skips the Stage-2 classifier for detections where Stage-1 already produced a
+confident, mapped species (see ``SwedishWildlifeDetector._map_to_swedish_wildlife``).
+Thresholds are configured per species in ``conf/species.yaml`` under
+``stage2_gating``.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+
+@dataclass
+class Stage2GatingPolicy:
+    """Per-species Stage-1 confidence above which Stage-2 is skipped."""
+    thresholds: dict[str, float] = field(default_factory=dict)
+    enabled: bool = True
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Stage2GatingPolicy:
+        """Create from the ``stage2_gating`` section of the species config."""
+        return cls(
+            thresholds={label: float(conf) for label, conf in (data.get('species') or {}).items()},
+            enabled=data.get('enabled', True),
+        )
+
+    @classmethod
+    def from_yaml(cls, path: str | Path) -> Stage2GatingPolicy:
+        """Load from a species config file."""
+        with open(path, encoding='utf-8') as f:
+            data = yaml.safe_load(f) or {}
+        return cls.from_dict(data.get('stage2_gating') or {})
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> Stage2GatingPolicy | None:
+        """Build from a stage config's ``gating`` value (species config path or inline section)."""
+        gating = config.get('gating')
+        if not gating:
+            return None
+        policy = cls.from_yaml(gating) if isinstance(gating, (str, Path)) else cls.from_dict(gating)
+        return policy if policy.enabled else None
+
+    def skip_reason(self, label: str | None, stage1_confidence: float) -> str | None:
+        """Return the auto_ok reason if Stage-2 can be skipped for this detection, else None."""
+        if not self.enabled or label is None or label not in self.thresholds:
+            return None
+        threshold = self.thresholds[label]
+        if stage1_confidence < threshold:
+            return None
+        return f"stage1_confident:{label}>={threshold:g}"
+
+
+class GatingStats:
+    """Counts of Stage-2 calls avoided by the gating policy."""
+
+    def __init__(self):
+        self.total = 0
+        self.gated = 0
+        self.by_species: dict[str, int] = {}
+
+    def observe(self, label: str | None, gated: bool) -> None:
+        """Record one Stage-2 candidate."""
+        self.total += 1
+        if gated:
+            self.gated += 1
+            self.by_species[label] = self.by_species.get(label, 0) + 1
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            'candidates': self.total,
+            'stage2_calls_avoided': self.gated,
+            'fraction_avoided': self.gated / self.total if self.total else 0.0,
+            'by_species': dict(sorted(self.by_species.items())),
+        }
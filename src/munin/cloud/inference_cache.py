@@ -0,0 +1,167 @@
+"""
+Content-hash keyed inference result cache for Stage-1 and Stage-2.
+
+Results are keyed by (input content hash, model hash, relevant config subset),
+so re-running the pipeline after a crash or a Stage-3-only config change
+answers unchanged inputs without touching the model.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any
+
+from ...common.utils.logging_utils import get_logger
+
+logger = get_logger("wildlife_pipeline.cloud.inference_cache")
+
+
+class InferenceCache:
+    """SQLite-backed result cache with a size cap and least-recently-used eviction."""
+
+    # How many puts between exact size checks against the cap
+    SIZE_CHECK_INTERVAL = 64
+
+    def __init__(self, path: str = "file://./cache/inference.sqlite", max_size_mb: float = 512):
+        self.path = Path(path.replace("file://", ""))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_results_last_access ON results(last_access)")
+        self._conn.commit()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._puts_since_check = 0
+
+    @staticmethod
+    def make_key(content_hash: str, model_hash: str, config_subset: dict[str, Any] | None = None) -> str:
+        """Build a cache key from input content, model version and relevant config."""
+        config_str = json.dumps(config_subset or {}, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(f"{content_hash}|{model_hash}|{config_str}".encode()).hexdigest()
+
+    @staticmethod
+    def hash_content(content: bytes | memoryview) -> str:
+        """Hash raw input bytes (image or crop)."""
+        return hashlib.sha256(content).hexdigest()
+
+    def get(self, key: str) -> Any | None:
+        """Get a cached result, or None on a miss."""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE results SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            self.hits += 1
+
+        return json.loads(zlib.decompress(row[0]))
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable result."""
+        blob = zlib.compress(json.dumps(value, separators=(',', ':')).encode('utf-8'))
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, value, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, blob, len(blob), time.time())
+            )
+            self._conn.commit()
+
+            self._puts_since_check += 1
+            if self._puts_since_check >= self.SIZE_CHECK_INTERVAL:
+                self._puts_since_check = 0
+                self._evict_if_needed()
+
+    def _size_bytes(self) -> int:
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+
+    def _evict_if_needed(self) -> None:
+        """Evict least recently used entries down to 90% of the size cap."""
+        size = self._size_bytes()
+        if size <= self.max_size_bytes:
+            return
+
+        target = int(self.max_size_bytes * 0.9)
+        evicted = 0
+        for key, entry_size in self._conn.execute(
+            "SELECT key, size FROM results ORDER BY last_access ASC"
+        ).fetchall():
+            if size <= target:
+                break
+            self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+            size -= entry_size
+            evicted += 1
+
+        self._conn.commit()
+        self.evictions += evicted
+        logger.info(f"🧹 Inference cache evicted {evicted} entries ({size} bytes remain)")
+
+    def stats(self) -> dict[str, Any]:
+        """Hit/miss/eviction statistics."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            size = self._size_bytes()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'entries': entries,
+            'size_bytes': size,
+            'max_size_bytes': self.max_size_bytes,
+        }
+
+    def close(self) -> None:
+        """Close the underlying database."""
+        with self._lock:
+            self._conn.close()
+
+
+def encode_detections(detections: list[Any]) -> list[list[Any]]:
+    """Compact Stage-1 detections as [label, confidence, x1, y1, x2, y2] rows."""
+    return [
+        [getattr(d, 'label', None), float(d.confidence), *[float(v) for v in (d.bbox or [])]]
+        for d in detections
+    ]
+
+
+def decode_detections(rows: list[list[Any]]) -> list[Any]:
+    """Rebuild Stage-1 detections from compact rows."""
+    from ..wildlife_detector import Detection
+
+    return [Detection(label=row[0], confidence=row[1], bbox=list(row[2:]) or None) for row in rows]
+
+
+def encode_classification(prediction: Any) -> list[Any]:
+    """Compact a Stage-2 classification as [label, confidence]."""
+    return [prediction.label, float(prediction.confidence)]
+
+
+def decode_classification(row: list[Any]) -> Any:
+    """Rebuild a Stage-2 classification from a compact row."""
+    from ..classification_engine import ClsResult
+
+    return ClsResult(label=row[0], confidence=row[1])
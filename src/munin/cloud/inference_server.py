@@ -0,0 +1,392 @@
+"""
+Local dynamic-batching inference server.
+
+One server process holds a single model instance per variant and coalesces
+requests from many decode workers into batches. Workers talk to it over a
+Unix socket through ``InferenceClient``; ``RemoteModel`` exposes the usual
+``predict``/``predict_batch`` interface so runners can use it in place of a
+locally loaded model.
+
+Connections carry pickled payloads, so the socket lives in a directory only
+the current user can enter, and unless the profile sets ``authkey`` the server
+generates a random key per run and shares it through a mode 0600 key file
+next to the socket.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import queue
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+from typing import TYPE_CHECKING, Any
+
+from ...common.utils.logging_utils import get_logger
+from .metrics import CountHistogram, Histogram
+
+if TYPE_CHECKING:
+    from multiprocessing.connection import Connection
+
+    from .interfaces import ModelProvider
+
+logger = get_logger("wildlife_pipeline.cloud.inference_server")
+
+# Per-user private directory under the system temp dir
+DEFAULT_ADDRESS = os.path.join(
+    tempfile.gettempdir(), f"munin-inference-{os.getuid() if hasattr(os, 'getuid') else 'user'}", "server.sock"
+)
+KEY_SUFFIX = ".key"
+
+
+def key_path(address: str) -> str:
+    """Path of the file holding a server's generated authkey."""
+    return address + KEY_SUFFIX
+
+
+def _private_socket_dir(address: str) -> None:
+    """Create the socket's directory with mode 0700, refusing one other users can enter."""
+    directory = os.path.dirname(os.path.abspath(address))
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    info = os.stat(directory)
+    if (hasattr(os, 'getuid') and info.st_uid != os.getuid()) or info.st_mode & 0o077:
+        raise PermissionError(f"Inference server directory {directory} must be private to the current user "
+                              f"(mode 0700); choose another address")
+
+
+@dataclass
+class InferenceServerConfig:
+    """Configuration for the local inference server."""
+    address: str = DEFAULT_ADDRESS
+    max_batch_size: int = 16
+    max_queue_delay_ms: float = 10.0
+    authkey: bytes | None = None  # None: random per run, shared through key_path(address)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> InferenceServerConfig:
+        """Create from profile configuration."""
+        config = cls(
+            address=data.get('address', cls.address),
+            max_batch_size=data.get('max_batch_size', cls.max_batch_size),
+            max_queue_delay_ms=data.get('max_queue_delay_ms', cls.max_queue_delay_ms),
+        )
+        if data.get('authkey'):
+            config.authkey = str(data['authkey']).encode('utf-8')
+        return config
+
+
+@dataclass
+class _PendingRequest:
+    """A request waiting to be batched; batch requests carry several payloads."""
+    request_id: int
+    payloads: list[Any]
+    conn: Connection
+    send_lock: threading.Lock
+    enqueued_at: float
+    single: bool = True  # reply with one result instead of a list
+
+
+class _VariantWorker:
+    """Batching loop for a single model variant."""
+
+    def __init__(self, variant: str, model: Any, config: InferenceServerConfig):
+        self.variant = variant
+        self.model = model
+        self.config = config
+        self.requests: queue.Queue[_PendingRequest | None] = queue.Queue()
+        self.latency_ms = Histogram()
+        self.batch_sizes = CountHistogram()
+        self.errors = 0
+        self.thread = threading.Thread(target=self._run, name=f"batcher-{variant}", daemon=True)
+        self.thread.start()
+
+    def _collect_batch(self) -> list[_PendingRequest] | None:
+        """Block for one request, then gather more until full or the queue delay expires."""
+        first = self.requests.get()
+        if first is None:
+            return None
+
+        batch = [first]
+        size = len(first.payloads)
+        deadline = first.enqueued_at + self.config.max_queue_delay_ms / 1000.0
+
+        while size < self.config.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self.requests.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                self.requests.put(None)  # re-queue shutdown after this batch
+                break
+            batch.append(item)
+            size += len(item.payloads)
+
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect_batch()
+            if batch is None:
+                return
+
+            payloads = [payload for request in batch for payload in request.payloads]
+            try:
+                results = []
+                # A batch request larger than max_batch_size runs in several model calls
+                for start in range(0, len(payloads), self.config.max_batch_size):
+                    chunk = payloads[start:start + self.config.max_batch_size]
+                    if hasattr(self.model, 'predict_batch'):
+                        results.extend(self.model.predict_batch(chunk))
+                    else:
+                        results.extend(self.model.predict(payload) for payload in chunk)
+                    self.batch_sizes.observe(len(chunk))
+                replies = []
+                offset = 0
+                for request in batch:
+                    request_results = results[offset:offset + len(request.payloads)]
+                    offset += len(request.payloads)
+                    replies.append(('result', request.request_id,
+                                    request_results[0] if request.single else request_results))
+            except Exception as e:
+                self.errors += len(batch)
+                logger.error(f"❌ Batch inference failed for {self.variant}: {e}")
+                replies = [('error', request.request_id, str(e)) for request in batch]
+
+            now = time.perf_counter()
+            for request, reply in zip(batch, replies):
+                self.latency_ms.observe((now - request.enqueued_at) * 1000.0)
+                try:
+                    with request.send_lock:
+                        request.conn.send(reply)
+                except (OSError, EOFError):
+                    pass  # client went away
+
+    def stop(self) -> None:
+        self.requests.put(None)
+        self.thread.join(timeout=5.0)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            'requests': self.latency_ms.count,
+            'errors': self.errors,
+            'request_latency_ms': self.latency_ms.to_dict(),
+            'batch_size': self.batch_sizes.to_dict(),
+        }
+
+
+class InferenceServer:
+    """Unix socket inference server with per-variant dynamic batching."""
+
+    def __init__(self, model_provider: ModelProvider, config: InferenceServerConfig | None = None):
+        self.model_provider = model_provider
+        self.config = config or InferenceServerConfig()
+        self._workers: dict[str, _VariantWorker] = {}
+        self._workers_lock = threading.Lock()
+        self._listener: Listener | None = None
+        self._accept_thread: threading.Thread | None = None
+        self._stopping = threading.Event()
+        self.authkey = self.config.authkey
+
+    def start(self) -> None:
+        """Start accepting client connections in a background thread."""
+        _private_socket_dir(self.config.address)
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self.config.address)
+
+        if self.config.authkey is None:
+            self.authkey = os.urandom(32)
+            fd = os.open(key_path(self.config.address), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'wb') as key_file:
+                key_file.write(self.authkey)
+
+        self._listener = Listener(self.config.address, family='AF_UNIX', authkey=self.authkey)
+        os.chmod(self.config.address, 0o600)
+        self._accept_thread = threading.Thread(target=self._accept_loop, name="inference-accept", daemon=True)
+        self._accept_thread.start()
+        logger.info(f"🚀 Inference server listening on {self.config.address} "
+                    f"(max_batch_size={self.config.max_batch_size}, "
+                    f"max_queue_delay_ms={self.config.max_queue_delay_ms})")
+
+    def serve_forever(self) -> None:
+        """Start the server and block until interrupted."""
+        self.start()
+        try:
+            while not self._stopping.wait(1.0):
+                pass
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def stop(self) -> None:
+        """Stop the server and all batching loops."""
+        self._stopping.set()
+        if self._listener is not None:
+            with contextlib.suppress(OSError):
+                self._listener.close()
+        for worker in self._workers.values():
+            worker.stop()
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self.config.address)
+        if self.config.authkey is None:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(key_path(self.config.address))
+
+    def __enter__(self) -> InferenceServer:
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def stats(self) -> dict[str, Any]:
+        """Per-variant request latency and achieved batch-size histograms."""
+        return {variant: worker.stats() for variant, worker in self._workers.items()}
+
+    def _get_worker(self, variant: str) -> _VariantWorker:
+        with self._workers_lock:
+            if variant not in self._workers:
+                logger.info(f"🔄 Loading model variant: {variant}")
+                model = self.model_provider.load_model(variant)
+                self._workers[variant] = _VariantWorker(variant, model, self.config)
+            return self._workers[variant]
+
+    def _accept_loop(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                conn = self._listener.accept()
+            except AuthenticationError:
+                logger.warning("⚠️ Rejected inference client with a wrong authkey")
+                continue
+            except (OSError, EOFError):
+                if self._stopping.is_set():
+                    return
+                continue
+            threading.Thread(target=self._handle_connection, args=(conn,), daemon=True).start()
+
+    def _handle_connection(self, conn: Connection) -> None:
+        send_lock = threading.Lock()
+        try:
+            while True:
+                message = conn.recv()
+                kind, request_id = message[0], message[1]
+
+                if kind in ('predict', 'predict_batch'):
+                    variant, payload = message[2], message[3]
+                    try:
+                        worker = self._get_worker(variant)
+                    except Exception as e:
+                        with send_lock:
+                            conn.send(('error', request_id, f"Failed to load {variant}: {e}"))
+                        continue
+                    worker.requests.put(_PendingRequest(
+                        request_id=request_id,
+                        payloads=[payload] if kind == 'predict' else list(payload),
+                        conn=conn,
+                        send_lock=send_lock,
+                        enqueued_at=time.perf_counter(),
+                        single=kind == 'predict'
+                    ))
+                elif kind == 'stats':
+                    with send_lock:
+                        conn.send(('result', request_id, self.stats()))
+                else:
+                    with send_lock:
+                        conn.send(('error', request_id, f"Unknown request: {kind}"))
+        except (EOFError, OSError):
+            pass
+        finally:
+            conn.close()
+
+
+class InferenceClient:
+    """
+    Client for ``InferenceServer``.
+
+    Each thread gets its own connection so many threads and processes can have
+    requests in flight at once. The client is picklable and reconnects lazily,
+    so it can be handed to process-pool workers. Without an ``authkey`` it
+    reads the server's generated key from ``key_path(address)``.
+    """
+
+    def __init__(self, address: str = DEFAULT_ADDRESS, authkey: bytes | None = None):
+        self.address = address
+        self.authkey = authkey
+        self._local = threading.local()
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {'address': self.address, 'authkey': self.authkey}
+
+    def _authkey(self) -> bytes:
+        if self.authkey is None:
+            with open(key_path(self.address), 'rb') as key_file:
+                self.authkey = key_file.read()
+        return self.authkey
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.address = state['address']
+        self.authkey = state['authkey']
+        self._local = threading.local()
+
+    def _connection(self) -> Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = Client(self.address, family='AF_UNIX', authkey=self._authkey())
+            self._local.conn = conn
+            self._local.next_id = 0
+        return conn
+
+    def _request(self, message: tuple) -> Any:
+        conn = self._connection()
+        self._local.next_id += 1
+        request_id = self._local.next_id
+        conn.send((message[0], request_id, *message[1:]))
+
+        kind, reply_id, value = conn.recv()
+        if reply_id != request_id:
+            raise RuntimeError(f"Out-of-order reply from inference server: {reply_id} != {request_id}")
+        if kind == 'error':
+            raise RuntimeError(value)
+        return value
+
+    def predict(self, variant: str, payload: Any) -> Any:
+        """Run inference on a single input through the shared server."""
+        return self._request(('predict', variant, payload))
+
+    def predict_batch(self, variant: str, payloads: list[Any]) -> list[Any]:
+        """Run inference on several inputs in one request; they are batched together on the server."""
+        if not payloads:
+            return []
+        return self._request(('predict_batch', variant, list(payloads)))
+
+    def stats(self) -> dict[str, Any]:
+        """Fetch server statistics."""
+        return self._request(('stats',))
+
+    def close(self) -> None:
+        """Close this thread's connection."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+class RemoteModel:
+    """Model facade that forwards ``predict`` and ``predict_batch`` calls to the inference server."""
+
+    def __init__(self, client: InferenceClient, variant: str):
+        self.client = client
+        self.variant = variant
+
+    def predict(self, payload: Any) -> Any:
+        return self.client.predict(self.variant, payload)
+
+    def predict_batch(self, payloads: list[Any]) -> list[Any]:
+        return self.client.predict_batch(self.variant, payloads)
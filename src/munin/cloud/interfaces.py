@@ -4,12 +4,15 @@ Core interfaces for cloud-optional wildlife detection pipeline.
 
 from __future__ import annotations
 
+import io
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
     import builtins
+    from collections.abc import Callable, Iterable, Iterator
 
 
 @dataclass
@@ -48,6 +51,12 @@ class ManifestEntry:
     longitude: float | None = None
     image_width: int | None = None
     image_height: int | None = None
+    stage1_label: str | None = None
+    observation_any: bool | None = None  # False for frames the motion prefilter skipped
+    motion_score: float | None = None
+    burst_id: str | None = None
+    inference: str | None = None  # 'inferred' or 'propagated' from the burst representative
+    track_id: int | None = None  # video tracker mode: same id for the same animal within a clip
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
@@ -64,6 +73,12 @@ class ManifestEntry:
             'longitude': self.longitude,
             'image_width': self.image_width,
             'image_height': self.image_height,
+            'stage1_label': self.stage1_label,
+            'observation_any': self.observation_any,
+            'motion_score': self.motion_score,
+            'burst_id': self.burst_id,
+            'inference': self.inference,
+            'track_id': self.track_id,
         }
 
     @classmethod
@@ -79,9 +94,10 @@ class Stage2Entry:
     label: str
     confidence: float
     auto_ok: bool
-    stage2_model: str
+    stage2_model: str | None  # None when Stage-2 was skipped by gating
     stage1_model: str
     config_hash: str
+    auto_ok_reason: str | None = None
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
@@ -93,6 +109,7 @@ class Stage2Entry:
             'stage2_model': self.stage2_model,
             'stage1_model': self.stage1_model,
             'config_hash': self.config_hash,
+            'auto_ok_reason': self.auto_ok_reason,
         }
 
     @classmethod
@@ -101,9 +118,115 @@ class Stage2Entry:
         return cls(**data)
 
 
+@dataclass
+class ObjectInfo:
+    """Size and version of a stored object, for cache validation."""
+    size: int
+    etag: str | None = None  # changes whenever the content does
+
+
+def has_suffix(path: str, suffixes: Iterable[str] | None) -> bool:
+    """Whether a path ends in one of ``suffixes``, ignoring case; always True for None."""
+    if suffixes is None:
+        return True
+    return path.lower().endswith(tuple(suffix.lower() for suffix in suffixes))
+
+
+# Bytes at the start of an image that hold its EXIF header (JPEG APP1 is at most 64 KB)
+HEADER_BYTES = 128 * 1024
+
+# Input image types, matched case-insensitively
+IMAGE_SUFFIXES = ('.jpg', '.jpeg', '.png')
+
+
+class UploadStream:
+    """Write-only stream to one object, opened with ``StorageAdapter.open_write``.
+
+    The object is stored by ``close()``; ``abort()``, or leaving a ``with``
+    block on an exception, discards everything written so far.
+    """
+
+    def __init__(self) -> None:
+        self._closed = False
+        self._position = 0
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes | bytearray | memoryview) -> int:
+        if self._closed:
+            raise ValueError("write to a closed upload stream")
+        data = bytes(data)
+        self._write(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        """Store the object."""
+        if not self._closed:
+            self._closed = True
+            self._commit()
+
+    def abort(self) -> None:
+        """Discard the object; nothing is stored at the destination."""
+        if not self._closed:
+            self._closed = True
+            self._discard()
+
+    def __enter__(self) -> UploadStream:
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def _write(self, data: bytes) -> None:
+        raise NotImplementedError
+
+    def _commit(self) -> None:
+        raise NotImplementedError
+
+    def _discard(self) -> None:
+        pass
+
+
+class _BufferedUpload(UploadStream):
+    """Upload for adapters without a streaming write: buffered and stored with one put."""
+
+    def __init__(self, storage: StorageAdapter, location: StorageLocation):
+        super().__init__()
+        self._storage = storage
+        self._location = location
+        self._buffer = io.BytesIO()
+
+    def _write(self, data: bytes) -> None:
+        self._buffer.write(data)
+
+    def _commit(self) -> None:
+        self._storage.put(self._location, self._buffer.getvalue())
+
+    def _discard(self) -> None:
+        self._buffer = io.BytesIO()
+
+
 class StorageAdapter(ABC):
     """Abstract storage adapter for local/cloud storage."""
 
+    # Concurrent requests in get_many/put_many
+    max_concurrency = 8
+
     @abstractmethod
     def get(self, location: StorageLocation) -> bytes:
         """Get file content from storage location."""
@@ -114,11 +237,109 @@ class StorageAdapter(ABC):
         """Put file content to storage location."""
         pass
 
+    def open_write(self, location: StorageLocation) -> UploadStream:
+        """Stream content to a storage location; the object appears when the stream is closed."""
+        # Fallback for adapters that can only store whole objects
+        return _BufferedUpload(self, location)
+
     @abstractmethod
     def list(self, location: StorageLocation, pattern: str = "*") -> builtins.list[StorageLocation]:
         """List files in storage location."""
         pass
 
+    def stat(self, location: StorageLocation) -> ObjectInfo | None:
+        """Size and ETag of an object without reading it; None if the adapter cannot tell."""
+        return None
+
+    def get_view(self, location: StorageLocation) -> memoryview:
+        """Read-only view of an object's content, zero-copy where the adapter can map it.
+
+        Hashers and decoders accept the view directly; callers that modify the
+        data take a copy with ``bytearray(view)``.
+        """
+        # Fallback for adapters that cannot map objects
+        return memoryview(self.get(location))
+
+    def get_range(self, location: StorageLocation, start: int, length: int) -> bytes:
+        """Get ``length`` bytes from ``start``; shorter at the end of the object."""
+        # Fallback for adapters without ranged reads
+        return self.get(location)[start:start + length]
+
+    def get_headers(self, locations: Iterable[StorageLocation], size: int = HEADER_BYTES,
+                    return_exceptions: bool = True) -> builtins.list[bytes | BaseException]:
+        """Fetch the first ``size`` bytes of many objects concurrently, e.g. for EXIF.
+
+        Returns:
+            Header bytes (or the exception, by default) in the order of ``locations``
+        """
+        return self._map_concurrent(self.get_range, [(location, 0, size) for location in locations],
+                                    return_exceptions)
+
+    def get_many(self, locations: Iterable[StorageLocation],
+                 return_exceptions: bool = False) -> builtins.list[bytes | BaseException]:
+        """Fetch many objects concurrently, up to ``max_concurrency`` at a time.
+
+        Args:
+            locations: Objects to fetch
+            return_exceptions: Return a failed object's exception in its place
+                instead of raising the first error
+
+        Returns:
+            Contents in the order of ``locations``
+        """
+        return self._map_concurrent(self.get, [(location,) for location in locations], return_exceptions)
+
+    def put_many(self, items: Iterable[tuple[StorageLocation, bytes]],
+                 return_exceptions: bool = False) -> builtins.list[BaseException | None]:
+        """Store many objects concurrently, up to ``max_concurrency`` at a time.
+
+        Args:
+            items: (location, content) pairs
+            return_exceptions: Return a failed object's exception in its place
+                instead of raising the first error
+
+        Returns:
+            None, or the exception when ``return_exceptions`` is set, per item
+        """
+        return self._map_concurrent(self.put, list(items), return_exceptions)
+
+    def _map_concurrent(self, func: Callable[..., Any], calls: builtins.list[tuple[Any, ...]],
+                        return_exceptions: bool) -> builtins.list[Any]:
+        """Run ``func(*args)`` for each call on a bounded thread pool, keeping call order."""
+        if not calls:
+            return []
+
+        results = []
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(calls)),
+                                thread_name_prefix=type(self).__name__) as pool:
+            futures = [pool.submit(func, *args) for args in calls]
+            for future in futures:
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    if not return_exceptions:
+                        for pending in futures:
+                            pending.cancel()
+                        raise
+                    results.append(e)
+        return results
+
+    def iter_list(self, location: StorageLocation, suffixes: Iterable[str] | None = None,
+                  recursive: bool = True) -> Iterator[StorageLocation]:
+        """Stream files under a location in one pass, in path order.
+
+        Args:
+            location: Prefix to list
+            suffixes: File name endings to keep, matched case-insensitively
+                (e.g. ``(".jpg", ".png")``); None keeps every file
+            recursive: Include files in nested folders
+        """
+        # Fallback for adapters without a streaming listing
+        files = self.list(location, "**/*" if recursive else "*")
+        for file in sorted(files, key=lambda f: f.path):
+            if has_suffix(file.path, suffixes):
+                yield file
+
     @abstractmethod
     def exists(self, location: StorageLocation) -> bool:
         """Check if file exists."""
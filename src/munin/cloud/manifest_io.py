@@ -0,0 +1,228 @@
+"""
+Manifest and prediction files: Parquet with an explicit schema, or JSONL.
+
+The format follows the file suffix (``.parquet`` or ``.jsonl``). Files are
+streamed to storage as they are encoded; Parquet goes out one row group per
+``row_group_size`` entries, so a large manifest is never held in memory as
+one file, and it is read
+column-projected: Stage 2 and Stage 3 load only the fields they use. JSONL
+remains available as a line-per-entry export.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+from dataclasses import fields
+from typing import TYPE_CHECKING, Any
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from ...common.utils.logging_utils import get_logger
+from .interfaces import ManifestEntry, Stage2Entry, StorageAdapter, StorageLocation
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+logger = get_logger("wildlife_pipeline.cloud.manifest_io")
+
+MANIFEST_SCHEMA = pa.schema([
+    ('source_path', pa.string()),
+    ('crop_path', pa.string()),
+    ('camera_id', pa.string()),
+    ('timestamp', pa.string()),
+    ('bbox', pa.list_(pa.float64())),  # [x1, y1, x2, y2]; null for frames without a detection
+    ('det_score', pa.float64()),
+    ('stage1_model', pa.string()),
+    ('config_hash', pa.string()),
+    ('latitude', pa.float64()),
+    ('longitude', pa.float64()),
+    ('image_width', pa.int32()),
+    ('image_height', pa.int32()),
+    ('stage1_label', pa.string()),
+    ('observation_any', pa.bool_()),
+    ('motion_score', pa.float64()),
+    ('burst_id', pa.string()),
+    ('inference', pa.string()),
+    ('track_id', pa.int64()),
+])
+
+PREDICTIONS_SCHEMA = pa.schema([
+    ('crop_path', pa.string()),
+    ('label', pa.string()),
+    ('confidence', pa.float64()),
+    ('auto_ok', pa.bool_()),
+    ('stage2_model', pa.string()),
+    ('stage1_model', pa.string()),
+    ('config_hash', pa.string()),
+    ('auto_ok_reason', pa.string()),
+])
+
+SCHEMAS: dict[type, pa.Schema] = {ManifestEntry: MANIFEST_SCHEMA, Stage2Entry: PREDICTIONS_SCHEMA}
+
+# Manifest fields Stage 2 reads (crop selection, gating and output provenance)
+STAGE2_MANIFEST_COLUMNS = ('crop_path', 'observation_any', 'det_score', 'stage1_label', 'stage1_model', 'config_hash')
+
+# Fields Stage 3 reads to group and compress observations
+STAGE3_MANIFEST_COLUMNS = ('crop_path', 'source_path', 'camera_id', 'timestamp')
+STAGE3_PREDICTION_COLUMNS = ('crop_path', 'label', 'confidence')
+
+FORMATS = ('parquet', 'jsonl')
+
+# Entries per Parquet row group
+DEFAULT_ROW_GROUP_SIZE = 10_000
+
+
+def file_format(path: str) -> str:
+    """'parquet' for ``*.parquet`` paths, else 'jsonl'."""
+    return 'parquet' if path.lower().endswith('.parquet') else 'jsonl'
+
+
+def find_entries_file(storage: StorageAdapter, base_path: str) -> str | None:
+    """Existing ``<base_path>.parquet`` or ``<base_path>.jsonl``, preferring Parquet."""
+    for fmt in FORMATS:
+        path = f"{base_path}.{fmt}"
+        if storage.exists(StorageLocation.from_url(path)):
+            return path
+    return None
+
+
+class EntryWriter:
+    """
+    Streaming writer for ManifestEntry or Stage2Entry files.
+
+    Encoded rows go straight to ``storage.open_write``: a temporary file for
+    local storage, a multipart upload for S3, a resumable upload for GCS. The
+    writer holds at most one pending row group. The file appears at ``path``
+    on ``close()``; leaving a ``with`` block on an exception discards it, so
+    a failed run never leaves a truncated file behind.
+    """
+
+    def __init__(self, storage: StorageAdapter, path: str, entry_type: type,
+                 row_group_size: int = DEFAULT_ROW_GROUP_SIZE):
+        """
+        Args:
+            storage: Storage adapter the file is written to
+            path: Output URL; the suffix selects the format
+            entry_type: ManifestEntry or Stage2Entry
+            row_group_size: Entries per Parquet row group
+        """
+        self.format = file_format(path)
+        self.schema = SCHEMAS[entry_type]
+        self.row_group_size = max(1, row_group_size)
+        self.rows = 0
+        self._pending: list[dict[str, Any]] = []
+        self._stream = storage.open_write(StorageLocation.from_url(path))
+        self._writer = pq.ParquetWriter(self._stream, self.schema, compression='zstd') \
+            if self.format == 'parquet' else None
+
+    def write(self, entries: Iterable[Any]) -> None:
+        """Append entries, encoding a row group whenever enough are pending."""
+        for entry in entries:
+            row = entry.to_dict()
+            if self._writer is None:
+                self._stream.write((b"\n" if self.rows else b"") + json.dumps(row).encode('utf-8'))
+            else:
+                self._pending.append(_to_row(row))
+                if len(self._pending) >= self.row_group_size:
+                    self._flush_row_group()
+            self.rows += 1
+
+    def close(self) -> None:
+        """Finish the file and store it."""
+        if self._stream.closed:
+            return
+        try:
+            if self._writer is not None:
+                self._flush_row_group()
+                self._writer.close()
+        except BaseException:
+            self._stream.abort()
+            raise
+        self._stream.close()
+
+    def abort(self) -> None:
+        """Discard the file; nothing is stored at ``path``."""
+        if self._writer is not None:
+            with contextlib.suppress(Exception):
+                self._writer.close()
+        self._stream.abort()
+
+    def _flush_row_group(self) -> None:
+        if self._pending:
+            self._writer.write_table(pa.Table.from_pylist(self._pending, schema=self.schema))
+            self._pending = []
+
+    def __enter__(self) -> EntryWriter:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def write_entries(storage: StorageAdapter, path: str, entries: Iterable[Any], entry_type: type,
+                  row_group_size: int = DEFAULT_ROW_GROUP_SIZE) -> None:
+    """Write ManifestEntry or Stage2Entry objects in the format given by the path suffix."""
+    with EntryWriter(storage, path, entry_type, row_group_size) as writer:
+        writer.write(entries)
+
+
+def iter_entries(storage: StorageAdapter, path: str, entry_type: type,
+                 columns: Iterable[str] | None = None) -> Iterator[Any]:
+    """
+    Stream entries from a manifest or predictions file.
+
+    Args:
+        storage: Storage adapter holding the file
+        path: File URL; the suffix selects the format
+        entry_type: ManifestEntry or Stage2Entry
+        columns: Fields to read from Parquet (all by default); the other
+            fields of the returned entries are None
+
+    Returns:
+        Iterator of entries in file order; unparseable JSONL lines are skipped
+    """
+    location = StorageLocation.from_url(path)
+    if file_format(path) == 'jsonl':
+        for line in str(storage.get_view(location), 'utf-8').splitlines():
+            if not line.strip():
+                continue
+            try:
+                yield entry_type.from_dict(json.loads(line))
+            except Exception as e:
+                logger.warning(f"⚠️ Skipping unparseable line in {path}: {e}")
+        return
+
+    names = [field.name for field in fields(entry_type)]
+    parquet_file = pq.ParquetFile(pa.BufferReader(pa.py_buffer(storage.get_view(location))))
+    projection = [name for name in columns if name in parquet_file.schema_arrow.names] if columns else None
+    for index in range(parquet_file.num_row_groups):
+        for row in parquet_file.read_row_group(index, columns=projection).to_pylist():
+            yield entry_type(**{name: _from_value(name, row.get(name)) for name in names})
+
+
+def read_entries(storage: StorageAdapter, path: str, entry_type: type,
+                 columns: Iterable[str] | None = None) -> list[Any]:
+    """All entries of a manifest or predictions file; see ``iter_entries``."""
+    return list(iter_entries(storage, path, entry_type, columns))
+
+
+def _to_row(row: dict[str, Any]) -> dict[str, Any]:
+    """Entry dict as a schema row: bbox as an [x1, y1, x2, y2] list."""
+    bbox = row.get('bbox')
+    if isinstance(bbox, dict):
+        bbox = [bbox[key] for key in ('x1', 'y1', 'x2', 'y2')] if bbox else None
+    elif bbox is not None:
+        bbox = [float(v) for v in bbox]
+    return {**row, 'bbox': bbox}
+
+
+def _from_value(name: str, value: Any) -> Any:
+    # Empty-frame entries carry bbox={} in memory and in JSONL
+    if name == 'bbox' and value is None:
+        return {}
+    return value
@@ -0,0 +1,80 @@
+"""
+Image metadata from ranged header reads.
+
+EXIF capture time and GPS position sit in the first few KB of a JPEG, so
+metadata for a whole remote prefix is read with concurrent ranged GETs of the
+headers instead of downloading every image.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from ...common.utils.prefetch import batched
+from ..exif_extractor import exif_from_bytes, get_gps_from_exif, get_timestamp_from_exif
+from .interfaces import HEADER_BYTES, IMAGE_SUFFIXES, StorageAdapter, StorageLocation
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from datetime import datetime
+
+
+@dataclass
+class ImageMetadata:
+    """Header metadata of one image."""
+    location: StorageLocation
+    timestamp: datetime | None = None
+    latitude: float | None = None
+    longitude: float | None = None
+    header_bytes: int = 0  # bytes transferred for this image
+    error: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            'path': self.location.url,
+            'timestamp': self.timestamp.isoformat() if self.timestamp else None,
+            'latitude': self.latitude,
+            'longitude': self.longitude,
+            'header_bytes': self.header_bytes,
+            'error': self.error,
+        }
+
+
+def metadata_from_header(location: StorageLocation, header: bytes) -> ImageMetadata:
+    """Parse capture time and GPS position from the start of an image."""
+    exif = exif_from_bytes(header)
+    gps = get_gps_from_exif(exif)
+    return ImageMetadata(
+        location=location,
+        timestamp=get_timestamp_from_exif(exif),
+        latitude=gps[0] if gps else None,
+        longitude=gps[1] if gps else None,
+        header_bytes=len(header),
+    )
+
+
+def iter_image_metadata(storage: StorageAdapter, locations: str | Iterable[StorageLocation],
+                        header_bytes: int = HEADER_BYTES, batch_size: int = 256) -> Iterator[ImageMetadata]:
+    """
+    Stream header metadata for many images.
+
+    Args:
+        storage: Storage adapter to read from
+        locations: Images, or a prefix URL whose images are listed with ``iter_list``
+        header_bytes: Bytes read from the start of each image
+        batch_size: Images whose headers are fetched concurrently per round
+
+    Returns:
+        Iterator of ImageMetadata in listing order; unreadable images carry ``error``
+    """
+    if isinstance(locations, str):
+        locations = storage.iter_list(StorageLocation.from_url(locations), IMAGE_SUFFIXES)
+
+    for batch in batched(locations, batch_size):
+        for location, header in zip(batch, storage.get_headers(batch, header_bytes)):
+            if isinstance(header, BaseException):
+                yield ImageMetadata(location=location, error=str(header))
+            else:
+                yield metadata_from_header(location, header)
@@ -0,0 +1,135 @@
+"""
+Lightweight metrics for pipeline run reports.
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+# Default latency buckets in milliseconds (upper bounds)
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+class Histogram:
+    """Thread-safe fixed-bucket histogram."""
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS_MS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)  # last bucket is +inf
+        self._count = 0
+        self._sum = 0.0
+        self._min: float | None = None
+        self._max: float | None = None
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Record a single value."""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            self._sum += value
+            self._min = value if self._min is None else min(self._min, value)
+            self._max = value if self._max is None else max(self._max, value)
+
+    @property
+    def count(self) -> int:
+        """Number of recorded values."""
+        return self._count
+
+    @property
+    def mean(self) -> float:
+        """Mean of recorded values."""
+        return self._sum / self._count if self._count else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        with self._lock:
+            labels = [f"<={b:g}" for b in self.buckets] + [f">{self.buckets[-1]:g}"]
+            return {
+                'count': self._count,
+                'mean': self.mean,
+                'min': self._min,
+                'max': self._max,
+                'buckets': dict(zip(labels, self._counts)),
+            }
+
+
+class CountHistogram:
+    """Thread-safe histogram of exact integer values (e.g. batch sizes)."""
+
+    def __init__(self):
+        self._counts: dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: int) -> None:
+        """Record a single value."""
+        with self._lock:
+            self._counts[value] = self._counts.get(value, 0) + 1
+
+    @property
+    def count(self) -> int:
+        """Number of recorded values."""
+        return sum(self._counts.values())
+
+    @property
+    def mean(self) -> float:
+        """Mean of recorded values."""
+        total = self.count
+        return sum(k * v for k, v in self._counts.items()) / total if total else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        with self._lock:
+            return {
+                'count': self.count,
+                'mean': self.mean,
+                'values': {str(k): self._counts[k] for k in sorted(self._counts)},
+            }
+
+
+class StageThroughput:
+    """Thread-safe item counts and busy time per pipeline step (load, detect, write, ...)."""
+
+    def __init__(self):
+        self._steps: dict[str, list[float]] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def measure(self, step: str, items: int = 1) -> Iterator[None]:
+        """Time a block of work on ``items`` images."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(step, items, time.perf_counter() - start)
+
+    def observe(self, step: str, items: int, seconds: float) -> None:
+        """Record ``items`` images processed by a step in ``seconds``."""
+        with self._lock:
+            totals = self._steps.setdefault(step, [0, 0.0])
+            totals[0] += items
+            totals[1] += seconds
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for JSON serialization.
+
+        ``images_per_second`` is per busy worker, so a step running on N
+        threads can sustain up to N times that rate.
+        """
+        with self._lock:
+            return {
+                step: {
+                    'images': int(items),
+                    'busy_seconds': seconds,
+                    'images_per_second': items / seconds if seconds > 0 else 0.0,
+                }
+                for step, (items, seconds) in self._steps.items()
+            }
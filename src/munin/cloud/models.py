@@ -4,16 +4,173 @@ Model provider for loading and managing models.
 
 from __future__ import annotations
 
+import ast
 import hashlib
+from dataclasses import asdict, dataclass
 from pathlib import Path
 from typing import Any
 
+import numpy as np
 import yaml
 
+from ...common.utils.file_utils import map_file
+from ..wildlife_detector import YOLODetector
 from .interfaces import ModelProvider, StorageLocation
 from .storage import create_storage_adapter
 
 
+def load_ultralytics_model(model_path: str) -> Any:
+    """
+    Load a ``.pt`` model with Ultralytics.
+
+    Detectors are wrapped in ``YOLODetector`` so they return ``Detection``
+    lists and support the Stage-1 resolution cascade; other tasks (e.g.
+    classifiers) are returned as loaded.
+    """
+    from ultralytics import YOLO
+
+    model = YOLO(model_path)
+    if getattr(model, 'task', None) != 'detect':
+        return model
+
+    detector = YOLODetector(model_path, conf=0.25)
+    detector.model = model
+    return detector
+
+
+class OnnxModel:
+    """
+    ONNX Runtime session with the runner's model interface.
+
+    Exported YOLO classifiers (output ``(N, classes)``) return a ``ClsResult``
+    per image and exported YOLO detectors (output ``(N, 4 + classes, anchors)``)
+    a list of ``Detection`` per image. Images are resized to the model input
+    like the calibration and accuracy data in ``model_optimizer``, and class
+    names come from the ``names`` metadata Ultralytics writes on export.
+    """
+
+    def __init__(self, model_path: str, conf: float = 0.25, iou: float = 0.45,
+                 default_imgsz: int = 640, providers: list[str] | None = None):
+        """
+        Args:
+            model_path: Path to the .onnx file
+            conf: Minimum detection confidence
+            iou: IoU threshold for non-maximum suppression
+            default_imgsz: Input size used when the model has dynamic spatial axes
+            providers: ONNX Runtime execution providers (CPU by default)
+        """
+        import onnxruntime as ort
+
+        self.model_path = model_path
+        self.conf = conf
+        self.iou = iou
+        self.session = ort.InferenceSession(model_path, providers=providers or ['CPUExecutionProvider'])
+
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        _, _, height, width = model_input.shape
+        self.input_size = (
+            height if isinstance(height, int) else default_imgsz,
+            width if isinstance(width, int) else default_imgsz,
+        )
+        # Static batch axis (the Ultralytics export default) means one image per run
+        batch = model_input.shape[0]
+        self.max_batch = batch if isinstance(batch, int) else None
+        self.is_detector = len(self.session.get_outputs()[0].shape) == 3
+
+        names = self.session.get_modelmeta().custom_metadata_map.get('names')
+        try:
+            self.names = {int(k): str(v) for k, v in ast.literal_eval(names).items()} if names else {}
+        except (ValueError, SyntaxError, AttributeError):
+            self.names = {}
+
+    def predict(self, image: Any) -> Any:
+        """Run the model on one PIL image or RGB uint8 array."""
+        return self.predict_batch([image])[0]
+
+    def predict_batch(self, images: list[Any]) -> list[Any]:
+        """Run the model on several images, in as few session runs as the input allows."""
+        arrays = [np.asarray(image.convert('RGB')) if hasattr(image, 'convert') else np.asarray(image)
+                  for image in images]
+        step = self.max_batch or max(len(arrays), 1)
+
+        results: list[Any] = []
+        for start in range(0, len(arrays), step):
+            chunk = arrays[start:start + step]
+            output = self.session.run(None, {self.input_name: self._preprocess(chunk)})[0]
+            if self.is_detector:
+                results.extend(self._decode_detections(row, array.shape[:2]) for row, array in zip(output, chunk))
+            else:
+                results.extend(self._decode_classification(row) for row in output)
+        return results
+
+    def _preprocess(self, arrays: list[np.ndarray]) -> np.ndarray:
+        """Resize to the model input, scale to [0, 1] and stack as NCHW float32."""
+        from PIL import Image
+
+        height, width = self.input_size
+        batch = []
+        for array in arrays:
+            if array.shape[:2] != (height, width):
+                array = np.asarray(Image.fromarray(array).resize((width, height)))
+            batch.append(np.transpose(array.astype(np.float32) / 255.0, (2, 0, 1)))
+        return np.stack(batch, axis=0)
+
+    def _label(self, class_id: int) -> str:
+        return self.names.get(class_id, str(class_id))
+
+    def _decode_classification(self, scores: np.ndarray) -> Any:
+        from ..classification_engine import ClsResult
+
+        class_id = int(np.argmax(scores))
+        return ClsResult(label=self._label(class_id), confidence=float(scores[class_id]))
+
+    def _decode_detections(self, output: np.ndarray, image_shape: tuple[int, int]) -> list[Any]:
+        """Confidence filter, per-class NMS and rescaling of one image's raw YOLO output."""
+        from ..wildlife_detector import Detection
+
+        predictions = output.T  # (anchors, 4 + classes)
+        class_ids = predictions[:, 4:].argmax(axis=1)
+        scores = predictions[np.arange(len(predictions)), 4 + class_ids]
+        keep = scores >= self.conf
+        predictions, class_ids, scores = predictions[keep], class_ids[keep], scores[keep]
+
+        cx, cy, w, h = predictions[:, 0], predictions[:, 1], predictions[:, 2], predictions[:, 3]
+        boxes = np.stack([cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2], axis=1)
+        height, width = self.input_size
+        boxes *= np.array([image_shape[1] / width, image_shape[0] / height] * 2)
+
+        detections = []
+        for class_id in np.unique(class_ids):
+            indices = np.flatnonzero(class_ids == class_id)
+            for index in _nms(boxes[indices], scores[indices], self.iou):
+                detections.append(Detection(
+                    label=self._label(int(class_id)),
+                    confidence=float(scores[indices[index]]),
+                    bbox=[float(v) for v in boxes[indices[index]]],
+                ))
+        detections.sort(key=lambda d: d.confidence, reverse=True)
+        return detections
+
+
+def _nms(boxes: np.ndarray, scores: np.ndarray, iou_threshold: float) -> list[int]:
+    """Indices of the boxes kept by greedy non-maximum suppression."""
+    order = scores.argsort()[::-1]
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    keep = []
+    while order.size:
+        best, rest = order[0], order[1:]
+        keep.append(int(best))
+        x1 = np.maximum(boxes[best, 0], boxes[rest, 0])
+        y1 = np.maximum(boxes[best, 1], boxes[rest, 1])
+        x2 = np.minimum(boxes[best, 2], boxes[rest, 2])
+        y2 = np.minimum(boxes[best, 3], boxes[rest, 3])
+        intersection = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+        iou = intersection / (areas[best] + areas[rest] - intersection + 1e-9)
+        order = rest[iou <= iou_threshold]
+    return keep
+
+
 class LocalModelProvider(ModelProvider):
     """Local model provider."""
 
@@ -29,11 +186,9 @@ class LocalModelProvider(ModelProvider):
 
         # Load model based on file extension
         if model_path.endswith('.pt'):
-            from ultralytics import YOLO
-            model = YOLO(model_path)
+            model = load_ultralytics_model(model_path)
         elif model_path.endswith('.onnx'):
-            import onnxruntime as ort
-            model = ort.InferenceSession(model_path)
+            model = OnnxModel(model_path)
         else:
             raise ValueError(f"Unsupported model format: {model_path}")
 
@@ -63,9 +218,7 @@ class LocalModelProvider(ModelProvider):
     def get_model_hash(self, model_path: str) -> str:
         """Get model hash for versioning."""
         try:
-            with open(model_path, 'rb') as f:
-                content = f.read()
-                return hashlib.sha256(content).hexdigest()[:16]
+            return hashlib.sha256(map_file(model_path)).hexdigest()[:16]
         except Exception:
             return "unknown"
 
@@ -98,11 +251,9 @@ class CloudModelProvider(ModelProvider):
 
         # Load model
         if model_path.endswith('.pt'):
-            from ultralytics import YOLO
-            model = YOLO(local_path)
+            model = load_ultralytics_model(local_path)
         elif model_path.endswith('.onnx'):
-            import onnxruntime as ort
-            model = ort.InferenceSession(local_path)
+            model = OnnxModel(local_path)
         else:
             raise ValueError(f"Unsupported model format: {model_path}")
 
@@ -154,8 +305,7 @@ class CloudModelProvider(ModelProvider):
         """Get model hash from cloud storage."""
         try:
             model_location = StorageLocation.from_url(f"{self.cache_path}/{model_path}")
-            content = self.storage.get(model_location)
-            return hashlib.sha256(content).hexdigest()[:16]
+            return hashlib.sha256(self.storage.get_view(model_location)).hexdigest()[:16]
         except Exception:
             return "unknown"
 
@@ -170,6 +320,89 @@ class CloudModelProvider(ModelProvider):
         }
 
 
+@dataclass
+class ModelVariant:
+    """A single optimized build of a model (precision/runtime combination)."""
+    name: str
+    stage: str  # stage1, stage2
+    path: str
+    precision: str  # fp32, fp16, int8
+    model_hash: str
+    latency_ms: float
+    accuracy: float | None = None
+    base_model: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for YAML serialization."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ModelVariant:
+        """Create from dictionary."""
+        return cls(**data)
+
+
+class ModelVariantRegistry:
+    """
+    Registry of model variants with their hash, latency and accuracy.
+
+    Variants are written by ``ModelOptimizer`` and read by the runners, which
+    pick the fastest variant for a stage that still meets an accuracy floor.
+    """
+
+    def __init__(self, registry_path: str = "models/variants.yaml"):
+        self.registry_path = Path(registry_path.replace("file://", ""))
+        self._variants: dict[str, ModelVariant] = {}
+        self._load()
+
+    def _load(self) -> None:
+        """Load registry from disk if it exists."""
+        if not self.registry_path.exists():
+            return
+
+        with open(self.registry_path) as f:
+            data = yaml.safe_load(f) or {}
+
+        for entry in data.get('variants', []):
+            variant = ModelVariant.from_dict(entry)
+            self._variants[variant.name] = variant
+
+    def save(self) -> None:
+        """Write registry to disk."""
+        self.registry_path.parent.mkdir(parents=True, exist_ok=True)
+        data = {'variants': [variant.to_dict() for variant in self._variants.values()]}
+        with open(self.registry_path, 'w') as f:
+            yaml.safe_dump(data, f, sort_keys=False)
+
+    def register(self, variant: ModelVariant) -> None:
+        """Add or replace a variant (keyed by name) and persist the registry."""
+        self._variants[variant.name] = variant
+        self.save()
+
+    def variants(self, stage: str | None = None) -> list[ModelVariant]:
+        """List registered variants, optionally filtered by stage."""
+        return [v for v in self._variants.values() if stage is None or v.stage == stage]
+
+    def select(self, stage: str, accuracy_floor: float | None = None,
+               base_model: str | None = None) -> ModelVariant | None:
+        """
+        Select the fastest variant for a stage that meets the accuracy floor.
+
+        Variants without a measured accuracy only qualify when no floor is set.
+        """
+        candidates = []
+        for variant in self.variants(stage):
+            if base_model is not None and variant.base_model != base_model:
+                continue
+            if accuracy_floor is not None and (variant.accuracy is None or variant.accuracy < accuracy_floor):
+                continue
+            candidates.append(variant)
+
+        if not candidates:
+            return None
+        return min(candidates, key=lambda v: v.latency_ms)
+
+
 def create_model_provider(provider_type: str, storage_adapter=None, **kwargs) -> ModelProvider:
     """Factory function to create model providers."""
     if provider_type == "local":
@@ -4,128 +4,942 @@ Runners for executing pipeline stages locally and in cloud.
 
 from __future__ import annotations
 
-import io
 import json
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import partial
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from PIL import Image
 from tqdm import tqdm
 
-from .interfaces import ManifestEntry, Runner, Stage2Entry, StorageLocation
+from ...common.utils.file_utils import ViewReader
+from ...common.utils.logging_utils import get_logger
+from ...common.utils.prefetch import BatchPrefetcher, batched
+from ..burst_grouping import (
+    Burst,
+    BurstConfig,
+    FrameSignature,
+    frame_signature,
+    group_bursts,
+)
+from ..exif_extractor import exif_from_bytes, get_timestamp_from_exif, infer_camera_id
+from ..motion_prefilter import MotionPrefilter, MotionPrefilterConfig, MotionScore
+from ..wildlife_detector import CascadeConfig, CascadeStats
+from .checkpoint import RunCheckpoint
+from .gating import GatingStats, Stage2GatingPolicy
+from .inference_cache import (
+    InferenceCache,
+    decode_classification,
+    decode_detections,
+    encode_classification,
+    encode_detections,
+)
+from .inference_server import RemoteModel
+from .interfaces import (
+    HEADER_BYTES,
+    IMAGE_SUFFIXES,
+    ManifestEntry,
+    Runner,
+    Stage2Entry,
+    StorageLocation,
+)
+from .manifest_io import find_entries_file, read_entries, write_entries
+from .metrics import CountHistogram, StageThroughput
+from .models import ModelVariantRegistry
+from .storage_cache import CachingStorageAdapter
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+    import numpy as np
+
+logger = get_logger("wildlife_pipeline.cloud.runners")
+
+
+@dataclass
+class _FrameItem:
+    """A Stage-1 image moving through the load/detect/write pipeline."""
+    location: StorageLocation
+    burst_id: str | None = None
+    content: bytes | None = None
+    image: Image.Image | None = None
+    cache_key: str | None = None
+    detections: list[Any] | None = None
+    thumbnail: np.ndarray | None = None  # prefilter thumbnail, computed while loading
+    motion: MotionScore | None = None
+    error: Exception | None = None
+
+
+@dataclass
+class _CropItem:
+    """A Stage-2 crop moving through the prefetch/classify loop."""
+    entry: ManifestEntry
+    cache_key: str | None = None
+    image: Image.Image | None = None
+    prediction: Any = None
+    error: Exception | None = None
+
+
+@dataclass
+class _Stage1Run:
+    """Detector, prefilter and statistics of one Stage-1 pass (plain or fused)."""
+    model: Any
+    model_path: str
+    config: dict[str, Any]
+    cache_context: dict[str, Any] | None
+    prefilter: MotionPrefilter | None
+    burst_config: BurstConfig
+    throughput: StageThroughput = field(default_factory=StageThroughput)
+    burst_stats: dict[str, Any] = field(default_factory=dict)
+    inputs: int = 0
+
+
+@dataclass
+class _FusedStage2:
+    """Classifier and pending in-memory crops of a fused run."""
+    model: Any
+    model_path: str
+    config: dict[str, Any]
+    cache_context: dict[str, Any] | None
+    gating: Stage2GatingPolicy | None
+    batch_size: int
+    save_crops: bool
+    throughput: StageThroughput
+    pending: list[_CropItem] = field(default_factory=list)
+    entries: list[Stage2Entry] = field(default_factory=list)  # finished, not yet committed
+    batch_sizes: CountHistogram = field(default_factory=CountHistogram)
+    gating_stats: GatingStats = field(default_factory=GatingStats)
+    crops_saved: int = 0
+
+
+class _WriterPool:
+    """Bounded thread pool for storage writes that overlap with inference."""
+
+    def __init__(self, workers: int, max_pending: int):
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="writer")
+        self._slots = threading.Semaphore(max(1, max_pending))
+        self._futures: list[tuple[str, Future]] = []
+
+    def submit(self, key: str, func: Callable[..., Any], *args: Any) -> None:
+        """Queue a write, blocking while ``max_pending`` writes are outstanding."""
+        self._slots.acquire()
+        future = self._executor.submit(func, *args)
+        future.add_done_callback(lambda _: self._slots.release())
+        self._futures.append((key, future))
+
+    def close(self) -> dict[str, BaseException]:
+        """Wait for every queued write; return the first error per key."""
+        self._executor.shutdown(wait=True)
+        errors: dict[str, BaseException] = {}
+        for key, future in self._futures:
+            error = future.exception()
+            if error is not None:
+                errors.setdefault(key, error)
+        return errors
 
 
 class LocalRunner(Runner):
     """Local runner for batch processing."""
 
-    def __init__(self, storage_adapter, model_provider, max_workers: int = 4):
+    # Config keys that change model output and therefore the inference cache key
+    STAGE1_CACHE_CONFIG_KEYS = ('image_size', 'cascade')
+    STAGE2_CACHE_CONFIG_KEYS = ('image_size',)
+
+    # Default number of images per Stage-1 model call
+    STAGE1_BATCH_SIZE = 8
+
+    # Default number of crops per Stage-2 model call
+    STAGE2_BATCH_SIZE = 32
+
+    # Images whose headers are fetched concurrently per round when planning bursts
+    BURST_HEADER_BATCH = 256
+
+    # Default inputs per checkpoint shard (``checkpoint_every``; 0 disables checkpointing)
+    CHECKPOINT_EVERY = 1000
+
+    def __init__(self, storage_adapter, model_provider, max_workers: int = 4, inference_client=None,
+                 inference_cache: InferenceCache | None = None, writer_workers: int | None = None,
+                 manifest_formats: tuple[str, ...] = ('jsonl',)):
         self.storage = storage_adapter
         self.model_provider = model_provider
-        self.max_workers = max_workers
+        self.max_workers = max_workers  # storage get + decode threads
+        self.writer_workers = writer_workers or max_workers  # crop encode + put threads
+        self.inference_client = inference_client
+        self.inference_cache = inference_cache
+        self.manifest_formats = tuple(manifest_formats)  # 'parquet' and/or 'jsonl'
 
     def run_stage1(self, input_prefix: str, output_prefix: str, config: dict[str, Any]) -> list[ManifestEntry]:
         """Run Stage-1 processing locally."""
         print(f"Running Stage-1 locally: {input_prefix} -> {output_prefix}")
 
-        # Load Stage-1 model
-        model_path = config.get('stage1_model', 'megadetector')
-        model = self.model_provider.load_model(model_path)
+        run = self._start_stage1(config)
+        stage_start = time.perf_counter()
 
-        # Get input files
-        input_location = StorageLocation.from_url(input_prefix)
-        image_files = self.storage.list(input_location, "*.jpg")
-        image_files.extend(self.storage.list(input_location, "*.jpeg"))
-        image_files.extend(self.storage.list(input_location, "*.png"))
+        # Images a previous interrupted run already finished are not processed again
+        checkpoint = self._checkpoint(f"{output_prefix}/stage1", config, input_prefix=input_prefix)
+        rows, done = checkpoint.load() if checkpoint else ([], set())
+        manifest_entries = [ManifestEntry.from_dict(row) for row in rows]
 
-        print(f"Found {len(image_files)} images to process")
+        for results in self._stage1_chunks(run, input_prefix, output_prefix, checkpoint, done):
+            chunk_entries = [entry for _, entries in results for entry in entries or []]
+            manifest_entries.extend(chunk_entries)
+            if checkpoint:
+                # Failed images stay out of the marker so a resumed run retries them
+                checkpoint.write_shard([entry.to_dict() for entry in chunk_entries],
+                                       [url for url, entries in results if entries is not None])
+
+        # Save manifest
+        self._save_manifest(manifest_entries, f"{output_prefix}/stage1/manifest")
+
+        report = self._stage_report('stage1', run.model_path, run.inputs, len(manifest_entries), stage_start)
+        self._add_stage1_report(run, checkpoint, report)
+        self._save_run_report(report, f"{output_prefix}/stage1/run_report.json")
+
+        return manifest_entries
+
+    def _start_stage1(self, config: dict[str, Any]) -> _Stage1Run:
+        """Load the Stage-1 model and set up the prefilter, cascade and burst grouping."""
+        model_path = self._resolve_model_path(config, 'stage1', 'megadetector')
+        model = self._load_model(model_path)
+        self._configure_cascade(model, config)
+        return _Stage1Run(
+            model=model,
+            model_path=model_path,
+            config=config,
+            cache_context=self._cache_context(model_path, config, self.STAGE1_CACHE_CONFIG_KEYS),
+            prefilter=self._build_prefilter(config),
+            burst_config=BurstConfig.from_dict(config.get('burst') or {}),
+        )
+
+    def _stage1_chunks(self, run: _Stage1Run, input_prefix: str, output_prefix: str,
+                       checkpoint: RunCheckpoint | None, done: set[str], fused: _FusedStage2 | None = None,
+                       desc: str = "Processing Stage-1") -> Iterator[list[tuple[str, list[ManifestEntry] | None]]]:
+        """Detect on the inputs not in ``done``; yields (image url, entries) per frame for each checkpoint chunk."""
+        remaining = self._list_input_images(input_prefix, done)
+        run.inputs = len(remaining) + len(done)
+
+        # Group bursts so detection runs on one representative frame per trigger
+        bursts = self._plan_bursts(remaining, input_prefix, run.burst_config)
+        run.burst_stats = {'bursts': len(bursts), 'frames': len(remaining), 'inferred': 0, 'propagated': 0}
+
+        # Loads and crop writes run on thread pools around batched detection
+        batch_size = max(1, int(run.config.get('batch_size', self.STAGE1_BATCH_SIZE)))
+
+        with tqdm(total=len(remaining), desc=desc) as progress:
+            run_frames = partial(self._stage1_frames, model=run.model, model_path=run.model_path, config=run.config,
+                                 cache_context=run.cache_context, prefilter=run.prefilter, input_prefix=input_prefix,
+                                 output_prefix=output_prefix, batch_size=batch_size,
+                                 throughput=run.throughput, progress=progress, fused=fused)
+            for chunk in self._work_chunks(bursts, checkpoint, lambda burst: len(burst.frames)):
+                yield self._stage1_bursts(chunk, run_frames, run.model_path, run.config, run.burst_config,
+                                          batch_size, run.burst_stats, progress, fused)
+
+    def _add_stage1_report(self, run: _Stage1Run, checkpoint: RunCheckpoint | None,
+                           report: dict[str, Any]) -> None:
+        """Add throughput, checkpoint, cascade, prefilter and burst sections, then clear the checkpoint."""
+        report['throughput'] = run.throughput.to_dict()
+        if checkpoint:
+            report['checkpoint'] = checkpoint.to_dict()
+            checkpoint.clear()
+        model = run.model
+        if isinstance(getattr(model, 'cascade_stats', None), CascadeStats) and model.cascade.enabled:
+            report['cascade'] = model.cascade_stats.to_dict(model.cascade)
+        if run.prefilter is not None:
+            report['prefilter'] = run.prefilter.stats()
+        if run.burst_config.enabled:
+            burst_stats = run.burst_stats
+            burst_stats['detection_calls_avoided'] = (
+                burst_stats['propagated'] / burst_stats['frames'] if burst_stats['frames'] else 0.0
+            )
+            report['bursts'] = burst_stats
+
+    def _stage1_bursts(self, bursts: list[Burst], run_frames: Callable[..., list[list[ManifestEntry] | None]],
+                       model_path: str, config: dict[str, Any], burst_config: BurstConfig, batch_size: int,
+                       burst_stats: dict[str, Any], progress,
+                       fused: _FusedStage2 | None = None) -> list[tuple[str, list[ManifestEntry] | None]]:
+        """Process bursts; (image url, entries) per frame in burst order, entries None where the image failed.
+
+        In fused mode the last crops of the chunk are classified before its
+        writes are awaited, so ``fused.entries`` covers the whole chunk.
+        """
+        writer = _WriterPool(self.writer_workers, max_pending=4 * batch_size)
+        try:
+            representatives = [_FrameItem(burst.representative.key, burst.burst_id if burst_config.enabled else None)
+                               for burst in bursts]
+            representative_entries = run_frames(representatives, writer=writer)
+
+            # The rest of a burst is only processed when the representative found something.
+            # Those frames skip the prefilter: its background follows the representatives in
+            # capture order, and the representative already showed motion for the burst.
+            process_all = [entries is None or any(entry.observation_any for entry in entries)
+                           for entries in representative_entries]
+            others = [_FrameItem(frame.key, item.burst_id)
+                      for burst, item, process in zip(bursts, representatives, process_all) if process
+                      for frame in burst.others]
+            other_entries = iter(run_frames(others, writer=writer, prefilter=None))
+            if fused is not None:
+                self._finish_fused_batch(fused, writer)
+        finally:
+            write_errors = writer.close()
+
+        # Timestamps of frames that skip detection come from concurrent header reads
+        propagated = [frame.key for burst, process in zip(bursts, process_all) if not process for frame in burst.others]
+        headers = {location.url: header for location, header in zip(propagated, self.storage.get_headers(propagated))
+                   if isinstance(header, bytes)}
+
+        # Representative first, then the rest of its burst
+        results = []
+        for burst, item, entries, process in zip(bursts, representatives, representative_entries, process_all):
+            burst_stats['inferred'] += 1
+            results.append((item.location.url, entries))
+            for frame in burst.others:
+                if process:
+                    results.append((frame.key.url, next(other_entries)))
+                    burst_stats['inferred'] += 1
+                else:
+                    results.append((frame.key.url, [self._empty_frame_entry(
+                        frame.key, model_path, config, burst_id=item.burst_id, inference='propagated',
+                        content=headers.get(frame.key.url)
+                    )]))
+                    burst_stats['propagated'] += 1
+                    progress.update(1)
+
+        # Images whose crops could not be stored are dropped, as on any other error
+        for source_path, error in write_errors.items():
+            print(f"Error processing {source_path}: {error}")
+        return [(url, None if url in write_errors else entries) for url, entries in results]
+
+    def _stage1_frames(self, items: list[_FrameItem], model, model_path: str, config: dict[str, Any],
+                       cache_context: dict[str, Any] | None, prefilter: MotionPrefilter | None,
+                       input_prefix: str, output_prefix: str, batch_size: int, writer: _WriterPool,
+                       throughput: StageThroughput, progress,
+                       fused: _FusedStage2 | None = None) -> list[list[ManifestEntry] | None]:
+        """Detect and crop images in order; one entry list per item, None where the image failed.
+
+        Images are fetched and decoded on the I/O pool ahead of detection, and
+        crops are encoded and stored on the writer pool behind it, or in fused
+        mode classified in memory. With the prefilter on, loading stops at its
+        reduced-size thumbnail and only frames that pass are decoded in full.
+        """
+        prefetcher = BatchPrefetcher(
+            lambda frames: self._load_frame(frames[0], cache_context, throughput, prefilter),
+            workers=self.max_workers, prefetch=2 * batch_size, name="stage1_prefetch"
+        )
+        decoder = ThreadPoolExecutor(max_workers=self.max_workers) if prefilter is not None else None
+        results: list[list[ManifestEntry] | None] = []
+        try:
+            for batch in batched(prefetcher.map(items), batch_size):
+                if prefilter is not None:
+                    # The prefilter background is updated in capture order, on this thread
+                    for item in batch:
+                        if item.error is None:
+                            camera_id = self._input_camera_id(item.location, input_prefix)
+                            item.motion = prefilter.score_thumbnail(camera_id, item.thumbnail)
+                            item.thumbnail = None
+
+                    passed = [item for item in batch if item.error is None and item.motion.passed
+                              and (item.detections is None or item.detections)]
+                    list(decoder.map(partial(self._decode_frame, throughput=throughput), passed))
+
+                misses = [item for item in batch if item.error is None and item.detections is None
+                          and (item.motion is None or item.motion.passed)]
+                if misses:
+                    with throughput.measure('detect', len(misses)):
+                        self._detect_batch(model, misses)
+
+                for item in batch:
+                    results.append(self._frame_entries(item, model_path, config, output_prefix, writer, throughput,
+                                                       fused))
+                progress.update(len(batch))
+        finally:
+            if decoder is not None:
+                decoder.shutdown()
+        return results
+
+    def _load_frame(self, item: _FrameItem, cache_context: dict[str, Any] | None,
+                    throughput: StageThroughput, prefilter: MotionPrefilter | None = None) -> _FrameItem:
+        """Fetch and decode an image, answering its detections from the inference cache if possible.
+
+        With a prefilter only its thumbnail is decoded here; ``_decode_frame``
+        decodes the frames that pass.
+        """
+        try:
+            with throughput.measure('load'):
+                item.content = self.storage.get_view(item.location)
+
+                if cache_context is not None:
+                    item.cache_key = InferenceCache.make_key(
+                        InferenceCache.hash_content(item.content), cache_context['model_hash'], cache_context['config']
+                    )
+                    cached = self.inference_cache.get(item.cache_key)
+                    if cached is not None:
+                        item.detections = decode_detections(cached)
+
+                if prefilter is not None:
+                    # Reduced-size (draft) decode; skipped frames are never decoded in full
+                    with Image.open(ViewReader(item.content)) as thumbnail_source:
+                        item.thumbnail = prefilter.thumbnail(thumbnail_source)
+                elif item.detections is None or item.detections:
+                    # Decoded here so detection and cropping never wait on it
+                    item.image = Image.open(ViewReader(item.content))
+                    item.image.load()
+        except Exception as e:
+            item.error = e
+        return item
+
+    def _decode_frame(self, item: _FrameItem, throughput: StageThroughput) -> None:
+        """Fully decode a loaded frame that passed the prefilter."""
+        try:
+            with throughput.measure('decode'):
+                item.image = Image.open(ViewReader(item.content))
+                item.image.load()
+        except Exception as e:
+            item.error = e
+
+    def _detect_batch(self, model, items: list[_FrameItem]) -> None:
+        """Detect on decoded images in one call when the model supports batching."""
+        try:
+            if hasattr(model, 'predict_batch'):
+                results = model.predict_batch([item.image for item in items])
+            else:
+                results = [model.predict(item.image) for item in items]
+        except Exception as e:
+            for item in items:
+                item.error = e
+            return
+
+        for item, detections in zip(items, results):
+            item.detections = detections
+            if item.cache_key is not None:
+                self.inference_cache.put(item.cache_key, encode_detections(detections))
+
+    def _frame_entries(self, item: _FrameItem, model_path: str, config: dict[str, Any], output_prefix: str,
+                       writer: _WriterPool, throughput: StageThroughput,
+                       fused: _FusedStage2 | None = None) -> list[ManifestEntry] | None:
+        """Manifest entries for a detected image, queueing its crops on the writer pool (or the fused classifier)."""
+        inference = 'inferred' if item.burst_id is not None else None
+        image_file = item.location
+        if item.error is not None:
+            print(f"Error processing {image_file.url}: {item.error}")
+            return None
+
+        # Frames with no motion against the camera background skip detection
+        if item.motion is not None and not item.motion.passed:
+            return [self._empty_frame_entry(image_file, model_path, config, motion=item.motion,
+                                            burst_id=item.burst_id, inference=inference, content=item.content)]
 
-        # Process images
         manifest_entries = []
-        StorageLocation.from_url(f"{output_prefix}/stage1/crops")
-
-        for image_file in tqdm(image_files, desc="Processing Stage-1"):
-            try:
-                # Load image
-                image_content = self.storage.get(image_file)
-                image = Image.open(io.BytesIO(image_content))
-
-                # Run detection
-                detections = model.predict(image)
-
-                # Process detections
-                for i, detection in enumerate(detections):
-                    if detection.confidence >= config.get('conf_threshold', 0.3):
-                        # Create crop
-                        crop_path = f"crops/{image_file.path.stem}_{i}.jpg"
-                        crop_location = StorageLocation.from_url(f"{output_prefix}/stage1/{crop_path}")
-
-                        # Save crop
-                        crop_image = image.crop(detection.bbox)
-                        crop_bytes = self._image_to_bytes(crop_image)
-                        self.storage.put(crop_location, crop_bytes)
-
-                        # Create manifest entry
-                        manifest_entry = ManifestEntry(
-                            source_path=image_file.url,
-                            crop_path=crop_location.url,
-                            camera_id=self._extract_camera_id(image_file.path),
-                            timestamp=self._extract_timestamp(image_file.path),
-                            bbox=detection.bbox,
-                            det_score=detection.confidence,
-                            stage1_model=model_path,
-                            config_hash=self._get_config_hash(config)
-                        )
-                        manifest_entries.append(manifest_entry)
-
-            except Exception as e:
-                print(f"Error processing {image_file.url}: {e}")
-                continue
+        timestamp = self._extract_timestamp(image_file, item.content)
+        for i, detection in enumerate(item.detections):
+            if detection.confidence >= config.get('conf_threshold', 0.3):
+                crop_path = f"crops/{Path(image_file.path).stem}_{i}.jpg"
+                crop_location = StorageLocation.from_url(f"{output_prefix}/stage1/{crop_path}")
+                manifest_entry = ManifestEntry(
+                    source_path=image_file.url,
+                    crop_path=crop_location.url,
+                    camera_id=self._extract_camera_id(image_file.path),
+                    timestamp=timestamp,
+                    bbox=detection.bbox,
+                    det_score=detection.confidence,
+                    stage1_model=model_path,
+                    config_hash=self._get_config_hash(config),
+                    stage1_label=detection.label,
+                    observation_any=True,
+                    motion_score=item.motion.score if item.motion else None,
+                    burst_id=item.burst_id,
+                    inference=inference
+                )
+                manifest_entries.append(manifest_entry)
 
-        # Save manifest
-        self._save_manifest(manifest_entries, f"{output_prefix}/stage1/manifest.jsonl")
+                if fused is None:
+                    writer.submit(image_file.url, self._write_crop, item.image, detection.bbox, crop_location,
+                                  throughput)
+                else:
+                    self._fused_crop(fused, manifest_entry, item.image.crop(detection.bbox), writer)
 
+        # Queued crops keep their own reference to the decoded image
+        item.content = item.image = None
         return manifest_entries
 
+    def _write_crop(self, image: Image.Image, bbox: list[float] | None, crop_location: StorageLocation,
+                    throughput: StageThroughput) -> None:
+        """Encode and store one crop (runs on the writer pool); ``bbox`` None stores ``image`` as is."""
+        with throughput.measure('write'):
+            self.storage.put(crop_location, self._image_to_bytes(image.crop(bbox) if bbox is not None else image))
+
+    def _plan_bursts(self, image_files: list[StorageLocation], input_prefix: str,
+                     burst_config: BurstConfig) -> list[Burst]:
+        """Group images into bursts, or one single-frame burst per image when grouping is off."""
+        if not burst_config.enabled:
+            return [Burst(burst_id="", frames=[FrameSignature(image_file, "", None, 0)]) for image_file in image_files]
+
+        # Timestamps and EXIF thumbnails come from ranged header reads; only images
+        # without a thumbnail are read in full, for a draft-mode decode
+        signatures = []
+        for chunk in batched(image_files, self.BURST_HEADER_BATCH):
+            for image_file, header in zip(chunk, self.storage.get_headers(chunk, HEADER_BYTES)):
+                if isinstance(header, BaseException):
+                    print(f"Error reading {image_file.url}: {header}")
+                    continue
+                fetch = partial(self.storage.get_view, image_file) if len(header) >= HEADER_BYTES else None
+                signatures.append(frame_signature(header, image_file, self._input_camera_id(image_file, input_prefix),
+                                                  sort_key=image_file.path, fetch=fetch))
+
+        bursts = group_bursts(signatures, burst_config)
+        print(f"Grouped {len(signatures)} images into {len(bursts)} bursts")
+        return bursts
+
     def run_stage2(self, manifest_entries: list[ManifestEntry], output_prefix: str, config: dict[str, Any]) -> list[Stage2Entry]:
         """Run Stage-2 processing locally."""
         print(f"Running Stage-2 locally on {len(manifest_entries)} crops")
 
         # Load Stage-2 model
-        model_path = config.get('stage2_model', 'yolo_cls')
-        model = self.model_provider.load_model(model_path)
-
-        stage2_entries = []
-
-        for manifest_entry in tqdm(manifest_entries, desc="Processing Stage-2"):
-            try:
-                # Load crop
-                crop_location = StorageLocation.from_url(manifest_entry.crop_path)
-                crop_content = self.storage.get(crop_location)
-                crop_image = Image.open(io.BytesIO(crop_content))
-
-                # Run classification
-                prediction = model.predict(crop_image)
-
-                # Create Stage-2 entry
-                stage2_entry = Stage2Entry(
-                    crop_path=manifest_entry.crop_path,
-                    label=prediction.label,
-                    confidence=prediction.confidence,
-                    auto_ok=prediction.confidence >= config.get('conf_threshold', 0.5),
-                    stage2_model=model_path,
-                    stage1_model=manifest_entry.stage1_model,
-                    config_hash=manifest_entry.config_hash
+        model_path = self._resolve_model_path(config, 'stage2', 'yolo_cls')
+        model = self._load_model(model_path)
+        cache_context = self._cache_context(model_path, config, self.STAGE2_CACHE_CONFIG_KEYS)
+        batch_size = max(1, int(config.get('batch_size', self.STAGE2_BATCH_SIZE)))
+        batch_sizes = CountHistogram()
+        gating = Stage2GatingPolicy.from_config(config)
+        gating_stats = GatingStats()
+        stage_start = time.perf_counter()
+
+        # Crops a previous interrupted run already classified are not classified again
+        checkpoint = self._checkpoint(f"{output_prefix}/stage2", config)
+        rows, done = checkpoint.load() if checkpoint else ([], set())
+
+        # Detections Stage-1 already answered confidently skip the classifier
+        stage2_entries = [Stage2Entry.from_dict(row) for row in rows]
+        to_classify = []
+        for manifest_entry in manifest_entries:
+            if manifest_entry.observation_any is False or manifest_entry.crop_path in done:
+                continue  # frame skipped by the prefilter (no crop), or already classified
+            gated_entry = self._gated_entry(manifest_entry, gating, gating_stats)
+            if gated_entry is None:
+                to_classify.append(manifest_entry)
+            else:
+                stage2_entries.append(gated_entry)
+
+        prefetch_stats: dict[str, Any] = {}
+        throughput = StageThroughput()
+        shard: list[Stage2Entry] = []
+        shard_inputs: list[str] = []
+        with tqdm(total=len(to_classify), desc="Processing Stage-2") as progress:
+            # The next batches of crops are fetched and decoded while this one classifies
+            for batch in self._iter_crop_batches(to_classify, batch_size, cache_context, prefetch_stats, throughput):
+                misses = [item for item in batch if item.prediction is None and item.error is None]
+                if misses:
+                    with throughput.measure('classify', len(misses)):
+                        self._classify_batch(model, misses)
+                    batch_sizes.observe(len(misses))
+
+                for item in batch:
+                    if item.error is not None:
+                        print(f"Error processing {item.entry.crop_path}: {item.error}")
+                        continue
+
+                    shard.append(self._classified_entry(item, model_path, config))
+                    shard_inputs.append(item.entry.crop_path)
+
+                progress.update(len(batch))
+                if checkpoint is None or len(shard_inputs) >= checkpoint.every:
+                    self._commit_shard(checkpoint, shard, shard_inputs, stage2_entries)
+
+            self._commit_shard(checkpoint, shard, shard_inputs, stage2_entries)
+
+        # Save predictions in manifest order
+        self._sort_like_manifest(stage2_entries, manifest_entries)
+        self._save_predictions(stage2_entries, f"{output_prefix}/stage2/predictions")
+
+        report = self._stage_report('stage2', model_path, len(manifest_entries), len(stage2_entries), stage_start)
+        report['batch_size'] = batch_sizes.to_dict()
+        report['stage2_gating'] = gating_stats.to_dict()
+        report['prefetch'] = prefetch_stats
+        report['throughput'] = throughput.to_dict()
+        if checkpoint:
+            report['checkpoint'] = checkpoint.to_dict()
+            checkpoint.clear()
+        self._save_run_report(report, f"{output_prefix}/stage2/run_report.json")
+
+        return stage2_entries
+
+    def run_fused(self, input_prefix: str, output_prefix: str, stage1_config: dict[str, Any],
+                  stage2_config: dict[str, Any], save_crops: bool = False) -> tuple[list[ManifestEntry], list[Stage2Entry]]:
+        """Run Stage-1 and Stage-2 in one pass, classifying crops in memory.
+
+        Stage-1 runs exactly as in ``run_stage1`` (prefetching, bursts, the
+        prefilter and checkpoints), but crops go to the batched classifier
+        instead of storage. Crops are only written when ``save_crops`` is set
+        or the prediction needs review (not auto_ok). ``crop_path`` still names
+        every crop, so the manifest and predictions join exactly as in a
+        staged run.
+        """
+        print(f"Running fused Stage-1/Stage-2 locally: {input_prefix} -> {output_prefix}")
+
+        run = self._start_stage1(stage1_config)
+        stage2_model_path = self._resolve_model_path(stage2_config, 'stage2', 'yolo_cls')
+        fused = _FusedStage2(
+            model=self._load_model(stage2_model_path),
+            model_path=stage2_model_path,
+            config=stage2_config,
+            cache_context=self._cache_context(stage2_model_path, stage2_config, self.STAGE2_CACHE_CONFIG_KEYS),
+            gating=Stage2GatingPolicy.from_config(stage2_config),
+            batch_size=max(1, int(stage2_config.get('batch_size', self.STAGE2_BATCH_SIZE))),
+            save_crops=save_crops,
+            throughput=run.throughput,
+        )
+        stage_start = time.perf_counter()
+
+        # One checkpoint holds both outputs, so a shard never has a manifest without its predictions
+        checkpoint = self._checkpoint(f"{output_prefix}/fused", stage1_config, input_prefix=input_prefix,
+                                      stage2=stage2_config, save_crops=save_crops)
+        rows, done = checkpoint.load() if checkpoint else ([], set())
+        manifest_entries = [ManifestEntry.from_dict(row['manifest']) for row in rows if 'manifest' in row]
+        stage2_entries = [Stage2Entry.from_dict(row['prediction']) for row in rows if 'prediction' in row]
+
+        for results in self._stage1_chunks(run, input_prefix, output_prefix, checkpoint, done, fused,
+                                           desc="Processing Stage-1/Stage-2"):
+            chunk_entries = [entry for _, entries in results for entry in entries or []]
+            # Predictions of images that were dropped (e.g. a crop failed to store) go with them
+            crop_paths = {entry.crop_path for entry in chunk_entries}
+            chunk_predictions = [entry for entry in fused.entries if entry.crop_path in crop_paths]
+            fused.entries = []
+
+            manifest_entries.extend(chunk_entries)
+            stage2_entries.extend(chunk_predictions)
+            if checkpoint:
+                checkpoint.write_shard([{'manifest': entry.to_dict()} for entry in chunk_entries]
+                                       + [{'prediction': entry.to_dict()} for entry in chunk_predictions],
+                                       [url for url, entries in results if entries is not None])
+
+        # Save manifest and predictions
+        self._sort_like_manifest(stage2_entries, manifest_entries)
+        self._save_manifest(manifest_entries, f"{output_prefix}/stage1/manifest")
+        self._save_predictions(stage2_entries, f"{output_prefix}/stage2/predictions")
+
+        report = self._stage_report('fused', stage2_model_path, run.inputs, len(stage2_entries), stage_start)
+        report['stage1_model'] = run.model_path
+        report['crops'] = sum(1 for entry in manifest_entries if entry.observation_any is not False)
+        report['crops_saved'] = fused.crops_saved
+        report['batch_size'] = fused.batch_sizes.to_dict()
+        report['stage2_gating'] = fused.gating_stats.to_dict()
+        self._add_stage1_report(run, checkpoint, report)
+        self._save_run_report(report, f"{output_prefix}/run_report.json")
+
+        return manifest_entries, stage2_entries
+
+    def _fused_crop(self, fused: _FusedStage2, manifest_entry: ManifestEntry, crop: Image.Image,
+                    writer: _WriterPool) -> None:
+        """Queue a Stage-1 crop for in-memory classification, classifying once a batch is full."""
+        gated_entry = self._gated_entry(manifest_entry, fused.gating, fused.gating_stats)
+        if gated_entry is not None:
+            fused.entries.append(gated_entry)
+            if fused.save_crops:
+                self._save_fused_crop(fused, manifest_entry, crop.convert('RGB'), writer)
+            return
+
+        fused.pending.append(self._in_memory_crop(manifest_entry, crop, fused.cache_context))
+        if len(fused.pending) >= fused.batch_size:
+            self._finish_fused_batch(fused, writer)
+
+    def _in_memory_crop(self, manifest_entry: ManifestEntry, crop: Image.Image,
+                        cache_context: dict[str, Any] | None) -> _CropItem:
+        """Wrap a Stage-1 crop for classification, answering it from the inference cache if possible."""
+        item = _CropItem(entry=manifest_entry, image=crop.convert('RGB'))
+        if cache_context is None:
+            return item
+
+        # Keyed on decoded pixels, since fused crops never go through JPEG
+        item.cache_key = InferenceCache.make_key(
+            InferenceCache.hash_content(item.image.tobytes()), cache_context['model_hash'],
+            {**cache_context['config'], 'crop_size': list(item.image.size)}
+        )
+        cached = self.inference_cache.get(item.cache_key)
+        if cached is not None:
+            item.prediction = decode_classification(cached)
+        return item
+
+    def _finish_fused_batch(self, fused: _FusedStage2, writer: _WriterPool) -> None:
+        """Classify the pending in-memory crops and queue writes for the ones that need keeping."""
+        items, fused.pending = fused.pending, []
+        misses = [item for item in items if item.prediction is None]
+        if misses:
+            with fused.throughput.measure('classify', len(misses)):
+                self._classify_batch(fused.model, misses)
+            fused.batch_sizes.observe(len(misses))
+
+        for item in items:
+            if item.error is not None:
+                print(f"Error classifying {item.entry.crop_path}: {item.error}")
+                auto_ok = False
+            else:
+                stage2_entry = self._classified_entry(item, fused.model_path, fused.config)
+                auto_ok = stage2_entry.auto_ok
+                fused.entries.append(stage2_entry)
+
+            if fused.save_crops or not auto_ok:
+                self._save_fused_crop(fused, item.entry, item.image, writer)
+
+    def _save_fused_crop(self, fused: _FusedStage2, manifest_entry: ManifestEntry, crop: Image.Image,
+                         writer: _WriterPool) -> None:
+        """Store an in-memory crop at its manifest ``crop_path`` on the writer pool."""
+        writer.submit(manifest_entry.source_path, self._write_crop, crop, None,
+                      StorageLocation.from_url(manifest_entry.crop_path), fused.throughput)
+        fused.crops_saved += 1
+
+    def _gated_entry(self, manifest_entry: ManifestEntry, gating: Stage2GatingPolicy | None,
+                     gating_stats: GatingStats) -> Stage2Entry | None:
+        """Stage-2 entry taken from Stage-1 when the gating policy allows skipping the classifier."""
+        reason = gating.skip_reason(manifest_entry.stage1_label, manifest_entry.det_score) if gating else None
+        gating_stats.observe(manifest_entry.stage1_label, reason is not None)
+        if reason is None:
+            return None
+
+        return Stage2Entry(
+            crop_path=manifest_entry.crop_path,
+            label=manifest_entry.stage1_label,
+            confidence=manifest_entry.det_score,
+            auto_ok=True,
+            stage2_model=None,
+            stage1_model=manifest_entry.stage1_model,
+            config_hash=manifest_entry.config_hash,
+            auto_ok_reason=reason
+        )
+
+    def _classified_entry(self, item: _CropItem, model_path: str, config: dict[str, Any]) -> Stage2Entry:
+        """Stage-2 entry for a crop the classifier has labelled."""
+        auto_ok = item.prediction.confidence >= config.get('conf_threshold', 0.5)
+        return Stage2Entry(
+            crop_path=item.entry.crop_path,
+            label=item.prediction.label,
+            confidence=item.prediction.confidence,
+            auto_ok=auto_ok,
+            stage2_model=model_path,
+            stage1_model=item.entry.stage1_model,
+            config_hash=item.entry.config_hash,
+            auto_ok_reason="stage2_confident" if auto_ok else None
+        )
+
+    @staticmethod
+    def _sort_like_manifest(stage2_entries: list[Stage2Entry], manifest_entries: list[ManifestEntry]) -> None:
+        """Order predictions like the manifest they were produced from."""
+        order = {entry.crop_path: i for i, entry in enumerate(manifest_entries)}
+        stage2_entries.sort(key=lambda entry: order.get(entry.crop_path, len(order)))
+
+    def _build_prefilter(self, config: dict[str, Any]) -> MotionPrefilter | None:
+        """Create the motion prefilter when enabled in the Stage-1 config."""
+        prefilter_config = MotionPrefilterConfig.from_dict(config.get('prefilter') or {})
+        return MotionPrefilter(prefilter_config) if prefilter_config.enabled else None
+
+    def _input_camera_id(self, image_file: StorageLocation, input_prefix: str) -> str:
+        """Camera id as in infer_camera_id: first folder under the input prefix, else the prefix itself."""
+        input_path = Path(StorageLocation.from_url(input_prefix).path)
+        image_path = Path(image_file.path)
+        try:
+            relative = image_path.relative_to(input_path)
+        except ValueError:
+            return image_path.parent.name or "unknown"
+        if len(relative.parts) > 1:
+            return infer_camera_id(image_path, input_path)
+        return input_path.name or "unknown"
+
+    def _empty_frame_entry(self, image_file: StorageLocation, model_path: str, config: dict[str, Any],
+                           motion: MotionScore | None = None, burst_id: str | None = None,
+                           inference: str | None = None, content: bytes | None = None) -> ManifestEntry:
+        """Manifest entry for a frame kept away from detection (prefilter or burst propagation)."""
+        return ManifestEntry(
+            source_path=image_file.url,
+            crop_path="",
+            camera_id=self._extract_camera_id(image_file.path),
+            timestamp=self._extract_timestamp(image_file, content),
+            bbox={},
+            det_score=0.0,
+            stage1_model=model_path,
+            config_hash=self._get_config_hash(config),
+            observation_any=False,
+            motion_score=motion.score if motion else None,
+            burst_id=burst_id,
+            inference=inference
+        )
+
+    def _list_input_images(self, input_prefix: str, done: set[str] | None = None) -> list:
+        """List input images under a prefix and its camera folders, leaving out ``done`` urls."""
+        # One streaming pass in path order, which is capture order for trail cameras
+        # and what the prefilter background relies on
+        input_location = StorageLocation.from_url(input_prefix)
+        image_files = [image_file for image_file in self.storage.iter_list(input_location, IMAGE_SUFFIXES)
+                       if not done or image_file.url not in done]
+
+        print(f"Found {len(image_files)} images to process")
+        return image_files
+
+    def _load_crop(self, manifest_entry: ManifestEntry, cache_context: dict[str, Any] | None) -> _CropItem:
+        """Fetch a crop and decode it, unless the inference cache already has its prediction."""
+        item = _CropItem(entry=manifest_entry)
+        try:
+            crop_location = StorageLocation.from_url(manifest_entry.crop_path)
+            crop_content = self.storage.get_view(crop_location)
+
+            if cache_context is not None:
+                item.cache_key = InferenceCache.make_key(
+                    InferenceCache.hash_content(crop_content), cache_context['model_hash'], cache_context['config']
                 )
-                stage2_entries.append(stage2_entry)
+                cached = self.inference_cache.get(item.cache_key)
+                if cached is not None:
+                    item.prediction = decode_classification(cached)
+                    return item
+
+            item.image = Image.open(ViewReader(crop_content)).convert('RGB')
+        except Exception as e:
+            item.error = e
+        return item
+
+    def _iter_crop_batches(self, manifest_entries: list[ManifestEntry], batch_size: int,
+                           cache_context: dict[str, Any] | None,
+                           prefetch_stats: dict[str, Any] | None = None,
+                           throughput: StageThroughput | None = None) -> Iterator[list[_CropItem]]:
+        """Yield loaded crop batches, with up to two batches of crops loading ahead on the I/O pool."""
+        throughput = throughput or StageThroughput()
+
+        def load(entries: list[ManifestEntry]) -> _CropItem:
+            with throughput.measure('load'):
+                return self._load_crop(entries[0], cache_context)
+
+        prefetcher = BatchPrefetcher(
+            load,
+            workers=self.max_workers, prefetch=2 * batch_size, name="stage2_prefetch"
+        )
+        yield from batched(prefetcher.map(manifest_entries), batch_size)
+        if prefetch_stats is not None:
+            prefetch_stats.update(prefetcher.stats.to_dict())
+
+    def _classify_batch(self, model, items: list[_CropItem]) -> None:
+        """Classify decoded crops in one call when the model supports batching."""
+        try:
+            if hasattr(model, 'predict_batch'):
+                predictions = model.predict_batch([item.image for item in items])
+            else:
+                predictions = [model.predict(item.image) for item in items]
+        except Exception as e:
+            for item in items:
+                item.error = e
+            return
+
+        for item, prediction in zip(items, predictions):
+            item.prediction = prediction
+            if item.cache_key is not None:
+                self.inference_cache.put(item.cache_key, encode_classification(prediction))
+
+    def _load_model(self, model_path: str):
+        """Load model locally, or use the shared inference server when configured."""
+        if self.inference_client is not None:
+            return RemoteModel(self.inference_client, model_path)
+        return self.model_provider.load_model(model_path)
+
+    def _configure_cascade(self, model, config: dict[str, Any]) -> None:
+        """Apply the Stage-1 resolution cascade config to detectors that support it."""
+        if 'cascade' not in config:
+            return
+        cascade = CascadeConfig.from_dict(config['cascade'])
+        if not isinstance(getattr(model, 'cascade', None), CascadeConfig):
+            if cascade.enabled:
+                logger.warning(f"⚠️ Resolution cascade not applied: {type(model).__name__} does not support it "
+                               f"(only locally loaded Ultralytics .pt detectors do)")
+            return
+
+        model.cascade = cascade
+        model.cascade_stats.reset()
+
+    def _stage_report(self, stage: str, model_path: str, inputs: int, outputs: int,
+                      stage_start: float) -> dict[str, Any]:
+        """Build the run report for a stage."""
+        elapsed = time.perf_counter() - stage_start
+        report = {
+            'stage': stage,
+            'model': model_path,
+            'inputs': inputs,
+            'outputs': outputs,
+            'elapsed_seconds': elapsed,
+            'inputs_per_second': inputs / elapsed if elapsed > 0 else 0.0,
+        }
+        if self.inference_cache is not None:
+            report['inference_cache'] = self.inference_cache.stats()
+        if isinstance(self.storage, CachingStorageAdapter):
+            report['storage_cache'] = self.storage.stats()
+        return report
+
+    def _checkpoint(self, stage_prefix: str, config: dict[str, Any], **scope: Any) -> RunCheckpoint | None:
+        """Checkpoint for one stage run, or None when ``checkpoint_every`` is 0."""
+        every = int(config.get('checkpoint_every', self.CHECKPOINT_EVERY))
+        if every <= 0:
+            return None
+        return RunCheckpoint(self.storage, f"{stage_prefix}/checkpoint",
+                             self._get_config_hash({**config, **scope}), every=every)
+
+    @staticmethod
+    def _commit_shard(checkpoint: RunCheckpoint | None, shard: list[Any], inputs: list[str],
+                      entries: list[Any]) -> None:
+        """Move finished entries into the run's output, checkpointing them first when enabled."""
+        if checkpoint is not None and inputs:
+            checkpoint.write_shard([entry.to_dict() for entry in shard], inputs)
+        entries.extend(shard)
+        shard.clear()
+        inputs.clear()
+
+    @staticmethod
+    def _work_chunks(items: list[Any], checkpoint: RunCheckpoint | None,
+                     size_of: Callable[[Any], int] = lambda item: 1) -> Iterator[list[Any]]:
+        """Checkpoint-sized chunks of work, or all of it at once without checkpointing."""
+        if checkpoint is not None:
+            yield from checkpoint.chunks(items, size_of)
+        elif items:
+            yield items
+
+    def _save_run_report(self, report: dict[str, Any], report_path: str):
+        """Save run report to storage."""
+        print(f"Run report ({report['stage']}): {json.dumps(report)}")
+        report_location = StorageLocation.from_url(report_path)
+        self.storage.put(report_location, json.dumps(report, indent=2).encode('utf-8'))
+
+    def _cache_context(self, model_path: str, config: dict[str, Any],
+                       config_keys: tuple[str, ...]) -> dict[str, Any] | None:
+        """Model hash and config subset that key cached results for a stage."""
+        if self.inference_cache is None:
+            return None
+
+        model_hash = self.model_provider.get_model_hash(model_path)
+        if model_hash == "unknown":
+            # Without a content hash a retrained model at the same path would get stale results
+            logger.warning(f"⚠️ Inference cache disabled for {model_path}: the model file could not be hashed")
+            return None
+
+        return {
+            'model_hash': model_hash,
+            'config': {'model': model_path, **{k: config[k] for k in config_keys if k in config}},
+        }
 
-            except Exception as e:
-                print(f"Error processing {manifest_entry.crop_path}: {e}")
-                continue
+    def _resolve_model_path(self, config: dict[str, Any], stage: str, default: str) -> str:
+        """Resolve model path, preferring the fastest registered variant above the accuracy floor."""
+        model_path = config.get(f'{stage}_model', default)
 
-        # Save predictions
-        self._save_predictions(stage2_entries, f"{output_prefix}/stage2/predictions.jsonl")
+        registry_path = config.get('variant_registry')
+        if not registry_path:
+            return model_path
 
-        return stage2_entries
+        registry = ModelVariantRegistry(registry_path)
+        variant = registry.select(stage, config.get('accuracy_floor'),
+                                  base_model=config.get('variant_base_model'))
+        if variant is None:
+            print(f"No {stage} variant in {registry_path} meets the accuracy floor, using {model_path}")
+            return model_path
+
+        print(f"Using {stage} variant {variant.name} ({variant.precision}, "
+              f"{variant.latency_ms:.1f}ms, accuracy={variant.accuracy})")
+        return variant.path
 
     def _image_to_bytes(self, image: Image.Image, format: str = "JPEG") -> bytes:
         """Convert PIL Image to bytes."""
@@ -139,11 +953,18 @@ class LocalRunner(Runner):
         path_parts = Path(path).parts
         return path_parts[0] if path_parts else "unknown"
 
-    def _extract_timestamp(self, path: str) -> str:
-        """Extract timestamp from path or use current time."""
-        # This would extract from EXIF or filename
-        from datetime import datetime
-        return datetime.now().isoformat()
+    def _extract_timestamp(self, image_file: StorageLocation, content: bytes | memoryview | None = None) -> str:
+        """EXIF capture time of an image, or the current time when it has none.
+
+        Uses ``content`` when the image is already loaded, otherwise a ranged
+        read of just the header.
+        """
+        try:
+            header = content if content is not None else self.storage.get_range(image_file, 0, HEADER_BYTES)
+            timestamp = get_timestamp_from_exif(exif_from_bytes(header))
+        except Exception:
+            timestamp = None
+        return (timestamp or datetime.now()).isoformat()
 
     def _get_config_hash(self, config: dict[str, Any]) -> str:
         """Get hash of configuration."""
@@ -152,16 +973,14 @@ class LocalRunner(Runner):
         return hashlib.sha256(config_str.encode()).hexdigest()[:16]
 
     def _save_manifest(self, entries: list[ManifestEntry], manifest_path: str):
-        """Save manifest to storage."""
-        manifest_location = StorageLocation.from_url(manifest_path)
-        manifest_content = "\n".join(json.dumps(entry.to_dict()) for entry in entries)
-        self.storage.put(manifest_location, manifest_content.encode('utf-8'))
+        """Save manifest to storage as ``<manifest_path>.<format>`` for each configured format."""
+        for fmt in self.manifest_formats:
+            write_entries(self.storage, f"{manifest_path}.{fmt}", entries, ManifestEntry)
 
     def _save_predictions(self, entries: list[Stage2Entry], predictions_path: str):
-        """Save predictions to storage."""
-        predictions_location = StorageLocation.from_url(predictions_path)
-        predictions_content = "\n".join(json.dumps(entry.to_dict()) for entry in entries)
-        self.storage.put(predictions_location, predictions_content.encode('utf-8'))
+        """Save predictions to storage as ``<predictions_path>.<format>`` for each configured format."""
+        for fmt in self.manifest_formats:
+            write_entries(self.storage, f"{predictions_path}.{fmt}", entries, Stage2Entry)
 
 
 class CloudBatchRunner(Runner):
@@ -192,14 +1011,9 @@ class CloudBatchRunner(Runner):
         self._wait_for_job_completion(job_id)
 
         # Load results
-        manifest_location = StorageLocation.from_url(f"{output_prefix}/stage1/manifest.jsonl")
-        if self.storage.exists(manifest_location):
-            manifest_content = self.storage.get(manifest_location)
-            entries = []
-            for line in manifest_content.decode('utf-8').strip().split('\n'):
-                if line:
-                    entries.append(ManifestEntry.from_dict(json.loads(line)))
-            return entries
+        manifest_path = find_entries_file(self.storage, f"{output_prefix}/stage1/manifest")
+        if manifest_path is not None:
+            return read_entries(self.storage, manifest_path, ManifestEntry)
 
         return []
 
@@ -218,14 +1032,9 @@ class CloudBatchRunner(Runner):
         self._wait_for_job_completion(job_id)
 
         # Load results
-        predictions_location = StorageLocation.from_url(f"{output_prefix}/stage2/predictions.jsonl")
-        if self.storage.exists(predictions_location):
-            predictions_content = self.storage.get(predictions_location)
-            entries = []
-            for line in predictions_content.decode('utf-8').strip().split('\n'):
-                if line:
-                    entries.append(Stage2Entry.from_dict(json.loads(line)))
-            return entries
+        predictions_path = find_entries_file(self.storage, f"{output_prefix}/stage2/predictions")
+        if predictions_path is not None:
+            return read_entries(self.storage, predictions_path, Stage2Entry)
 
         return []
 
@@ -233,9 +1042,12 @@ class CloudBatchRunner(Runner):
         """Submit batch job to cloud provider with GPU optimization."""
         print(f"Submitting {stage} batch job with GPU optimization...")
 
+        # Stable across submissions, so a resubmitted job is recognisably the same run
+        job_key = self._get_job_key(job_data)
+
         # Enhanced job configuration for image processing
         job_config = {
-            'jobName': f'wildlife-{stage}-{hash(str(job_data))}',
+            'jobName': f'wildlife-{stage}-{job_key}',
             'jobQueue': 'wildlife-detection-queue',
             'jobDefinition': self.job_definition,
             'parameters': {
@@ -258,7 +1070,9 @@ class CloudBatchRunner(Runner):
                     {'name': 'PYTORCH_CUDA_ALLOC_CONF', 'value': 'max_split_size_mb:512'},
                     {'name': 'OPENCV_GPU_ENABLED', 'value': '1'},
                     {'name': 'BATCH_SIZE', 'value': str(job_data.get('config', {}).get('batch_size', 16))},
-                    {'name': 'IMAGE_SIZE', 'value': str(job_data.get('config', {}).get('image_size', 640))}
+                    {'name': 'IMAGE_SIZE', 'value': str(job_data.get('config', {}).get('image_size', 640))},
+                    {'name': 'CHECKPOINT_EVERY', 'value': str(job_data.get('config', {}).get(
+                        'checkpoint_every', LocalRunner.CHECKPOINT_EVERY))}
                 ]
             },
             'retryStrategy': {
@@ -267,6 +1081,11 @@ class CloudBatchRunner(Runner):
                     {
                         'action': 'RETRY',
                         'onStatusReason': 'GPU_ERROR'
+                    },
+                    {
+                        # Spot reclaim: the retry resumes from the checkpoint shards under output_prefix
+                        'action': 'RETRY',
+                        'onStatusReason': 'Host EC2*'
                     }
                 ]
             },
@@ -276,7 +1095,13 @@ class CloudBatchRunner(Runner):
         }
 
         print(f"Job configuration: {json.dumps(job_config, indent=2)}")
-        return f"job_{stage}_{hash(str(job_data))}"
+        return f"job_{stage}_{job_key}"
+
+    def _get_job_key(self, job_data: dict[str, Any]) -> str:
+        """Deterministic key for a job's inputs (``hash()`` of a str changes between processes)."""
+        import hashlib
+        job_str = json.dumps(job_data, sort_keys=True, default=str)
+        return hashlib.sha256(job_str.encode()).hexdigest()[:16]
 
     def _wait_for_job_completion(self, job_id: str):
         """Wait for batch job completion."""
@@ -298,11 +1123,10 @@ class EventDrivenRunner(Runner):
         """Run Stage-1 in event-driven mode."""
         print(f"Starting event-driven Stage-1: {input_prefix} -> {output_prefix}")
 
-        # Process images and send to queue
+        # Send one message per image as the listing streams in
         input_location = StorageLocation.from_url(input_prefix)
-        image_files = self.storage.list(input_location, "*.jpg")
-
-        for image_file in image_files:
+        sent = 0
+        for image_file in self.storage.iter_list(input_location, IMAGE_SUFFIXES):
             message = {
                 'stage': 'stage1',
                 'input_path': image_file.url,
@@ -310,8 +1134,9 @@ class EventDrivenRunner(Runner):
                 'config': config
             }
             self.queue.send_message('stage1-queue', message)
+            sent += 1
 
-        print(f"Sent {len(image_files)} messages to stage1-queue")
+        print(f"Sent {sent} messages to stage1-queue")
         return []  # Results will be collected via queue
 
     def run_stage2(self, manifest_entries: list[ManifestEntry], output_prefix: str, config: dict[str, Any]) -> list[Stage2Entry]:
@@ -36,6 +36,7 @@ class CompressedObservation:
     detection_timeline: list[dict[str, Any]]
     source_video: str | None = None
     needs_review: bool = False
+    track_id: int | None = None
 
 
 class Stage3Reporter:
@@ -159,7 +160,8 @@ class Stage3Reporter:
                 'crop_path': stage2_entry.crop_path,
                 'source_path': manifest_entry.source_path,
                 'is_video': is_video,
-                'frame_number': self._extract_frame_number(stage2_entry.crop_path) if is_video else None
+                'frame_number': self._extract_frame_number(stage2_entry.crop_path) if is_video else None,
+                'track_id': getattr(manifest_entry, 'track_id', None)
             })
 
         return grouped
@@ -185,28 +187,38 @@ class Stage3Reporter:
         # Sort by timestamp
         observations.sort(key=lambda x: x['timestamp'])
 
+        # Tracked video detections: one observation per track, however long it lasts
+        tracks: dict[tuple[str, int], list[dict[str, Any]]] = {}
+        untracked = []
+        for obs in observations:
+            if obs.get('track_id') is not None:
+                tracks.setdefault((obs['source_path'], obs['track_id']), []).append(obs)
+            else:
+                untracked.append(obs)
+
         compressed = []
+        for (_source, track_id), track_observations in tracks.items():
+            current_observation = self._start_observation(track_observations[0])
+            current_observation['track_id'] = track_id
+            for obs in track_observations[1:]:
+                self._extend_observation(current_observation, obs)
+            compressed_obs = self._finalize_observation(camera_id, species, current_observation)
+            if compressed_obs:
+                compressed.append(compressed_obs)
+
         current_observation = None
 
-        for obs in observations:
+        for obs in untracked:
             if current_observation is None:
                 # Start new observation
-                current_observation = {
-                    'start_time': obs['timestamp'],
-                    'end_time': obs['timestamp'],
-                    'confidences': [obs['confidence']],
-                    'frames': [obs],
-                    'source_video': obs['source_path'] if obs['is_video'] else None
-                }
+                current_observation = self._start_observation(obs)
             else:
                 # Check if this observation is within the compression window
                 time_diff = obs['timestamp'] - current_observation['start_time']
 
                 if time_diff <= self.compression_window:
                     # Extend current observation
-                    current_observation['end_time'] = obs['timestamp']
-                    current_observation['confidences'].append(obs['confidence'])
-                    current_observation['frames'].append(obs)
+                    self._extend_observation(current_observation, obs)
                 else:
                     # Finalize current observation and start new one
                     compressed_obs = self._finalize_observation(
@@ -216,13 +228,7 @@ class Stage3Reporter:
                         compressed.append(compressed_obs)
 
                     # Start new observation
-                    current_observation = {
-                        'start_time': obs['timestamp'],
-                        'end_time': obs['timestamp'],
-                        'confidences': [obs['confidence']],
-                        'frames': [obs],
-                        'source_video': obs['source_path'] if obs['is_video'] else None
-                    }
+                    current_observation = self._start_observation(obs)
 
         # Finalize last observation
         if current_observation:
@@ -234,6 +240,24 @@ class Stage3Reporter:
 
         return compressed
 
+    @staticmethod
+    def _start_observation(obs: dict[str, Any]) -> dict[str, Any]:
+        """Open a new observation from its first frame."""
+        return {
+            'start_time': obs['timestamp'],
+            'end_time': obs['timestamp'],
+            'confidences': [obs['confidence']],
+            'frames': [obs],
+            'source_video': obs['source_path'] if obs['is_video'] else None
+        }
+
+    @staticmethod
+    def _extend_observation(observation: dict[str, Any], obs: dict[str, Any]) -> None:
+        """Add a later frame to an open observation."""
+        observation['end_time'] = obs['timestamp']
+        observation['confidences'].append(obs['confidence'])
+        observation['frames'].append(obs)
+
     def _finalize_observation(self, camera_id: str, species: str,
                             observation_data: dict[str, Any]) -> CompressedObservation | None:
         """Finalize an observation and create CompressedObservation."""
@@ -253,7 +277,8 @@ class Stage3Reporter:
                 'timestamp': frame['timestamp'].isoformat(),
                 'confidence': frame['confidence'],
                 'frame_number': frame.get('frame_number'),
-                'crop_path': frame['crop_path']
+                'crop_path': frame['crop_path'],
+                'track_id': frame.get('track_id')
             })
 
         return CompressedObservation(
@@ -267,7 +292,8 @@ class Stage3Reporter:
             frame_count=len(observation_data['frames']),
             detection_timeline=timeline,
             source_video=observation_data['source_video'],
-            needs_review=max_confidence < 0.8  # Flag for review if confidence is low
+            needs_review=max_confidence < 0.8,  # Flag for review if confidence is low
+            track_id=observation_data.get('track_id')
         )
 
     def generate_report(self, compressed_observations: list[CompressedObservation]) -> dict[str, Any]:
@@ -381,7 +407,8 @@ class Stage3Reporter:
                 'frame_count': obs.frame_count,
                 'detection_timeline': obs.detection_timeline,
                 'source_video': obs.source_video,
-                'needs_review': obs.needs_review
+                'needs_review': obs.needs_review,
+                'track_id': obs.track_id
             })
 
         # Use storage adapter for file operations
@@ -5,16 +5,28 @@ Storage adapters for local and cloud storage.
 from __future__ import annotations
 
 import contextlib
+import os
+import random
+import tempfile
+import threading
+import time
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 import fsspec
-import smart_open
 
-from .interfaces import StorageAdapter, StorageLocation
+from ...common.utils.file_utils import map_file
+from .interfaces import (
+    ObjectInfo,
+    StorageAdapter,
+    StorageLocation,
+    UploadStream,
+    has_suffix,
+)
 
 if TYPE_CHECKING:
     import builtins
+    from collections.abc import Callable, Iterable, Iterator
 
 
 class LocalFSAdapter(StorageAdapter):
@@ -29,12 +41,33 @@ class LocalFSAdapter(StorageAdapter):
         full_path = self.base_path / location.path
         return full_path.read_bytes()
 
+    def get_view(self, location: StorageLocation) -> memoryview:
+        """Memory-map a local file instead of reading it into memory."""
+        return map_file(self.base_path / location.path)
+
+    def stat(self, location: StorageLocation) -> ObjectInfo:
+        """Size and modification time of a local file."""
+        st = (self.base_path / location.path).stat()
+        return ObjectInfo(size=st.st_size, etag=f"{st.st_mtime_ns:x}-{st.st_size:x}")
+
+    def get_range(self, location: StorageLocation, start: int, length: int) -> bytes:
+        """Read part of a local file."""
+        if length <= 0:
+            return b""
+        with open(self.base_path / location.path, 'rb') as f:
+            f.seek(start)
+            return f.read(length)
+
     def put(self, location: StorageLocation, content: bytes) -> None:
         """Put file content to local filesystem."""
         full_path = self.base_path / location.path
         full_path.parent.mkdir(parents=True, exist_ok=True)
         full_path.write_bytes(content)
 
+    def open_write(self, location: StorageLocation) -> UploadStream:
+        """Stream to a temporary file next to the destination, renamed into place on close."""
+        return _LocalFileUpload(self.base_path / location.path)
+
     def list(self, location: StorageLocation, pattern: str = "*") -> builtins.list[StorageLocation]:
         """List files in local directory."""
         full_path = self.base_path / location.path
@@ -52,6 +85,27 @@ class LocalFSAdapter(StorageAdapter):
                 ))
         return files
 
+    def iter_list(self, location: StorageLocation, suffixes: Iterable[str] | None = None,
+                  recursive: bool = True) -> Iterator[StorageLocation]:
+        """Walk a local directory lazily, in path order."""
+        yield from self._walk(self.base_path / location.path, suffixes, recursive)
+
+    def _walk(self, directory: Path, suffixes: Iterable[str] | None, recursive: bool) -> Iterator[StorageLocation]:
+        try:
+            with os.scandir(directory) as scan:
+                # "name/" sorts like the paths below it, so output is in full-path order
+                entries = sorted(scan, key=lambda entry: entry.name + ("/" if entry.is_dir() else ""))
+        except (FileNotFoundError, NotADirectoryError):
+            return
+
+        for entry in entries:
+            if entry.is_dir():
+                if recursive:
+                    yield from self._walk(Path(entry.path), suffixes, recursive)
+            elif entry.is_file() and has_suffix(entry.name, suffixes):
+                rel_path = Path(entry.path).relative_to(self.base_path)
+                yield StorageLocation(url=f"file://{rel_path}", protocol="file", path=str(rel_path))
+
     def exists(self, location: StorageLocation) -> bool:
         """Check if file exists in local filesystem."""
         full_path = self.base_path / location.path
@@ -67,20 +121,67 @@ class LocalFSAdapter(StorageAdapter):
 class S3Adapter(StorageAdapter):
     """S3 storage adapter using boto3."""
 
-    def __init__(self, base_path: str = "s3://wildlife-detection-bucket", region: str = "eu-north-1"):
+    # Keys per ListObjectsV2 request
+    list_page_size = 1000
+
+    # Bytes per part in open_write uploads (S3 requires at least 5 MiB for all but the last)
+    multipart_part_size = 8 * 1024 * 1024
+
+    def __init__(self, base_path: str = "s3://wildlife-detection-bucket", region: str = "eu-north-1",
+                 max_concurrency: int = 16, retry_attempts: int = 3, retry_backoff: float = 0.2):
         self.base_path = base_path
         self.region = region
+        self.max_concurrency = max_concurrency
+        self.retry_attempts = retry_attempts
+        self.retry_backoff = retry_backoff
         self._fs = fsspec.filesystem('s3', region=region)
+        self._client: Any = None
+        self._client_lock = threading.Lock()
+
+    @property
+    def client(self) -> Any:
+        """boto3 S3 client shared by all threads, with a connection pool per concurrent request."""
+        with self._client_lock:  # boto3 client creation is not thread-safe
+            if self._client is None:
+                import boto3
+                from botocore.config import Config
+
+                self._client = boto3.client('s3', region_name=self.region, config=Config(
+                    max_pool_connections=self.max_concurrency,
+                    retries={'mode': 'standard', 'max_attempts': 1},  # retried in _retry instead
+                ))
+        return self._client
 
     def get(self, location: StorageLocation) -> bytes:
         """Get file content from S3."""
-        with smart_open.open(location.url, 'rb', transport_params={'region_name': self.region}) as f:
-            return f.read()
+        bucket, key = location.path.split('/', 1)
+        return self._retry(lambda: self.client.get_object(Bucket=bucket, Key=key)['Body'].read())
+
+    def stat(self, location: StorageLocation) -> ObjectInfo:
+        """Size and ETag of an S3 object from a HEAD request."""
+        bucket, key = location.path.split('/', 1)
+        head = self._retry(lambda: self.client.head_object(Bucket=bucket, Key=key))
+        return ObjectInfo(size=head['ContentLength'], etag=head.get('ETag'))
+
+    def get_range(self, location: StorageLocation, start: int, length: int) -> bytes:
+        """Get part of an S3 object with a ranged GET."""
+        if length <= 0:
+            return b""
+        bucket, key = location.path.split('/', 1)
+        byte_range = f"bytes={start}-{start + length - 1}"
+        return self._retry(lambda: self.client.get_object(Bucket=bucket, Key=key, Range=byte_range)['Body'].read())
 
     def put(self, location: StorageLocation, content: bytes) -> None:
         """Put file content to S3."""
-        with smart_open.open(location.url, 'wb', transport_params={'region_name': self.region}) as f:
-            f.write(content)
+        bucket, key = location.path.split('/', 1)
+        self._retry(lambda: self.client.put_object(Bucket=bucket, Key=key, Body=content))
+
+    def open_write(self, location: StorageLocation) -> UploadStream:
+        """Stream to S3 with a multipart upload, one part per ``multipart_part_size`` bytes."""
+        return _S3MultipartUpload(self, location)
+
+    def _retry(self, request: Callable[[], Any]) -> Any:
+        return _with_retries(request, self.retry_attempts, self.retry_backoff, _is_retryable_s3_error)
 
     def list(self, location: StorageLocation, pattern: str = "*") -> builtins.list[StorageLocation]:
         """List files in S3 bucket/prefix."""
@@ -93,6 +194,24 @@ class S3Adapter(StorageAdapter):
         except Exception:
             return []
 
+    def iter_list(self, location: StorageLocation, suffixes: Iterable[str] | None = None,
+                  recursive: bool = True) -> Iterator[StorageLocation]:
+        """Page through ListObjectsV2, yielding keys as each page arrives."""
+        bucket, prefix = _split_bucket_path(location.path)
+        params: dict[str, Any] = {
+            'Bucket': bucket,
+            'Prefix': prefix,
+            'PaginationConfig': {'PageSize': self.list_page_size},
+        }
+        if not recursive:
+            params['Delimiter'] = '/'
+
+        for page in self.client.get_paginator('list_objects_v2').paginate(**params):
+            for obj in page.get('Contents', []):
+                key = obj['Key']
+                if not key.endswith('/') and has_suffix(key, suffixes):
+                    yield StorageLocation(url=f"s3://{bucket}/{key}", protocol="s3", path=f"{bucket}/{key}")
+
     def exists(self, location: StorageLocation) -> bool:
         """Check if file exists in S3."""
         try:
@@ -109,19 +228,67 @@ class S3Adapter(StorageAdapter):
 class GCSAdapter(StorageAdapter):
     """Google Cloud Storage adapter."""
 
-    def __init__(self, base_path: str = "gs://wildlife-detection-bucket"):
+    # Objects per list request
+    list_page_size = 1000
+
+    def __init__(self, base_path: str = "gs://wildlife-detection-bucket", project_id: str | None = None,
+                 max_concurrency: int = 16, retry_attempts: int = 3, retry_backoff: float = 0.2):
         self.base_path = base_path
+        self.project_id = project_id
+        self.max_concurrency = max_concurrency
+        self.retry_attempts = retry_attempts
+        self.retry_backoff = retry_backoff
         self._fs = fsspec.filesystem('gcs')
+        self._client: Any = None
+        self._client_lock = threading.Lock()
+
+    @property
+    def client(self) -> Any:
+        """google-cloud-storage client shared by all threads, with a connection pool per concurrent request."""
+        with self._client_lock:
+            if self._client is None:
+                import requests
+                from google.cloud import storage
+
+                self._client = storage.Client(project=self.project_id)
+                adapter = requests.adapters.HTTPAdapter(pool_connections=self.max_concurrency,
+                                                        pool_maxsize=self.max_concurrency)
+                self._client._http.mount("https://", adapter)
+        return self._client
 
     def get(self, location: StorageLocation) -> bytes:
         """Get file content from GCS."""
-        with smart_open.open(location.url, 'rb') as f:
-            return f.read()
+        bucket, name = location.path.split('/', 1)
+        return self._retry(lambda: self.client.bucket(bucket).blob(name).download_as_bytes())
+
+    def stat(self, location: StorageLocation) -> ObjectInfo:
+        """Size and ETag of a GCS object from its metadata."""
+        bucket, name = location.path.split('/', 1)
+        blob = self._retry(lambda: self.client.bucket(bucket).get_blob(name))
+        if blob is None:
+            raise FileNotFoundError(location.url)
+        return ObjectInfo(size=blob.size, etag=blob.etag)
+
+    def get_range(self, location: StorageLocation, start: int, length: int) -> bytes:
+        """Get part of a GCS object with a ranged download."""
+        if length <= 0:
+            return b""
+        bucket, name = location.path.split('/', 1)
+        return self._retry(lambda: self.client.bucket(bucket).blob(name).download_as_bytes(
+            start=start, end=start + length - 1))
 
     def put(self, location: StorageLocation, content: bytes) -> None:
         """Put file content to GCS."""
-        with smart_open.open(location.url, 'wb') as f:
-            f.write(content)
+        bucket, name = location.path.split('/', 1)
+        self._retry(lambda: self.client.bucket(bucket).blob(name).upload_from_string(content))
+
+    def open_write(self, location: StorageLocation) -> UploadStream:
+        """Stream to GCS with a resumable upload."""
+        bucket, name = location.path.split('/', 1)
+        return _GCSUpload(self.client.bucket(bucket).blob(name))
+
+    def _retry(self, request: Callable[[], Any]) -> Any:
+        return _with_retries(request, self.retry_attempts, self.retry_backoff, _is_retryable_gcs_error)
 
     def list(self, location: StorageLocation, pattern: str = "*") -> builtins.list[StorageLocation]:
         """List files in GCS bucket/prefix."""
@@ -134,6 +301,17 @@ class GCSAdapter(StorageAdapter):
         except Exception:
             return []
 
+    def iter_list(self, location: StorageLocation, suffixes: Iterable[str] | None = None,
+                  recursive: bool = True) -> Iterator[StorageLocation]:
+        """Page through the bucket listing, yielding objects as each page arrives."""
+        bucket, prefix = _split_bucket_path(location.path)
+        blobs = self.client.list_blobs(bucket, prefix=prefix, delimiter=None if recursive else '/',
+                                       page_size=self.list_page_size)
+        for page in blobs.pages:
+            for blob in page:
+                if not blob.name.endswith('/') and has_suffix(blob.name, suffixes):
+                    yield StorageLocation(url=f"gs://{bucket}/{blob.name}", protocol="gs", path=f"{bucket}/{blob.name}")
+
     def exists(self, location: StorageLocation) -> bool:
         """Check if file exists in GCS."""
         try:
@@ -147,6 +325,164 @@ class GCSAdapter(StorageAdapter):
             self._fs.rm(location.path)
 
 
+class _LocalFileUpload(UploadStream):
+    """Write to a temporary file in the destination directory, renamed over the destination on close."""
+
+    def __init__(self, path: Path):
+        super().__init__()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        self._file = os.fdopen(fd, 'wb')
+        self._tmp_path = tmp_path
+        self._path = path
+
+    def _write(self, data: bytes) -> None:
+        self._file.write(data)
+
+    def _commit(self) -> None:
+        try:
+            self._file.close()
+            os.replace(self._tmp_path, self._path)
+        except BaseException:
+            self._discard()
+            raise
+
+    def _discard(self) -> None:
+        self._file.close()
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self._tmp_path)
+
+
+class _S3MultipartUpload(UploadStream):
+    """
+    Buffer up to one part and upload each full part as it fills. Objects
+    smaller than a part are stored with a single PUT on close.
+    """
+
+    def __init__(self, adapter: S3Adapter, location: StorageLocation):
+        super().__init__()
+        self._adapter = adapter
+        self._location = location
+        self._bucket, self._key = location.path.split('/', 1)
+        self._part_size = adapter.multipart_part_size
+        self._buffer = bytearray()
+        self._upload_id: str | None = None
+        self._parts: list[dict[str, Any]] = []
+
+    def _write(self, data: bytes) -> None:
+        self._buffer += data
+        while len(self._buffer) >= self._part_size:
+            self._upload_part(bytes(self._buffer[:self._part_size]))
+            del self._buffer[:self._part_size]
+
+    def _upload_part(self, body: bytes) -> None:
+        client = self._adapter.client
+        if self._upload_id is None:
+            self._upload_id = self._adapter._retry(lambda: client.create_multipart_upload(
+                Bucket=self._bucket, Key=self._key)['UploadId'])
+        number = len(self._parts) + 1
+        response = self._adapter._retry(lambda: client.upload_part(
+            Bucket=self._bucket, Key=self._key, UploadId=self._upload_id, PartNumber=number, Body=body))
+        self._parts.append({'ETag': response['ETag'], 'PartNumber': number})
+
+    def _commit(self) -> None:
+        if self._upload_id is None:
+            self._adapter.put(self._location, bytes(self._buffer))
+            return
+        try:
+            if self._buffer:
+                self._upload_part(bytes(self._buffer))
+            self._adapter._retry(lambda: self._adapter.client.complete_multipart_upload(
+                Bucket=self._bucket, Key=self._key, UploadId=self._upload_id,
+                MultipartUpload={'Parts': self._parts}))
+        except BaseException:
+            self._discard()
+            raise
+        finally:
+            self._buffer = bytearray()
+
+    def _discard(self) -> None:
+        self._buffer = bytearray()
+        if self._upload_id is not None:
+            # Uploaded parts are billed until the upload is aborted
+            with contextlib.suppress(Exception):
+                self._adapter.client.abort_multipart_upload(
+                    Bucket=self._bucket, Key=self._key, UploadId=self._upload_id)
+
+
+class _GCSUpload(UploadStream):
+    """Resumable upload through the blob's writer, which sends a chunk whenever one fills."""
+
+    def __init__(self, blob: Any):
+        super().__init__()
+        self._writer = blob.open('wb')
+
+    def _write(self, data: bytes) -> None:
+        self._writer.write(data)
+
+    def _commit(self) -> None:
+        self._writer.close()
+
+    def _discard(self) -> None:
+        # An unfinished resumable upload never creates the object and expires on its own
+        pass
+
+
+def _with_retries(request: Callable[[], Any], attempts: int, backoff: float,
+                  retryable: Callable[[Exception], bool]) -> Any:
+    """Call ``request``, retrying retryable errors with jittered exponential backoff."""
+    for attempt in range(max(1, attempts)):
+        try:
+            return request()
+        except Exception as e:
+            if attempt + 1 >= attempts or not retryable(e):
+                raise
+            time.sleep(backoff * (2 ** attempt) * random.uniform(0.5, 1.5))
+
+
+def _is_retryable_s3_error(error: Exception) -> bool:
+    """
+    Throttling, 5xx and connection errors are retried; other client errors
+    (404, 403, ...) and anything that is not a botocore or network error are not.
+    """
+    from botocore.exceptions import ClientError, HTTPClientError
+    from botocore.exceptions import ConnectionError as BotoConnectionError
+
+    # Endpoint, connect/read timeout and closed-connection errors
+    if isinstance(error, (BotoConnectionError, HTTPClientError, ConnectionError, TimeoutError)):
+        return True
+    if not isinstance(error, ClientError):
+        return False
+    status = error.response.get('ResponseMetadata', {}).get('HTTPStatusCode') or 0
+    code = error.response.get('Error', {}).get('Code', '')
+    return status >= 500 or status == 429 or code in ('SlowDown', 'Throttling', 'RequestTimeout')
+
+
+def _is_retryable_gcs_error(error: Exception) -> bool:
+    """Like _is_retryable_s3_error, for google-api-core and transport exceptions."""
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    try:
+        from google.api_core.exceptions import GoogleAPICallError
+        from google.auth.exceptions import TransportError
+        from requests.exceptions import ConnectionError as RequestsConnectionError
+        from requests.exceptions import Timeout
+    except ImportError:
+        return False
+
+    if isinstance(error, (TransportError, RequestsConnectionError, Timeout)):
+        return True
+    status = getattr(error, 'code', None) if isinstance(error, GoogleAPICallError) else None
+    return isinstance(status, int) and (status >= 500 or status in (408, 429))
+
+
+def _split_bucket_path(path: str) -> tuple[str, str]:
+    """Split ``bucket/some/prefix`` into the bucket and a key prefix ending in "/" (empty for the bucket root)."""
+    bucket, _, prefix = path.partition('/')
+    prefix = prefix.strip('/')
+    return bucket, f"{prefix}/" if prefix else ""
+
+
 def create_storage_adapter(adapter_type: str, **kwargs) -> StorageAdapter:
     """Factory function to create storage adapters."""
     if adapter_type == "local":
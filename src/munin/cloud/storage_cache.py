@@ -0,0 +1,283 @@
+"""
+Size-bounded local read-through cache in front of a storage adapter.
+
+Object content is stored once per SHA-256 under ``<cache>/blobs/``, and a
+SQLite index maps each remote URL to its blob together with the ETag and size
+it had when it was fetched. Reads are validated against the remote ETag/size
+(one metadata request instead of a download), least recently used blobs are
+evicted once the cache exceeds its size cap, and several worker processes can
+share one cache directory: the index runs in WAL mode and blobs are written to
+a temporary file and renamed into place.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from ...common.utils.logging_utils import get_logger
+from .interfaces import ObjectInfo, StorageAdapter, StorageLocation, UploadStream
+
+if TYPE_CHECKING:
+    import builtins
+    from collections.abc import Callable, Iterable, Iterator
+
+logger = get_logger("wildlife_pipeline.cloud.storage_cache")
+
+
+class CachingStorageAdapter(StorageAdapter):
+    """Storage adapter that serves repeated reads of remote objects from local disk."""
+
+    # How many stores between size checks against the cap
+    SIZE_CHECK_INTERVAL = 16
+
+    def __init__(self, storage: StorageAdapter, path: str = "file://./cache/storage",
+                 max_size_mb: float = 2048, validate: bool = True):
+        """
+        Args:
+            storage: Adapter the objects are read from and written to
+            path: Cache directory, shared by all processes using the same cache
+            max_size_mb: Size cap for cached content
+            validate: Check each hit against the remote ETag/size; turn off for
+                objects that are never overwritten to save the metadata request
+        """
+        self.storage = storage
+        self.max_concurrency = storage.max_concurrency
+        self.path = Path(path.replace("file://", ""))
+        self.blob_dir = self.path / "blobs"
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.validate = validate
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path / "index.sqlite"), timeout=30.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS objects (
+                url TEXT PRIMARY KEY,
+                digest TEXT NOT NULL,
+                etag TEXT,
+                size INTEGER NOT NULL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS blobs (
+                digest TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_blobs_last_access ON blobs(last_access)")
+        self._conn.commit()
+
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.evictions = 0
+        self.bytes_from_cache = 0
+        self.bytes_fetched = 0
+        self._stores_since_check = 0
+
+    def get(self, location: StorageLocation) -> bytes:
+        """Get an object from the cache if it is current, else from storage."""
+        content = self._cached(location)
+        if content is not None:
+            return content
+
+        # Stat before reading: if the object changes in between, the recorded
+        # ETag is the older one and the next validation refetches it
+        info = self.storage.stat(location) if self.validate else None
+        content = self.storage.get(location)
+        with self._lock:
+            self.misses += 1
+            self.bytes_fetched += len(content)
+        if info is None or info.size == len(content):
+            self._store(location, content, info)
+        return content
+
+    def get_range(self, location: StorageLocation, start: int, length: int) -> bytes:
+        """Slice a cached object, or fetch just the range without caching it."""
+        content = self._cached(location)
+        if content is not None:
+            return content[start:start + length]
+        return self.storage.get_range(location, start, length)
+
+    def put(self, location: StorageLocation, content: bytes) -> None:
+        """Write through to storage; the next read fetches and caches the new version."""
+        self.storage.put(location, content)
+        self._forget(location)
+
+    def open_write(self, location: StorageLocation) -> UploadStream:
+        """Stream through to storage; the cached copy is dropped once the new version is stored."""
+        return _ForgetOnCommit(self.storage.open_write(location), lambda: self._forget(location))
+
+    def delete(self, location: StorageLocation) -> None:
+        """Delete from storage and from the cache."""
+        self.storage.delete(location)
+        self._forget(location)
+
+    def stat(self, location: StorageLocation) -> ObjectInfo | None:
+        """Size and ETag from storage."""
+        return self.storage.stat(location)
+
+    def list(self, location: StorageLocation, pattern: str = "*") -> builtins.list[StorageLocation]:
+        """List files in storage; listings are not cached."""
+        return self.storage.list(location, pattern)
+
+    def iter_list(self, location: StorageLocation, suffixes: Iterable[str] | None = None,
+                  recursive: bool = True) -> Iterator[StorageLocation]:
+        """Stream a listing from storage."""
+        return self.storage.iter_list(location, suffixes, recursive)
+
+    def exists(self, location: StorageLocation) -> bool:
+        """Check storage, which may have changed since an object was cached."""
+        return self.storage.exists(location)
+
+    def _cached(self, location: StorageLocation) -> bytes | None:
+        """Current cached content of an object, or None."""
+        with self._lock:
+            row = self._conn.execute("SELECT digest, etag, size FROM objects WHERE url = ?",
+                                     (location.url,)).fetchone()
+        if row is None:
+            return None
+
+        digest, etag, size = row
+        if self.validate:
+            try:
+                info = self.storage.stat(location)
+            except Exception:
+                info = None  # deleted or unreachable: let the caller's read decide
+            if info is None or info.size != size or (info.etag and info.etag != etag):
+                with self._lock:
+                    self.stale += 1
+                self._forget(location)
+                return None
+
+        try:
+            content = self._blob_path(digest).read_bytes()
+        except FileNotFoundError:  # evicted by another process
+            self._forget(location)
+            return None
+
+        with self._lock:
+            self._conn.execute("UPDATE blobs SET last_access = ? WHERE digest = ?", (time.time(), digest))
+            self._conn.commit()
+            self.hits += 1
+            self.bytes_from_cache += size
+        return content
+
+    def _store(self, location: StorageLocation, content: bytes, info: ObjectInfo | None) -> None:
+        digest = hashlib.sha256(content).hexdigest()
+        blob_path = self._blob_path(digest)
+        if not blob_path.exists():
+            blob_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=blob_path.parent, prefix=".tmp-")
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(content)
+                os.replace(tmp_path, blob_path)  # atomic: readers never see a partial blob
+            except BaseException:
+                Path(tmp_path).unlink(missing_ok=True)
+                raise
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO blobs (digest, size, last_access) VALUES (?, ?, ?)",
+                (digest, len(content), time.time())
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO objects (url, digest, etag, size) VALUES (?, ?, ?, ?)",
+                (location.url, digest, info.etag if info else None, len(content))
+            )
+            self._conn.commit()
+
+            self._stores_since_check += 1
+            if self._stores_since_check >= self.SIZE_CHECK_INTERVAL or len(content) > self.max_size_bytes // 16:
+                self._stores_since_check = 0
+                self._evict_if_needed()
+
+    def _forget(self, location: StorageLocation) -> None:
+        """Drop an object from the index; its blob stays while other URLs share it."""
+        with self._lock:
+            self._conn.execute("DELETE FROM objects WHERE url = ?", (location.url,))
+            self._conn.commit()
+
+    def _size_bytes(self) -> int:
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+
+    def _evict_if_needed(self) -> None:
+        """Evict least recently used blobs down to 90% of the size cap."""
+        size = self._size_bytes()
+        if size <= self.max_size_bytes:
+            return
+
+        target = int(self.max_size_bytes * 0.9)
+        evicted = 0
+        for digest, blob_size in self._conn.execute(
+            "SELECT digest, size FROM blobs ORDER BY last_access ASC"
+        ).fetchall():
+            if size <= target:
+                break
+            # Index rows go first, so no process finds an entry for a missing blob it trusts
+            self._conn.execute("DELETE FROM objects WHERE digest = ?", (digest,))
+            self._conn.execute("DELETE FROM blobs WHERE digest = ?", (digest,))
+            self._conn.commit()
+            self._blob_path(digest).unlink(missing_ok=True)
+            size -= blob_size
+            evicted += 1
+
+        self.evictions += evicted
+        logger.info(f"🧹 Storage cache evicted {evicted} objects ({size} bytes remain)")
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.blob_dir / digest[:2] / digest
+
+    def stats(self) -> dict[str, Any]:
+        """Hit/miss/eviction statistics."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM objects").fetchone()[0]
+            size = self._size_bytes()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'stale': self.stale,
+            'evictions': self.evictions,
+            'bytes_from_cache': self.bytes_from_cache,
+            'bytes_fetched': self.bytes_fetched,
+            'entries': entries,
+            'size_bytes': size,
+            'max_size_bytes': self.max_size_bytes,
+        }
+
+    def close(self) -> None:
+        """Close the cache index."""
+        with self._lock:
+            self._conn.close()
+
+
+class _ForgetOnCommit(UploadStream):
+    """Upload through another stream, then run ``forget`` once the object is stored."""
+
+    def __init__(self, stream: UploadStream, forget: Callable[[], None]):
+        super().__init__()
+        self._stream = stream
+        self._forget = forget
+
+    def _write(self, data: bytes) -> None:
+        self._stream.write(data)
+
+    def _commit(self) -> None:
+        self._stream.close()
+        self._forget()
+
+    def _discard(self) -> None:
+        self._stream.abort()
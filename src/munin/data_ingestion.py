@@ -30,6 +30,7 @@ except ImportError as e:
     sys.exit(1)
 
 from ..common.utils.logging_utils import get_logger
+from .cloud.interfaces import HEADER_BYTES
 
 logger = get_logger("wildlife_pipeline.io_optimized")
 
@@ -270,9 +271,13 @@ class OptimizedExifExtractor:
         exif_data = ExifData()
 
         try:
-            # Use piexif for EXIF extraction
+            # Use piexif for EXIF extraction; the header is enough unless its segments are unusually large
             with open(image_path, 'rb') as f:
-                exif_dict = piexif.load(f.read())
+                try:
+                    exif_dict = piexif.load(f.read(HEADER_BYTES))
+                except piexif.InvalidImageDataError:
+                    f.seek(0)
+                    exif_dict = piexif.load(f.read())
 
             # Extract datetime fields
             if '0th' in exif_dict and piexif.ExifIFD.DateTime in exif_dict['0th']:
@@ -7,6 +7,8 @@ from typing import TYPE_CHECKING, Any
 import exifread
 from PIL import ExifTags, Image
 
+from ..common.utils.file_utils import ViewReader
+
 if TYPE_CHECKING:
     from pathlib import Path
 
@@ -34,6 +36,33 @@ def _exif_from_exifread(path: Path) -> dict[str, Any]:
     except Exception:
         return {}
 
+# EXIF and GPS sub-IFD pointers in the main IFD
+_EXIF_IFD = 0x8769
+_GPS_IFD = 0x8825
+
+
+def exif_from_bytes(content: bytes | memoryview) -> dict[str, Any]:
+    """
+    EXIF tags from the start of an image file, e.g. a ranged read of its header.
+
+    Only the header is parsed, so ``content`` may be truncated after the
+    EXIF segment. Tags are keyed like ``_exif_from_pil``, with the Exif
+    sub-IFD merged in and ``GPSInfo`` as a dict, so the result works with
+    ``get_timestamp_from_exif`` and ``get_gps_from_exif``.
+    """
+    try:
+        with Image.open(ViewReader(content)) as img:
+            exif = img.getexif()
+            if not exif:
+                return {}
+            result = {ExifTags.TAGS.get(k, k): v for k, v in exif.items()}
+            result.update({ExifTags.TAGS.get(k, k): v for k, v in exif.get_ifd(_EXIF_IFD).items()})
+            gps = exif.get_ifd(_GPS_IFD)
+            result['GPSInfo'] = dict(gps) if gps else None
+            return result
+    except Exception:
+        return {}
+
 def get_timestamp_from_exif(exif: dict[str, Any]) -> datetime | None:
     if not exif:
         return None
@@ -0,0 +1,185 @@
+"""
+Lightweight box tracker for video frames.
+
+In tracker mode the detector runs on every Nth sampled frame. Between
+detections, boxes are carried forward with sparse Lucas-Kanade optical flow on
+downscaled grayscale frames, and detections are matched to existing tracks by
+IoU so each animal keeps a stable track id through the clip.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+import cv2
+import numpy as np
+
+from .wildlife_detector import Detection
+
+
+@dataclass
+class TrackerConfig:
+    """Configuration for tracker mode."""
+    detect_every: int = 5  # run the detector on every Nth sampled frame
+    iou_threshold: float = 0.3  # minimum IoU to match a detection to a track
+    flow_width: int = 320  # width of the grayscale frames used for optical flow
+    max_missed: int = 1  # detection rounds a track may go unmatched before it ends
+    max_points: int = 50  # flow points sampled per box
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> TrackerConfig:
+        """Create from stage configuration."""
+        return cls(**{k: v for k, v in data.items() if k in cls.__dataclass_fields__})
+
+
+@dataclass
+class Track:
+    """One tracked object."""
+    track_id: int
+    label: str
+    confidence: float
+    bbox: list[float]  # [x1, y1, x2, y2] in native pixels
+    missed: int = 0
+    detected_frames: int = 1
+    tracked_frames: int = 0
+
+    def to_detection(self) -> Detection:
+        """Current box as a tracked detection."""
+        return Detection(label=self.label, confidence=self.confidence, bbox=list(self.bbox),
+                         track_id=self.track_id)
+
+
+def iou(a: list[float], b: list[float]) -> float:
+    """Intersection over union of two [x1, y1, x2, y2] boxes."""
+    ix = max(0.0, min(a[2], b[2]) - max(a[0], b[0]))
+    iy = max(0.0, min(a[3], b[3]) - max(a[1], b[1]))
+    intersection = ix * iy
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - intersection
+    return intersection / union if union > 0 else 0.0
+
+
+class FrameTracker:
+    """IoU association plus optical-flow propagation for one video."""
+
+    def __init__(self, config: TrackerConfig | None = None):
+        self.config = config or TrackerConfig()
+        self.tracks: list[Track] = []
+        self.ended: list[Track] = []
+        self._next_id = 1
+        self._previous: np.ndarray | None = None
+        self._scale = 1.0
+
+    def update(self, image: np.ndarray, frame_size: tuple[int, int],
+               detections: list[Detection]) -> list[Detection]:
+        """
+        Match a detection frame's detections to tracks.
+
+        Tracks are first moved to this frame with optical flow, then greedily
+        matched by IoU. Unmatched detections start new tracks. Returns the
+        detections with ``track_id`` set.
+        """
+        gray = self._prepare(image, frame_size)
+        if self._previous is not None:
+            self._flow(gray, frame_size)
+        self._previous = gray
+
+        boxed = [d for d in detections if d.bbox]
+        pairs = sorted(
+            ((iou(track.bbox, d.bbox), t, j) for t, track in enumerate(self.tracks) for j, d in enumerate(boxed)),
+            reverse=True,
+        )
+        matched_tracks: set[int] = set()
+        assignment: dict[int, Track] = {}
+        for overlap, t, j in pairs:
+            if overlap < self.config.iou_threshold:
+                break
+            if t in matched_tracks or j in assignment:
+                continue
+            matched_tracks.add(t)
+            assignment[j] = self.tracks[t]
+
+        for t, track in enumerate(self.tracks):
+            if t not in matched_tracks:
+                track.missed += 1
+
+        output = []
+        for j, detection in enumerate(boxed):
+            track = assignment.get(j)
+            if track is None:
+                track = Track(self._next_id, detection.label, detection.confidence, list(detection.bbox))
+                self._next_id += 1
+                self.tracks.append(track)
+            else:
+                track.label, track.confidence, track.bbox = detection.label, detection.confidence, list(detection.bbox)
+                track.missed = 0
+                track.detected_frames += 1
+            output.append(Detection(label=detection.label, confidence=detection.confidence,
+                                    bbox=list(detection.bbox), track_id=track.track_id))
+
+        self.ended.extend(t for t in self.tracks if t.missed > self.config.max_missed)
+        self.tracks = [t for t in self.tracks if t.missed <= self.config.max_missed]
+        return output
+
+    def propagate(self, image: np.ndarray, frame_size: tuple[int, int]) -> list[Detection]:
+        """Move live tracks to a frame without running the detector."""
+        gray = self._prepare(image, frame_size)
+        if self._previous is not None:
+            self._flow(gray, frame_size)
+        self._previous = gray
+
+        live = [track for track in self.tracks if track.missed == 0]
+        for track in live:
+            track.tracked_frames += 1
+        return [track.to_detection() for track in live]
+
+    def stats(self) -> dict[str, Any]:
+        """Track counts for the run report."""
+        tracks = self.ended + self.tracks
+        return {
+            'tracks': len(tracks),
+            'detected_frames': sum(t.detected_frames for t in tracks),
+            'tracked_frames': sum(t.tracked_frames for t in tracks),
+        }
+
+    def _prepare(self, image: np.ndarray, frame_size: tuple[int, int]) -> np.ndarray:
+        """Downscale to ``flow_width`` grayscale; ``image`` may be any scaled copy of the frame."""
+        width, height = frame_size
+        self._scale = min(1.0, self.config.flow_width / max(1, width))
+        size = (max(1, round(width * self._scale)), max(1, round(height * self._scale)))
+        gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY) if image.ndim == 3 else image
+        return cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+
+    def _flow(self, gray: np.ndarray, frame_size: tuple[int, int]) -> None:
+        """Shift each track's box by the median flow of points inside it."""
+        width, height = frame_size
+        for track in self.tracks:
+            x1, y1, x2, y2 = (v * self._scale for v in track.bbox)
+            points = self._box_points(x1, y1, x2, y2)
+            if points is None:
+                continue
+            moved, status, _err = cv2.calcOpticalFlowPyrLK(self._previous, gray, points, None)
+            good = status.reshape(-1) == 1
+            if not good.any():
+                continue
+            dx, dy = np.median((moved - points).reshape(-1, 2)[good], axis=0) / self._scale
+            bw, bh = track.bbox[2] - track.bbox[0], track.bbox[3] - track.bbox[1]
+            nx1 = min(max(track.bbox[0] + dx, 0.0), width - bw)
+            ny1 = min(max(track.bbox[1] + dy, 0.0), height - bh)
+            track.bbox = [float(nx1), float(ny1), float(nx1 + bw), float(ny1 + bh)]
+
+    def _box_points(self, x1: float, y1: float, x2: float, y2: float) -> np.ndarray | None:
+        """Corner features inside a box on the previous frame, or a grid when it has none."""
+        h, w = self._previous.shape
+        ix1, iy1 = max(0, int(x1)), max(0, int(y1))
+        ix2, iy2 = min(w, int(np.ceil(x2))), min(h, int(np.ceil(y2)))
+        if ix2 - ix1 < 2 or iy2 - iy1 < 2:
+            return None
+
+        mask = np.zeros_like(self._previous)
+        mask[iy1:iy2, ix1:ix2] = 255
+        points = cv2.goodFeaturesToTrack(self._previous, self.config.max_points, 0.01, 3, mask=mask)
+        if points is None:
+            xs, ys = np.meshgrid(np.linspace(ix1, ix2 - 1, 5), np.linspace(iy1, iy2 - 1, 5))
+            points = np.stack([xs.ravel(), ys.ravel()], axis=1).reshape(-1, 1, 2)
+        return points.astype(np.float32)
@@ -7,12 +7,14 @@ This module provides:
 - Mixed precision inference
 - Batch processing optimization
 - Model quantization for edge deployment
+- INT8/FP16 CPU variants with accuracy-delta reporting and a variant registry
 """
 
+import hashlib
 import sys
 import time
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 try:
     import numpy as np
@@ -20,6 +22,14 @@ try:
     import onnxruntime as ort
     import torch
     import torch.onnx
+    from onnxruntime.quantization import (
+        CalibrationDataReader,
+        QuantFormat,
+        QuantType,
+        quantize_dynamic,
+        quantize_static,
+    )
+    from PIL import Image
     from ultralytics import YOLO
 except ImportError as e:
     print(f"Missing dependencies for model optimization: {e}")
@@ -34,6 +44,7 @@ except ImportError:
     print("⚠️  TensorRT not available. Install with: pip install tensorrt")
 
 from ..common.utils.logging_utils import get_logger
+from .cloud.models import ModelVariant, ModelVariantRegistry
 
 logger = get_logger("wildlife_pipeline.model_optimization")
 
@@ -260,6 +271,304 @@ class ModelOptimizer:
 
         return results
 
+    def quantize_to_int8(self, onnx_path: str, output_path: str,
+                         mode: str = "dynamic",
+                         calibration_dir: Optional[str] = None,
+                         max_calibration_images: int = 200,
+                         per_channel: bool = False) -> str:
+        """
+        Quantize an ONNX model to INT8 for CPU inference.
+
+        Args:
+            onnx_path: Path to FP32 ONNX model
+            output_path: Path to save quantized model
+            mode: "dynamic" (weights only) or "static" (weights and activations)
+            calibration_dir: Directory of our own crops used to calibrate static quantization
+            max_calibration_images: Maximum number of calibration images
+            per_channel: Quantize weights per output channel
+
+        Returns:
+            Path to quantized ONNX model
+        """
+        self.logger.info(f"🔢 Quantizing model to INT8 ({mode}): {output_path}")
+
+        try:
+            if mode == "dynamic":
+                quantize_dynamic(
+                    onnx_path,
+                    output_path,
+                    weight_type=QuantType.QInt8,
+                    per_channel=per_channel
+                )
+            elif mode == "static":
+                if not calibration_dir:
+                    raise ValueError("Static INT8 quantization requires calibration_dir")
+
+                reader = CropCalibrationDataReader(
+                    onnx_path, calibration_dir, max_images=max_calibration_images
+                )
+                quantize_static(
+                    onnx_path,
+                    output_path,
+                    reader,
+                    quant_format=QuantFormat.QDQ,
+                    activation_type=QuantType.QUInt8,
+                    weight_type=QuantType.QInt8,
+                    per_channel=per_channel
+                )
+            else:
+                raise ValueError(f"Unknown quantization mode: {mode}")
+
+            self._verify_onnx_model(output_path)
+
+            self.logger.info(f"✅ INT8 quantization completed: {output_path}")
+            return output_path
+
+        except Exception as e:
+            self.logger.error(f"❌ INT8 quantization failed: {e}")
+            raise
+
+    def convert_to_fp16(self, onnx_path: str, output_path: str) -> str:
+        """
+        Convert an ONNX model to FP16 weights, keeping FP32 inputs and outputs.
+
+        Args:
+            onnx_path: Path to FP32 ONNX model
+            output_path: Path to save FP16 model
+
+        Returns:
+            Path to FP16 ONNX model
+        """
+        from onnxruntime.transformers.float16 import convert_float_to_float16
+        from onnxruntime.transformers.onnx_model import OnnxModel
+
+        self.logger.info(f"🌓 Converting model to FP16: {output_path}")
+
+        try:
+            model = onnx.load(onnx_path)
+            model_fp16 = convert_float_to_float16(model, keep_io_types=True)
+
+            # The IO cast nodes are appended last; restore topological order
+            OnnxModel(model_fp16).topological_sort()
+            onnx.save(model_fp16, output_path)
+
+            self._verify_onnx_model(output_path)
+
+            self.logger.info(f"✅ FP16 conversion completed: {output_path}")
+            return output_path
+
+        except Exception as e:
+            self.logger.error(f"❌ FP16 conversion failed: {e}")
+            raise
+
+    def evaluate_accuracy(self, model_path: str,
+                          holdout: List[Tuple[np.ndarray, int]],
+                          batch_size: int = 1) -> float:
+        """
+        Evaluate top-1 accuracy of an ONNX model on a labelled holdout.
+
+        Args:
+            model_path: Path to ONNX model
+            holdout: List of (image, class_id) pairs
+            batch_size: Batch size for inference
+
+        Returns:
+            Top-1 accuracy in [0, 1]
+        """
+        if not holdout:
+            raise ValueError("Holdout set is empty")
+
+        inference = OptimizedInference(model_path, use_tensorrt=False, device=self.device)
+
+        correct = 0
+        for i in range(0, len(holdout), batch_size):
+            batch = holdout[i:i + batch_size]
+            predictions = inference.predict_batch([image for image, _ in batch])
+            correct += sum(
+                1 for prediction, (_, label) in zip(predictions, batch)
+                if prediction['class_id'] == label
+            )
+
+        return correct / len(holdout)
+
+    def accuracy_delta_report(self, baseline_path: str,
+                              variant_paths: Dict[str, str],
+                              holdout: List[Tuple[np.ndarray, int]]) -> Dict[str, Dict]:
+        """
+        Report accuracy of each variant relative to the FP32 baseline.
+
+        Args:
+            baseline_path: Path to FP32 ONNX model
+            variant_paths: Dictionary of variant name to ONNX path
+            holdout: List of (image, class_id) pairs
+
+        Returns:
+            Per-variant accuracy and delta versus the baseline
+        """
+        baseline_accuracy = self.evaluate_accuracy(baseline_path, holdout)
+        self.logger.info(f"🎯 Baseline accuracy: {baseline_accuracy:.4f}")
+
+        report = {'baseline': {'accuracy': baseline_accuracy, 'delta': 0.0}}
+
+        for name, path in variant_paths.items():
+            try:
+                accuracy = self.evaluate_accuracy(path, holdout)
+                delta = accuracy - baseline_accuracy
+                report[name] = {'accuracy': accuracy, 'delta': delta}
+                self.logger.info(f"🎯 {name}: accuracy {accuracy:.4f} ({delta:+.4f})")
+            except Exception as e:
+                self.logger.error(f"❌ Accuracy evaluation failed for {name}: {e}")
+                report[name] = {'error': str(e)}
+
+        return report
+
+    def build_cpu_variants(self, output_dir: str, stage: str,
+                           registry: ModelVariantRegistry,
+                           calibration_dir: Optional[str] = None,
+                           holdout: Optional[List[Tuple[np.ndarray, int]]] = None,
+                           input_size: Tuple[int, int] = (640, 640),
+                           benchmark_images: int = 20) -> List[ModelVariant]:
+        """
+        Build FP32/FP16/INT8 ONNX variants, measure them and register them.
+
+        Only classifiers are supported: accuracy is top-1 on a labelled holdout,
+        which says nothing about a detector's boxes.
+
+        Args:
+            output_dir: Directory to write variants to
+            stage: Pipeline stage the model serves (stage2)
+            registry: Variant registry to record results in
+            calibration_dir: Crops used for static INT8 calibration (optional)
+            holdout: Labelled holdout for accuracy measurement (optional)
+            input_size: Model input size (height, width)
+            benchmark_images: Number of synthetic images used for latency
+
+        Returns:
+            Registered variants
+        """
+        if stage != 'stage2':
+            raise ValueError(f"CPU variants are built for the Stage-2 classifier only, not {stage}")
+
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        base_name = Path(self.model_path).stem
+
+        fp32_path = str(output_dir / f"{base_name}_fp32.onnx")
+        self.export_to_onnx(fp32_path, input_size=input_size)
+
+        paths = {
+            'fp32': fp32_path,
+            'fp16': self.convert_to_fp16(fp32_path, str(output_dir / f"{base_name}_fp16.onnx")),
+            'int8_dynamic': self.quantize_to_int8(
+                fp32_path, str(output_dir / f"{base_name}_int8_dynamic.onnx"), mode="dynamic"
+            ),
+        }
+        if calibration_dir:
+            paths['int8_static'] = self.quantize_to_int8(
+                fp32_path, str(output_dir / f"{base_name}_int8_static.onnx"),
+                mode="static", calibration_dir=calibration_dir
+            )
+
+        test_images = [
+            np.random.randint(0, 255, (*input_size, 3), dtype=np.uint8)
+            for _ in range(benchmark_images)
+        ]
+        latencies = self.benchmark_models(test_images, paths)
+
+        accuracies = {}
+        if holdout:
+            variant_paths = {name: path for name, path in paths.items() if name != 'fp32'}
+            report = self.accuracy_delta_report(fp32_path, variant_paths, holdout)
+            accuracies = {name: result.get('accuracy') for name, result in report.items()}
+            accuracies['fp32'] = report['baseline']['accuracy']
+
+        variants = []
+        for name, path in paths.items():
+            if 'error' in latencies.get(name, {'error': 'missing'}):
+                continue
+            variant = ModelVariant(
+                name=f"{base_name}_{name}",
+                stage=stage,
+                path=path,
+                precision=name.split('_')[0],
+                model_hash=_file_hash(path),
+                latency_ms=latencies[name]['avg_time'] * 1000,
+                accuracy=accuracies.get(name),
+                base_model=base_name
+            )
+            registry.register(variant)
+            variants.append(variant)
+
+        self.logger.info(f"📚 Registered {len(variants)} variants in {registry.registry_path}")
+        return variants
+
+
+class CropCalibrationDataReader(CalibrationDataReader):
+    """Feed our own crops to ONNX Runtime static quantization calibration."""
+
+    def __init__(self, onnx_path: str, calibration_dir: str, max_images: int = 200):
+        session = ort.InferenceSession(onnx_path, providers=['CPUExecutionProvider'])
+        model_input = session.get_inputs()[0]
+        self.input_name = model_input.name
+        self.height, self.width = model_input.shape[2], model_input.shape[3]
+
+        image_paths = sorted(
+            p for p in Path(calibration_dir).rglob("*")
+            if p.suffix.lower() in {'.jpg', '.jpeg', '.png'}
+        )[:max_images]
+        if not image_paths:
+            raise ValueError(f"No calibration images found in {calibration_dir}")
+
+        self._paths = iter(image_paths)
+
+    def get_next(self) -> Optional[Dict[str, np.ndarray]]:
+        """Return the next calibration sample or None when exhausted."""
+        path = next(self._paths, None)
+        if path is None:
+            return None
+
+        with Image.open(path) as img:
+            resized = img.convert('RGB').resize((self.width, self.height))
+        chw = np.transpose(np.asarray(resized, dtype=np.float32) / 255.0, (2, 0, 1))
+        return {self.input_name: chw[np.newaxis, ...]}
+
+
+def load_holdout(holdout_dir: str, class_names: Dict[int, str]) -> List[Tuple[np.ndarray, int]]:
+    """
+    Load a labelled holdout laid out as ``holdout_dir/<class name or id>/*.jpg``.
+
+    Args:
+        holdout_dir: Holdout root directory
+        class_names: Model class id to name mapping
+
+    Returns:
+        List of (image, class_id) pairs
+    """
+    name_to_id = {name: class_id for class_id, name in class_names.items()}
+    holdout = []
+
+    for class_dir in sorted(p for p in Path(holdout_dir).iterdir() if p.is_dir()):
+        if class_dir.name in name_to_id:
+            class_id = name_to_id[class_dir.name]
+        elif class_dir.name.isdigit():
+            class_id = int(class_dir.name)
+        else:
+            logger.warning(f"⚠️  Skipping holdout folder with unknown class: {class_dir.name}")
+            continue
+
+        for image_path in sorted(class_dir.glob("*")):
+            if image_path.suffix.lower() in {'.jpg', '.jpeg', '.png'}:
+                with Image.open(image_path) as img:
+                    holdout.append((np.asarray(img.convert('RGB')), class_id))
+
+    return holdout
+
+
+def _file_hash(path: str) -> str:
+    """Short content hash, matching ModelProvider.get_model_hash."""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
 
 class OptimizedInference:
     """Optimized inference engine with ONNX/TensorRT support."""
@@ -306,7 +615,9 @@ class OptimizedInference:
         self.logger.info("🔧 Initializing ONNX Runtime engine")
 
         # Configure providers
-        providers = ['CUDAExecutionProvider', 'CPUExecutionProvider']
+        providers = ['CPUExecutionProvider']
+        if self.device != "cpu":
+            providers.insert(0, 'CUDAExecutionProvider')
 
         # Create session
         self.session = ort.InferenceSession(self.model_path, providers=providers)
@@ -347,15 +658,16 @@ class OptimizedInference:
 
     def _preprocess_batch(self, images: List[np.ndarray]) -> np.ndarray:
         """Preprocess batch of images."""
-        len(images)
+        height, width = self.input_shape[2], self.input_shape[3]
 
         # Resize and normalize images
         processed_images = []
         for img in images:
-            # Resize to model input size
-            # TODO: Add cv2 import or use PIL
-            # resized = cv2.resize(img, (width, height))
-            resized = img  # Placeholder
+            # Resize to model input size (dynamic axes are left as-is)
+            if isinstance(height, int) and isinstance(width, int) and img.shape[:2] != (height, width):
+                resized = np.asarray(Image.fromarray(img).resize((width, height)))
+            else:
+                resized = img
 
             # Normalize to [0, 1]
             normalized = resized.astype(np.float32) / 255.0
@@ -419,6 +731,12 @@ def main():
     parser.add_argument("--precision", choices=["fp32", "fp16", "int8"], default="fp16")
     parser.add_argument("--batch-size", type=int, default=32)
     parser.add_argument("--benchmark", action="store_true", help="Run benchmark")
+    parser.add_argument("--device", default="cuda", help="Device (cuda or cpu)")
+    parser.add_argument("--cpu-variants", action="store_true",
+                        help="Build FP32/FP16/INT8 ONNX variants of a Stage-2 classifier and register them")
+    parser.add_argument("--calibration-dir", help="Crops used for static INT8 calibration")
+    parser.add_argument("--holdout-dir", help="Labelled holdout (one folder per class)")
+    parser.add_argument("--registry", default="models/variants.yaml", help="Variant registry path")
 
     args = parser.parse_args()
 
@@ -427,7 +745,23 @@ def main():
     output_dir.mkdir(exist_ok=True)
 
     # Initialize optimizer
-    optimizer = ModelOptimizer(args.model_path)
+    optimizer = ModelOptimizer(args.model_path, device=args.device)
+
+    if args.cpu_variants:
+        holdout = load_holdout(args.holdout_dir, optimizer.model.names) if args.holdout_dir else None
+        variants = optimizer.build_cpu_variants(
+            str(output_dir),
+            stage="stage2",
+            registry=ModelVariantRegistry(args.registry),
+            calibration_dir=args.calibration_dir,
+            holdout=holdout
+        )
+
+        print("\n📚 Registered Variants:")
+        for variant in variants:
+            accuracy = f"{variant.accuracy:.4f}" if variant.accuracy is not None else "n/a"
+            print(f"  {variant.name}: {variant.latency_ms:.2f}ms, accuracy {accuracy}")
+        return
 
     # Export to ONNX
     onnx_path = output_dir / "model.onnx"
@@ -0,0 +1,234 @@
+"""
+Empty-frame prefilter using per-camera background models.
+
+Most trail-camera triggers are wind or light changes with no animal in view.
+This stage keeps a downscaled running background per camera and scores each
+frame by the fraction of thumbnail pixels that differ from it, so frames with
+no motion can skip Stage-1 entirely.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+from PIL import Image
+
+from ..common.utils.logging_utils import get_logger
+from .exif_extractor import infer_camera_id
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+logger = get_logger("wildlife_pipeline.motion_prefilter")
+
+
+@dataclass
+class MotionPrefilterConfig:
+    """Configuration for the motion prefilter."""
+    enabled: bool = False
+    thumbnail_width: int = 64
+    threshold: float = 0.01  # fraction of changed thumbnail pixels needed to pass
+    pixel_delta: float = 20.0  # luminance change (0-255) that counts as a changed pixel
+    learning_rate: float = 0.1  # running background update rate
+    warmup_frames: int = 1  # frames per camera that always pass while the background forms
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> MotionPrefilterConfig:
+        """Create from stage configuration."""
+        return cls(**{k: v for k, v in data.items() if k in cls.__dataclass_fields__})
+
+
+@dataclass
+class MotionScore:
+    """Prefilter decision for one frame."""
+    camera_id: str
+    score: float
+    passed: bool
+    reason: str  # 'warmup', 'motion' or 'static'
+
+
+class BackgroundModel:
+    """Running grayscale background for a single camera."""
+
+    def __init__(self, thumbnail: np.ndarray):
+        self.background = thumbnail.astype(np.float32)
+        self.frames = 1
+
+    def score(self, thumbnail: np.ndarray, pixel_delta: float) -> float:
+        """Fraction of pixels that changed, after removing a global brightness shift."""
+        diff = thumbnail - self.background
+        diff -= np.median(diff)  # light changes move the whole frame, animals don't
+        return float(np.mean(np.abs(diff) > pixel_delta))
+
+    def update(self, thumbnail: np.ndarray, learning_rate: float) -> None:
+        """Blend a frame into the background."""
+        self.background += learning_rate * (thumbnail - self.background)
+        self.frames += 1
+
+
+class MotionPrefilter:
+    """Per-camera motion prefilter for Stage-1."""
+
+    def __init__(self, config: MotionPrefilterConfig | None = None):
+        self.config = config or MotionPrefilterConfig()
+        self._backgrounds: dict[str, BackgroundModel] = {}
+        self._counts: dict[str, dict[str, int]] = {}
+
+    def thumbnail(self, image: Image.Image) -> np.ndarray:
+        """Downscale a frame to a float32 grayscale thumbnail.
+
+        Unloaded JPEGs are switched to draft mode, so pass an image opened for
+        the prefilter rather than the one handed to the detector.
+        """
+        width = self.config.thumbnail_width
+        height = max(1, round(width * image.height / max(1, image.width)))
+        # JPEG draft mode decodes at reduced scale, which is most of the saving
+        image.draft('L', (width * 2, height * 2))
+        return np.asarray(image.convert('L').resize((width, height), Image.BILINEAR), dtype=np.float32)
+
+    def score(self, camera_id: str, image: Image.Image) -> MotionScore:
+        """Score a frame against its camera's background and update the background."""
+        return self.score_thumbnail(camera_id, self.thumbnail(image))
+
+    def score_thumbnail(self, camera_id: str, thumbnail: np.ndarray) -> MotionScore:
+        """Score a thumbnail from ``thumbnail``; call in capture order per camera.
+
+        Thumbnails can be computed concurrently ahead of time, only scoring
+        updates the background.
+        """
+        model = self._backgrounds.get(camera_id)
+
+        if model is None or model.background.shape != thumbnail.shape:
+            self._backgrounds[camera_id] = BackgroundModel(thumbnail)
+            result = MotionScore(camera_id, 1.0, True, 'warmup')
+        else:
+            score = model.score(thumbnail, self.config.pixel_delta)
+            if model.frames < self.config.warmup_frames:
+                result = MotionScore(camera_id, score, True, 'warmup')
+            elif score >= self.config.threshold:
+                result = MotionScore(camera_id, score, True, 'motion')
+            else:
+                result = MotionScore(camera_id, score, False, 'static')
+            model.update(thumbnail, self.config.learning_rate)
+
+        counts = self._counts.setdefault(camera_id, {'passed': 0, 'skipped': 0})
+        counts['passed' if result.passed else 'skipped'] += 1
+        return result
+
+    def stats(self) -> dict[str, Any]:
+        """Passed/skipped counts overall and per camera."""
+        passed = sum(c['passed'] for c in self._counts.values())
+        skipped = sum(c['skipped'] for c in self._counts.values())
+        total = passed + skipped
+        return {
+            'frames': total,
+            'passed': passed,
+            'skipped': skipped,
+            'skip_rate': skipped / total if total else 0.0,
+            'cameras': {camera: dict(c) for camera, c in sorted(self._counts.items())},
+        }
+
+
+def load_labelled_set(labels_csv: Path, image_root: Path) -> list[tuple[Path, str, bool]]:
+    """
+    Load a labelled calibration set.
+
+    The CSV has ``path`` (relative to ``image_root``) and ``has_animal``
+    columns. Frames are returned per camera in path order, which for trail
+    cameras is capture order.
+    """
+    frames = []
+    with open(labels_csv, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            path = image_root / row['path']
+            has_animal = str(row['has_animal']).strip().lower() in ('1', 'true', 'yes')
+            frames.append((path, infer_camera_id(path, image_root), has_animal))
+    return sorted(frames, key=lambda frame: (frame[1], str(frame[0])))
+
+
+def calibration_report(frames: Iterable[tuple[Path, str, bool]], config: MotionPrefilterConfig,
+                       thresholds: Iterable[float]) -> dict[str, Any]:
+    """
+    Score a labelled set once and report recall and skip rate per threshold.
+
+    Recall is the fraction of frames with an animal that pass the prefilter;
+    skip rate is the fraction of all frames that would not reach Stage-1.
+    """
+    prefilter = MotionPrefilter(config)
+    scored = []
+    for path, camera_id, has_animal in frames:
+        with Image.open(path) as image:
+            result = prefilter.score(camera_id, image)
+        scored.append((result, has_animal))
+
+    animal_frames = sum(1 for _, has_animal in scored if has_animal)
+    empty_frames = len(scored) - animal_frames
+
+    rows = []
+    for threshold in sorted(thresholds):
+        passed = [(r.reason == 'warmup' or r.score >= threshold, has_animal) for r, has_animal in scored]
+        animals_passed = sum(1 for p, has_animal in passed if p and has_animal)
+        empty_skipped = sum(1 for p, has_animal in passed if not p and not has_animal)
+        skipped = sum(1 for p, _ in passed if not p)
+        rows.append({
+            'threshold': threshold,
+            'recall': animals_passed / animal_frames if animal_frames else 1.0,
+            'missed_animal_frames': animal_frames - animals_passed,
+            'empty_frames_skipped': empty_skipped / empty_frames if empty_frames else 0.0,
+            'skip_rate': skipped / len(scored) if scored else 0.0,
+        })
+
+    return {
+        'frames': len(scored),
+        'animal_frames': animal_frames,
+        'empty_frames': empty_frames,
+        'config': {k: getattr(config, k) for k in config.__dataclass_fields__},
+        'thresholds': rows,
+    }
+
+
+def main():
+    """Main function for prefilter calibration."""
+    parser = argparse.ArgumentParser(description="Calibrate the motion prefilter on labelled sets")
+    parser.add_argument("labels", nargs='+', help="Labels CSV(s) with path,has_animal columns")
+    parser.add_argument("--image-root", required=True, help="Directory the label paths are relative to")
+    parser.add_argument("--thresholds", default="0.002,0.005,0.01,0.02,0.05",
+                        help="Comma-separated thresholds to evaluate")
+    parser.add_argument("--thumbnail-width", type=int, default=MotionPrefilterConfig.thumbnail_width)
+    parser.add_argument("--pixel-delta", type=float, default=MotionPrefilterConfig.pixel_delta)
+    parser.add_argument("--learning-rate", type=float, default=MotionPrefilterConfig.learning_rate)
+    parser.add_argument("--output", help="Write the report as JSON")
+
+    args = parser.parse_args()
+
+    config = MotionPrefilterConfig(
+        enabled=True,
+        thumbnail_width=args.thumbnail_width,
+        pixel_delta=args.pixel_delta,
+        learning_rate=args.learning_rate,
+    )
+    thresholds = [float(t) for t in args.thresholds.split(',')]
+
+    reports = {}
+    for labels_csv in args.labels:
+        frames = load_labelled_set(Path(labels_csv), Path(args.image_root))
+        reports[labels_csv] = calibration_report(frames, config, thresholds)
+
+        logger.info(f"📊 {labels_csv}: {reports[labels_csv]['frames']} frames")
+        for row in reports[labels_csv]['thresholds']:
+            logger.info(f"   threshold={row['threshold']:g} recall={row['recall']:.3f} "
+                        f"skip_rate={row['skip_rate']:.3f}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(reports, indent=2), encoding='utf-8')
+        logger.info(f"💾 Calibration report saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
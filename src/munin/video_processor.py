@@ -11,11 +11,11 @@ This module provides high-performance video processing with:
 """
 
 import multiprocessing as mp
+import os
 import queue
 import sys
-import threading
 import time
-from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, Iterator, List, Optional, Any
@@ -34,8 +34,75 @@ except ImportError as e:
 from ..common.core.base import BaseProcessor
 from ..common.exceptions import ValidationError
 from ..common.utils.logging_utils import get_logger
+from ..common.utils.prefetch import BatchPrefetcher
+from ..common.utils.shared_ring import SharedFrameRing
 from ..common.utils.file_utils import is_video_file
-from .wildlife_detector import Detection
+from .frame_tracker import FrameTracker, TrackerConfig
+from .motion_prefilter import BackgroundModel
+from .wildlife_detector import Detection, YOLODetector
+
+
+def _stream_fps(video_stream) -> float:
+    """Frame rate of a video stream (``rate`` was removed in newer PyAV)."""
+    rate = video_stream.average_rate or video_stream.base_rate or video_stream.guessed_rate
+    return float(rate) if rate else 30.0
+
+
+def _stream_duration(container, video_stream) -> float:
+    """Duration in seconds, from the stream or, failing that, the container."""
+    if video_stream.duration is not None:
+        return float(video_stream.duration * video_stream.time_base)
+    return float(container.duration / av.time_base) if container.duration else 0.0
+
+
+def _stream_start(video_stream) -> float:
+    """Start time of a stream in seconds."""
+    return float(video_stream.start_time * video_stream.time_base) if video_stream.start_time else 0.0
+
+
+def _motion_vector_activity(frame) -> Optional[float]:
+    """Fraction of the frame covered by moving blocks, or None without motion vectors."""
+    side_data = frame.side_data.get('MOTION_VECTORS')
+    if side_data is None:
+        return None
+    vectors = side_data.to_ndarray()
+    if len(vectors) == 0:
+        return 0.0
+    scale = np.maximum(vectors['motion_scale'], 1).astype(np.float32)
+    magnitude = np.hypot(vectors['motion_x'] / scale, vectors['motion_y'] / scale)
+    moving = magnitude > 1.0  # sub-pixel vectors are encoder noise
+    area = (vectors['w'].astype(np.float32) * vectors['h'])[moving].sum()
+    return float(min(1.0, area / max(1, frame.width * frame.height)))
+
+
+def select_activity_peaks(activity: List[tuple], budget: int, min_gap_seconds: float,
+                          threshold: float = 0.0) -> List[float]:
+    """
+    Pick up to ``budget`` frame times at activity peaks.
+
+    Local maxima at or above ``threshold`` are taken strongest first, skipping
+    any closer than ``min_gap_seconds`` to one already taken. When nothing
+    qualifies the first frame is returned, so every video is looked at once.
+    """
+    if not activity or budget <= 0:
+        return []
+
+    scores = [score for _, score in activity]
+    peaks = [
+        (score, t) for i, (t, score) in enumerate(activity)
+        if score >= threshold and score > 0
+        and (i == 0 or score >= scores[i - 1])
+        and (i == len(scores) - 1 or score >= scores[i + 1])
+    ]
+
+    selected: List[float] = []
+    for _score, t in sorted(peaks, key=lambda peak: -peak[0]):
+        if len(selected) >= budget:
+            break
+        if all(abs(t - other) >= min_gap_seconds for other in selected):
+            selected.append(t)
+
+    return sorted(selected) or [activity[0][0]]
 
 
 @dataclass
@@ -43,11 +110,41 @@ class VideoFrame:
     """Optimized video frame data structure."""
     frame_number: int
     timestamp: float
-    image: np.ndarray
+    image: Optional[np.ndarray]  # native resolution; None when only the model input is kept
     width: int
     height: int
     codec: str
     pixel_format: str
+    model_image: Optional[np.ndarray] = None  # letterboxed to inference_size
+    letterbox_scale: float = 1.0
+    letterbox_pad: tuple = (0, 0)  # (x, y) offset of the scaled frame in model_image
+
+    @property
+    def detection_image(self) -> np.ndarray:
+        """Image to hand to the detector."""
+        return self.model_image if self.model_image is not None else self.image
+
+    @property
+    def content_image(self) -> np.ndarray:
+        """Frame content without letterbox padding, at whatever resolution was kept."""
+        if self.image is not None:
+            return self.image
+        pad_x, pad_y = self.letterbox_pad
+        width = max(1, round(self.width * self.letterbox_scale))
+        height = max(1, round(self.height * self.letterbox_scale))
+        return self.model_image[pad_y:pad_y + height, pad_x:pad_x + width]
+
+    def to_source_bbox(self, bbox: List[float]) -> List[float]:
+        """Map an [x1, y1, x2, y2] box from model_image back to native pixels."""
+        pad_x, pad_y = self.letterbox_pad
+        scale = self.letterbox_scale
+        x1, y1, x2, y2 = bbox
+        return [
+            min(max((x1 - pad_x) / scale, 0.0), self.width),
+            min(max((y1 - pad_y) / scale, 0.0), self.height),
+            min(max((x2 - pad_x) / scale, 0.0), self.width),
+            min(max((y2 - pad_y) / scale, 0.0), self.height),
+        ]
 
 
 @dataclass
@@ -59,12 +156,32 @@ class VideoProcessingConfig:
     use_gpu_decoding: bool = True
     gpu_device_id: int = 0
     parallel_workers: int = None
-    memory_limit_gb: int = 8
+    memory_limit_gb: float = 8  # ceiling for decoded frames held in flight
     output_format: str = "RGB"
     quality_preset: str = "fast"
     model_cache_dir: Optional[str] = None
     prefetch_batches: int = 2
     warmup_iterations: int = 3
+    # Multi-video processing
+    multi_video_mode: str = "thread"  # "thread", "process" (warm model per worker) or "shared_decode"
+    shared_ring_slots: int = 64  # shared_decode: frame slots shared by the decode processes
+    worker_threads: int = 1  # torch/OpenCV threads per worker process
+    worker_start_method: str = "spawn"  # safe with CUDA and threaded libraries
+    model_device: str = "cuda"
+    inference_size: Optional[int] = None  # letterbox frames to this square size while decoding (e.g. 640)
+    keep_full_resolution: bool = False  # keep native frames even when nothing is saved
+    sampling_strategy: str = "sequential"  # "sequential", "seek", "keyframe" or "adaptive"
+    seek_min_gap_seconds: float = 2.0  # seek instead of decoding forward when the next sample is further away
+    # "adaptive" strategy: pick up to frame_budget frames at activity peaks
+    frame_budget: int = 32
+    activity_source: str = "auto"  # "auto" (motion vectors, else luminance), "motion_vectors" or "luminance"
+    activity_threshold: float = 0.002  # fraction of the frame that must move for a peak to count
+    activity_min_gap_seconds: float = 1.0  # minimum spacing between selected frames
+    activity_thumbnail_width: int = 64
+    activity_pixel_delta: float = 20.0  # luminance change (0-255) that counts as a changed pixel
+    activity_learning_rate: float = 0.5  # running background update rate for luminance scores
+    # Tracker mode: detect every Nth sampled frame, carry boxes between with optical flow
+    tracker: Optional[TrackerConfig] = None
 
 
 class ModelCache:
@@ -106,69 +223,6 @@ class ModelCache:
         self.logger.info(f"🔥 Model warmup completed ({iterations} iterations)")
 
 
-class BatchPrefetcher:
-    """Prefetch batches for efficient processing."""
-
-    def __init__(self, batch_size: int, prefetch_batches: int = 2):
-        self.batch_size = batch_size
-        self.prefetch_batches = prefetch_batches
-        self.queue = queue.Queue(maxsize=prefetch_batches)
-        self.stop_event = threading.Event()
-        self.thread = None
-        self.logger = get_logger("wildlife_pipeline.batch_prefetcher")
-
-    def start_prefetching(self, data_source: Iterator, processor_func):
-        """Start prefetching batches in background thread."""
-        self.thread = threading.Thread(
-            target=self._prefetch_worker,
-            args=(data_source, processor_func),
-            daemon=True
-        )
-        self.thread.start()
-        self.logger.info(f"🚀 Started prefetching {self.prefetch_batches} batches")
-
-    def _prefetch_worker(self, data_source: Iterator, processor_func):
-        """Worker thread for prefetching."""
-        batch = []
-
-        for item in data_source:
-            if self.stop_event.is_set():
-                break
-
-            batch.append(item)
-
-            if len(batch) >= self.batch_size:
-                try:
-                    processed_batch = processor_func(batch)
-                    self.queue.put(processed_batch, timeout=1.0)
-                    batch = []
-                except queue.Full:
-                    self.logger.warning("⚠️  Prefetch queue full, dropping batch")
-                except Exception as e:
-                    self.logger.error(f"❌ Prefetch error: {e}")
-
-        # Process remaining items
-        if batch:
-            try:
-                processed_batch = processor_func(batch)
-                self.queue.put(processed_batch, timeout=1.0)
-            except Exception as e:
-                self.logger.error(f"❌ Final batch error: {e}")
-
-    def get_batch(self, timeout: float = 5.0):
-        """Get next prefetched batch."""
-        try:
-            return self.queue.get(timeout=timeout)
-        except queue.Empty:
-            return None
-
-    def stop(self):
-        """Stop prefetching."""
-        self.stop_event.set()
-        if self.thread:
-            self.thread.join(timeout=2.0)
-
-
 class OptimizedVideoProcessor(BaseProcessor):
     """High-performance video processor with GPU acceleration."""
 
@@ -251,49 +305,45 @@ class OptimizedVideoProcessor(BaseProcessor):
             container = av.open(str(video_path))
             video_stream = container.streams.video[0]
 
-            # Get video metadata
-            duration = float(video_stream.duration * video_stream.time_base)
-            fps = float(video_stream.rate)
-            total_frames = int(duration * fps)
-
-            self.logger.info(f"📊 Video info: {duration:.1f}s, {fps:.1f} fps, {total_frames} frames")
-
-            # Calculate frame sampling
-            frame_interval = int(fps * self.config.sample_interval_seconds)
-            target_frames = min(total_frames // frame_interval, self.config.max_frames)
-
-            self.logger.info(f"🎯 Target frames: {target_frames} (interval: {frame_interval})")
-
-            # Process frames with GPU acceleration
-            frames = self._extract_frames_gpu_optimized(
-                container, video_stream, frame_interval, target_frames
+            duration, fps, total_frames, frame_interval, target_frames = self._sampling_plan(
+                container, video_stream
             )
 
-            # Process detections if detector provided
-            detections = []
-            if detector:
-                detections = self._process_frames_batch(frames, detector)
-
-            # Save frames if output directory specified
-            if output_dir:
-                self._save_frames_parallel(frames, output_dir, video_path.stem)
+            # Stream frames through detection and saving in bounded batches
+            decode_stats = {'decoded': 0}
+            keep_full = self._needs_full_resolution(output_dir)
+            batch_size = self._stream_batch_size(video_stream.width, video_stream.height, keep_full)
+            frames = self._iter_frames(container, video_stream, frame_interval, target_frames,
+                                       decode_stats, keep_full)
+            stream = self._run_stream(frames, batch_size, detector, output_dir, video_path.stem)
+            detections, frames_extracted = stream['detections'], stream['frames']
 
             processing_time = time.time() - start_time
-            fps_processed = len(frames) / processing_time if processing_time > 0 else 0
+            fps_processed = frames_extracted / processing_time if processing_time > 0 else 0
 
             result = {
                 'video_path': str(video_path),
                 'duration': duration,
                 'fps': fps,
                 'total_frames': total_frames,
-                'frames_extracted': len(frames),
+                'frames_extracted': frames_extracted,
+                'frames_decoded': decode_stats['decoded'],
+                'stream_batch_size': batch_size,
+                'inference_size': self.config.inference_size,
+                'full_resolution_kept': keep_full,
+                'detector_calls': stream['detector_calls'],
+                'prefetch': stream['prefetch'],
+                'sampling_strategy': self.config.sampling_strategy,
                 'detections': detections,
                 'processing_time': processing_time,
                 'fps_processed': fps_processed,
                 'gpu_accelerated': self.gpu_available
             }
+            if 'tracking' in stream:
+                result['frame_detections'] = stream['frame_detections']
+                result['tracking'] = stream['tracking']
 
-            self.logger.info(f"✅ Video processing completed: {len(frames)} frames in {processing_time:.1f}s ({fps_processed:.1f} fps)")
+            self.logger.info(f"✅ Video processing completed: {frames_extracted} frames in {processing_time:.1f}s ({fps_processed:.1f} fps)")
             return result
 
         except Exception as e:
@@ -303,18 +353,188 @@ class OptimizedVideoProcessor(BaseProcessor):
             if 'container' in locals():
                 container.close()
 
+    def _sampling_plan(self, container, video_stream) -> tuple:
+        """Video metadata and frame sampling: ``(duration, fps, total_frames, frame_interval, target_frames)``."""
+        duration = _stream_duration(container, video_stream)
+        fps = _stream_fps(video_stream)
+        total_frames = int(duration * fps)
+
+        self.logger.info(f"📊 Video info: {duration:.1f}s, {fps:.1f} fps, {total_frames} frames")
+
+        frame_interval = max(1, int(fps * self.config.sample_interval_seconds))
+        target_frames = min(max(1, total_frames // frame_interval), self.config.max_frames)
+        if self.config.sampling_strategy == "adaptive":
+            target_frames = max(1, min(self.config.frame_budget, self.config.max_frames))
+
+        self.logger.info(f"🎯 Target frames: {target_frames} (interval: {frame_interval}, "
+                         f"strategy: {self.config.sampling_strategy})")
+        return duration, fps, total_frames, frame_interval, target_frames
+
     def _extract_frames_gpu_optimized(self, container, video_stream,
-                                     frame_interval: int, target_frames: int) -> List[VideoFrame]:
-        """Extract frames with GPU-accelerated decoding."""
-        frames = []
-        frame_count = 0
-        extracted_count = 0
+                                     frame_interval: int, target_frames: int,
+                                     decode_stats: Optional[Dict[str, int]] = None) -> List[VideoFrame]:
+        """Extract all sampled frames into a list (see ``_iter_frames`` for streaming)."""
+        return list(self._iter_frames(container, video_stream, frame_interval, target_frames, decode_stats))
+
+    def _iter_frames(self, container, video_stream, frame_interval: int, target_frames: int,
+                     decode_stats: Optional[Dict[str, int]] = None,
+                     keep_full_resolution: bool = True) -> Iterator[VideoFrame]:
+        """Lazily decode sampled frames using the configured sampling strategy."""
+        decode_stats = decode_stats if decode_stats is not None else {'decoded': 0}
+        self._configure_decoder(video_stream)
+
+        if self.config.sampling_strategy == "sequential":
+            decoded = self._iter_frames_sequential(container, video_stream, frame_interval,
+                                                   target_frames, decode_stats)
+        elif self.config.sampling_strategy in ("seek", "keyframe"):
+            decoded = self._iter_frames_seek(container, video_stream, frame_interval,
+                                             target_frames, decode_stats)
+        elif self.config.sampling_strategy == "adaptive":
+            decoded = self._iter_frames_adaptive(container, video_stream, target_frames, decode_stats)
+        else:
+            raise ValidationError(f"Unknown sampling strategy: {self.config.sampling_strategy}")
+
+        for frame_number, frame in decoded:
+            yield self._to_video_frame(frame, frame_number, video_stream, keep_full_resolution)
+
+    def _needs_full_resolution(self, output_dir: Optional[Path]) -> bool:
+        """Native-resolution frames are only converted when saved or explicitly requested."""
+        return not self.config.inference_size or output_dir is not None or self.config.keep_full_resolution
+
+    def _stream_batch_size(self, width: int, height: int, keep_full_resolution: bool = True) -> int:
+        """
+        Frames per streamed batch that keep decoded frames under ``memory_limit_gb``.
+
+        Up to ``prefetch_batches`` batches are decoded ahead, plus one being
+        detected and one being saved, each image held as an RGB array plus a
+        PIL copy.
+        """
+        frame_bytes = 0
+        if keep_full_resolution:
+            frame_bytes += width * height * 3 * 2
+        if self.config.inference_size:
+            frame_bytes += self.config.inference_size ** 2 * 3 * 2
+        frame_bytes = max(1, frame_bytes)
+        limit_bytes = int(self.config.memory_limit_gb * 1024 ** 3)
+        batches_alive = max(1, self.config.prefetch_batches) + 2
+        return max(1, min(self.config.batch_size, limit_bytes // (batches_alive * frame_bytes)))
+
+    def _run_stream(self, frames: Iterator[VideoFrame], batch_size: int, detector=None,
+                    output_dir: Optional[Path] = None, video_name: str = "") -> Dict[str, Any]:
+        """
+        Detect and save frames batch by batch.
+
+        Decoding and PIL conversion run ahead on a ``BatchPrefetcher`` (at most
+        ``prefetch_batches`` batches), and saving a batch overlaps with
+        detecting the next; the next batch waits for the previous saves. With
+        ``config.tracker`` set, only every Nth frame is detected and the rest
+        get tracked boxes (see ``_track_batch``).
+        """
+        tracker = FrameTracker(self.config.tracker) if detector and self.config.tracker else None
+        stream: Dict[str, Any] = {'detections': [], 'frames': 0, 'detector_calls': 0}
+        if tracker:
+            stream['frame_detections'] = []
+        saved = 0
+        pending = []
+
+        if output_dir:
+            output_dir.mkdir(parents=True, exist_ok=True)
+
+        convert = detector is not None or output_dir is not None
+        prefetcher = BatchPrefetcher(
+            lambda batch: (batch, [self._to_pil(frame) for frame in batch] if convert else None),
+            batch_size=batch_size, workers=1, prefetch=self.config.prefetch_batches, name="video_prefetch"
+        )
+
+        with ThreadPoolExecutor(max_workers=self.config.parallel_workers) as executor:
+            for batch, images in prefetcher.map(frames):
+                processed = stream['frames']
+                stream['frames'] += len(batch)
+                if not convert:
+                    continue
+
+                if tracker:
+                    self._track_batch(batch, images, processed, detector, tracker, stream)
+                elif detector:
+                    stream['detections'].extend(self._detect_frames(batch, images, detector))
+                    stream['detector_calls'] += len(batch)
+
+                saved += self._wait_saves(pending)
+                if output_dir:
+                    pending = [
+                        executor.submit(self._save_image, image, output_dir, video_name, processed + i)
+                        for i, image in enumerate(images)
+                    ]
+
+            saved += self._wait_saves(pending)
+
+        stream['prefetch'] = prefetcher.stats.to_dict()
+        if tracker:
+            stream['tracking'] = {**tracker.stats(), 'detect_every': tracker.config.detect_every,
+                                  'detector_calls': stream['detector_calls']}
+        if output_dir:
+            self.logger.info(f"💾 Saved {saved} frames to {output_dir}")
+        return stream
+
+    def _track_batch(self, batch: List[VideoFrame], images: List[Optional[Image.Image]], first_index: int,
+                     detector, tracker: FrameTracker, stream: Dict[str, Any]) -> None:
+        """Detect every ``detect_every``-th frame of a batch and track boxes on the rest."""
+        every = max(1, tracker.config.detect_every)
+        for offset, (frame, image) in enumerate(zip(batch, images)):
+            frame_size = (frame.width, frame.height)
+            if (first_index + offset) % every == 0:
+                found = tracker.update(frame.content_image, frame_size,
+                                       self._detect_frames([frame], [image], detector))
+                stream['detector_calls'] += 1
+                inference = 'detected'
+            else:
+                found = tracker.propagate(frame.content_image, frame_size)
+                inference = 'tracked'
+
+            stream['detections'].extend(found)
+            stream['frame_detections'].extend({
+                'frame_number': frame.frame_number,
+                'timestamp': frame.timestamp,
+                'label': detection.label,
+                'confidence': detection.confidence,
+                'bbox': detection.bbox,
+                'track_id': detection.track_id,
+                'inference': inference,
+            } for detection in found)
+
+    @staticmethod
+    def _to_pil(frame: VideoFrame) -> Optional[Image.Image]:
+        """PIL copy of the native frame, when one was kept."""
+        return Image.fromarray(frame.image) if frame.image is not None else None
+
+    def _wait_saves(self, pending: list) -> int:
+        """Wait for in-flight frame saves and return how many succeeded."""
+        saved = 0
+        for future in pending:
+            try:
+                future.result()
+                saved += 1
+            except Exception as e:
+                self.logger.error(f"❌ Error saving frame: {e}")
+        return saved
+
+    @staticmethod
+    def _save_image(image: Image.Image, output_dir: Path, video_name: str, frame_idx: int) -> Path:
+        """Save one frame as JPEG."""
+        filepath = output_dir / f"{video_name}_frame_{frame_idx:06d}.jpg"
+        image.save(filepath, quality=95, optimize=True)
+        return filepath
+
+    def _configure_decoder(self, video_stream) -> None:
+        """Enable threaded decoding and, when available, the hardware decoder."""
+        codec_context = video_stream.codec_context
+        codec_context.thread_type = 'AUTO'
+        codec_context.thread_count = 0  # let FFmpeg pick
 
-        # Configure decoder for GPU if available
         if self.config.use_gpu_decoding and self.gpu_available:
             try:
                 # Use hardware decoder if available
-                video_stream.codec_context.options = {
+                codec_context.options = {
                     'hwaccel': 'cuda',
                     'hwaccel_device': str(self.config.gpu_device_id)
                 }
@@ -322,44 +542,198 @@ class OptimizedVideoProcessor(BaseProcessor):
                 self.logger.warning(f"⚠️  GPU decoder setup failed: {e}")
                 self.config.use_gpu_decoding = False
 
-        # Extract frames in batches for efficiency
-        batch_frames = []
-        batch_size = self.config.batch_size
+    def _iter_frames_sequential(self, container, video_stream, frame_interval: int,
+                                target_frames: int, decode_stats: Dict[str, int]) -> Iterator[tuple]:
+        """Decode every frame and keep every ``frame_interval``-th one."""
+        extracted_count = 0
 
         for frame_count, frame in enumerate(container.decode(video_stream)):
+            decode_stats['decoded'] += 1
             if extracted_count >= target_frames:
                 break
 
             if frame_count % frame_interval == 0:
-                # Convert frame to numpy array
-                img_array = frame.to_ndarray(format='rgb24')
-
-                # Create VideoFrame object
-                video_frame = VideoFrame(
-                    frame_number=frame_count,
-                    timestamp=float(frame.pts * frame.time_base),
-                    image=img_array,
-                    width=frame.width,
-                    height=frame.height,
-                    codec=video_stream.codec.name,
-                    pixel_format=frame.format.name
-                )
-
-                batch_frames.append(video_frame)
-
-                # Process batch when full
-                if len(batch_frames) >= batch_size:
-                    frames.extend(batch_frames)
-                    batch_frames = []
-                    extracted_count += batch_size
-
+                yield frame_count, frame
                 extracted_count += 1
 
-        # Add remaining frames
-        if batch_frames:
-            frames.extend(batch_frames)
+    def _iter_frames_seek(self, container, video_stream, frame_interval: int,
+                          target_frames: int, decode_stats: Dict[str, int]) -> Iterator[tuple]:
+        """
+        Decode only the frames needed to reach each sample point.
 
-        return frames
+        Distant sample points are reached with a keyframe seek. Frames between
+        the keyframe and the sample point are decoded with non-reference frames
+        skipped, so the sample may land on the next reference frame. The
+        ``keyframe`` strategy only decodes keyframes, taking the first one at or
+        after each sample point.
+        """
+        fps = _stream_fps(video_stream)
+        start_time = _stream_start(video_stream)
+        target_times = [start_time + k * frame_interval / fps for k in range(target_frames)]
+        skip_frame = "NONKEY" if self.config.sampling_strategy == "keyframe" else "NONREF"
+        return self._iter_frames_at(container, video_stream, target_times, decode_stats, skip_frame)
+
+    def _iter_frames_at(self, container, video_stream, target_times: List[float],
+                        decode_stats: Dict[str, int], skip_frame: str = "DEFAULT") -> Iterator[tuple]:
+        """Yield the first decoded frame at or after each (ascending) target time."""
+        fps = _stream_fps(video_stream)
+        time_base = video_stream.time_base
+        start_time = _stream_start(video_stream)
+        half_frame = 0.5 / fps
+        video_stream.codec_context.skip_frame = skip_frame
+
+        decoder = None
+        position = None  # time of the last decoded frame
+        last_yielded = None
+
+        for target_time in target_times:
+            if decoder is None or position is None or target_time - position > self.config.seek_min_gap_seconds:
+                container.seek(int(target_time / time_base), stream=video_stream, backward=True, any_frame=False)
+                decoder = container.decode(video_stream)
+
+            for frame in decoder:
+                decode_stats['decoded'] += 1
+                if frame.time is None:
+                    continue
+                position = frame.time
+                if frame.time + half_frame >= target_time:
+                    frame_number = int(round((frame.time - start_time) * fps))
+                    if frame_number != last_yielded:
+                        last_yielded = frame_number
+                        yield frame_number, frame
+                    break
+            else:
+                return  # end of stream
+
+    def _iter_frames_adaptive(self, container, video_stream, budget: int,
+                              decode_stats: Dict[str, int]) -> Iterator[tuple]:
+        """
+        Sample frames at activity peaks.
+
+        A scan pass scores reference frames, then the selected peaks are decoded
+        exactly with ``_iter_frames_at``.
+        """
+        activity = self.scan_activity(container, video_stream, decode_stats)
+        decode_stats['activity_frames'] = len(activity)
+        selected = select_activity_peaks(
+            activity, budget, self.config.activity_min_gap_seconds, self.config.activity_threshold
+        )
+        self.logger.info(f"🎯 Adaptive selection: {len(selected)} of {len(activity)} scanned frames")
+        return self._iter_frames_at(container, video_stream, selected, decode_stats)
+
+    def scan_activity(self, container, video_stream,
+                      decode_stats: Optional[Dict[str, int]] = None) -> List[tuple]:
+        """
+        Score activity over a whole video.
+
+        Non-reference frames are skipped. Each decoded frame is scored by the
+        fraction of its area that moves, from codec motion vectors when the
+        frame carries them and ``activity_source`` allows it, otherwise from a
+        luminance difference against a running background at thumbnail size.
+        Returns ``(time, score)`` pairs.
+        """
+        decode_stats = decode_stats if decode_stats is not None else {'decoded': 0}
+        source = self.config.activity_source
+        if source not in ("auto", "motion_vectors", "luminance"):
+            raise ValidationError(f"Unknown activity source: {source}")
+
+        codec_context = video_stream.codec_context
+        if source != "luminance":
+            codec_context.options = {**codec_context.options, 'flags2': '+export_mvs'}
+        codec_context.skip_frame = "NONREF"
+        container.seek(0, stream=video_stream, backward=True, any_frame=False)
+
+        width = self.config.activity_thumbnail_width
+        height = max(1, round(width * video_stream.height / max(1, video_stream.width)))
+        background = None
+        activity = []
+
+        for frame in container.decode(video_stream):
+            decode_stats['decoded'] += 1
+            if frame.time is None:
+                continue
+
+            score = _motion_vector_activity(frame) if source != "luminance" else None
+            if score is None and source != "motion_vectors":
+                thumbnail = frame.reformat(width=width, height=height, format='gray').to_ndarray().astype(np.float32)
+                if background is None or background.background.shape != thumbnail.shape:
+                    background = BackgroundModel(thumbnail)
+                    score = 0.0
+                else:
+                    score = background.score(thumbnail, self.config.activity_pixel_delta)
+                    background.update(thumbnail, self.config.activity_learning_rate)
+
+            activity.append((frame.time, score or 0.0))
+
+        return activity
+
+    def _to_video_frame(self, frame, frame_number: int, video_stream,
+                        keep_full_resolution: bool = True) -> VideoFrame:
+        """
+        Convert a decoded PyAV frame to a VideoFrame.
+
+        With ``inference_size`` set, libswscale scales and converts to RGB in
+        one step for the model input; the native-resolution RGB conversion is
+        skipped unless ``keep_full_resolution``.
+        """
+        video_frame = VideoFrame(
+            frame_number=frame_number,
+            timestamp=float(frame.pts * frame.time_base),
+            image=frame.to_ndarray(format='rgb24') if keep_full_resolution else None,
+            width=frame.width,
+            height=frame.height,
+            codec=video_stream.codec_context.name,
+            pixel_format=frame.format.name
+        )
+        if self.config.inference_size:
+            self._letterbox(frame, video_frame, self.config.inference_size)
+        return video_frame
+
+    @staticmethod
+    def _letterbox(frame, video_frame: VideoFrame, size: int) -> None:
+        """Scale a frame to fit ``size`` x ``size`` and pad it YOLO-style."""
+        scale = min(size / frame.width, size / frame.height)
+        width = max(1, min(size, round(frame.width * scale)))
+        height = max(1, min(size, round(frame.height * scale)))
+        resized = frame.reformat(width=width, height=height, format='rgb24',
+                                 interpolation='AREA').to_ndarray()
+
+        pad_x, pad_y = (size - width) // 2, (size - height) // 2
+        canvas = np.full((size, size, 3), 114, dtype=np.uint8)
+        canvas[pad_y:pad_y + height, pad_x:pad_x + width] = resized
+
+        video_frame.model_image = canvas
+        video_frame.letterbox_scale = scale
+        video_frame.letterbox_pad = (pad_x, pad_y)
+
+    def benchmark_sampling(self, video_path: Path,
+                           strategies: tuple = ("sequential", "seek", "keyframe")) -> Dict[str, Dict]:
+        """
+        Compare sampling strategies on one video.
+
+        Reports frames decoded, frames sampled and sampled frames per second of
+        wall time for each strategy.
+        """
+        original_strategy = self.config.sampling_strategy
+        results = {}
+        try:
+            for strategy in strategies:
+                self.config.sampling_strategy = strategy
+                start = time.perf_counter()
+                result = self.process_video_optimized(video_path)
+                elapsed = time.perf_counter() - start
+                results[strategy] = {
+                    'frames_decoded': result['frames_decoded'],
+                    'frames_sampled': result['frames_extracted'],
+                    'seconds': elapsed,
+                    'sampled_fps': result['frames_extracted'] / elapsed if elapsed > 0 else 0.0,
+                    'decoded_fps': result['frames_decoded'] / elapsed if elapsed > 0 else 0.0,
+                }
+                self.logger.info(f"⏱️  {strategy}: {results[strategy]['frames_sampled']} sampled / "
+                                 f"{results[strategy]['frames_decoded']} decoded in {elapsed:.2f}s")
+        finally:
+            self.config.sampling_strategy = original_strategy
+        return results
 
     def _process_frames_batch(self, frames: List[VideoFrame], detector) -> List[Detection]:
         """Process frames in batches for efficient inference."""
@@ -368,26 +742,49 @@ class OptimizedVideoProcessor(BaseProcessor):
 
         self.logger.info(f"🔍 Processing {len(frames)} frames with detector")
 
-        # Process frames in batches
         for i in range(0, len(frames), batch_size):
-            batch = frames[i:i + batch_size]
-
-            # Convert frames to PIL Images for detector
-            images = []
-            for frame in batch:
-                pil_image = Image.fromarray(frame.image)
-                images.append(pil_image)
-
-            # Batch inference if detector supports it
-            if hasattr(detector, 'predict_batch'):
-                batch_detections = detector.predict_batch(images)
-                detections.extend(batch_detections)
-            else:
-                # Individual inference
-                for _j, image in enumerate(images):
-                    frame_detections = detector.predict(image)
-                    detections.extend(frame_detections)
+            images = [Image.fromarray(frame.image) for frame in frames[i:i + batch_size]]
+            detections.extend(self._detect_images(images, detector))
+
+        return detections
+
+    def _detect_frames(self, frames: List[VideoFrame], images: List[Optional[Image.Image]],
+                       detector) -> List[Detection]:
+        """
+        Run the detector on a batch of frames.
 
+        Letterboxed frames are detected on ``model_image`` and their boxes are
+        mapped back to native pixels; ``images`` are reused otherwise.
+        """
+        if all(frame.model_image is None for frame in frames):
+            return self._detect_images(images, detector)
+
+        model_images = [Image.fromarray(frame.model_image) for frame in frames]
+        if hasattr(detector, 'predict_batch'):
+            results = detector.predict_batch(model_images)
+            if len(results) != len(frames) or not all(isinstance(r, list) for r in results):
+                return results  # not per-frame lists, nothing to map
+        else:
+            results = [detector.predict(image) for image in model_images]
+
+        detections = []
+        for frame, frame_detections in zip(frames, results):
+            for detection in frame_detections:
+                if getattr(detection, 'bbox', None):
+                    detection.bbox = frame.to_source_bbox(detection.bbox)
+                detections.append(detection)
+        return detections
+
+    def _detect_images(self, images: List[Image.Image], detector) -> List[Detection]:
+        """Run the detector on one batch of images."""
+        # Batch inference if detector supports it
+        if hasattr(detector, 'predict_batch'):
+            return detector.predict_batch(images)
+
+        # Individual inference
+        detections = []
+        for image in images:
+            detections.extend(detector.predict(image))
         return detections
 
     def _save_frames_parallel(self, frames: List[VideoFrame],
@@ -395,64 +792,202 @@ class OptimizedVideoProcessor(BaseProcessor):
         """Save frames in parallel for better I/O performance."""
         output_dir.mkdir(parents=True, exist_ok=True)
 
-        def save_frame(frame_data):
-            frame, frame_idx = frame_data
-            filename = f"{video_name}_frame_{frame_idx:06d}.jpg"
-            filepath = output_dir / filename
-
-            # Convert to PIL and save
-            pil_image = Image.fromarray(frame.image)
-            pil_image.save(filepath, quality=95, optimize=True)
-            return filepath
-
         # Use ThreadPoolExecutor for I/O bound operations
         with ThreadPoolExecutor(max_workers=self.config.parallel_workers) as executor:
-            frame_data = [(frame, i) for i, frame in enumerate(frames)]
-            saved_files = list(executor.map(save_frame, frame_data))
+            saved_files = list(executor.map(
+                lambda item: self._save_image(Image.fromarray(item[1].image), output_dir, video_name, item[0]),
+                enumerate(frames)
+            ))
 
         self.logger.info(f"💾 Saved {len(saved_files)} frames to {output_dir}")
 
     def process_multiple_videos(self, video_paths: List[Path],
                                detector=None,
-                               output_base_dir: Optional[Path] = None) -> Dict:
+                               output_base_dir: Optional[Path] = None,
+                               model_path: Optional[str] = None) -> Dict:
         """
         Process multiple videos in parallel.
 
         Args:
             video_paths: List of video file paths
-            detector: Detection model (optional)
+            detector: Detection model (optional, shared across threads)
             output_base_dir: Base directory for outputs (optional)
+            model_path: Model each worker process loads once (optional)
 
         Returns:
             Dictionary with processing results for all videos
         """
-        self.logger.info(f"🎬 Processing {len(video_paths)} videos in parallel")
-
-        def process_single_video(video_path):
-            output_dir = None
-            if output_base_dir:
-                output_dir = output_base_dir / video_path.stem
-
-            return self.process_video_optimized(video_path, detector, output_dir)
+        return dict(self.iter_process_videos(video_paths, detector, output_base_dir, model_path))
 
-        # Use ProcessPoolExecutor for CPU-intensive tasks
-        results = {}
-        with ProcessPoolExecutor(max_workers=self.config.parallel_workers) as executor:
-            future_to_path = {
-                executor.submit(process_single_video, path): path
-                for path in video_paths
-            }
+    def iter_process_videos(self, video_paths: List[Path],
+                            detector=None,
+                            output_base_dir: Optional[Path] = None,
+                            model_path: Optional[str] = None) -> Iterator[tuple]:
+        """
+        Process multiple videos, yielding ``(path, result)`` as each finishes.
 
-            for future in future_to_path:
+        In ``process`` mode each worker loads ``model_path`` once through
+        ``ModelCache`` and caps its torch/OpenCV threads at ``worker_threads``.
+        A ``detector`` instance cannot cross processes, so passing one without
+        ``model_path`` uses threads instead. ``shared_decode`` mode decodes in
+        worker processes and detects here (see ``_iter_shared_decode``).
+        """
+        if self.config.multi_video_mode == "shared_decode":
+            if detector is None and model_path:
+                detector = _load_detector(model_path, self.config)
+            yield from self._iter_shared_decode([Path(path) for path in video_paths], detector)
+            return
+
+        use_processes = self.config.multi_video_mode == "process" and (model_path or detector is None)
+        mode = "process" if use_processes else "thread"
+        self.logger.info(f"🎬 Processing {len(video_paths)} videos in parallel ({mode} pool, "
+                         f"{self.config.parallel_workers} workers)")
+
+        paths = [Path(path) for path in video_paths]
+        if use_processes:
+            executor = ProcessPoolExecutor(
+                max_workers=self.config.parallel_workers,
+                mp_context=mp.get_context(self.config.worker_start_method),
+                initializer=_init_video_worker,
+                initargs=(self.config, model_path),
+            )
+        else:
+            executor = ThreadPoolExecutor(max_workers=self.config.parallel_workers)
+
+        with executor:
+            future_to_path = {}
+            for video_path in paths:
+                output_dir = output_base_dir / video_path.stem if output_base_dir else None
+                if use_processes:
+                    future = executor.submit(_process_video_in_worker, video_path, output_dir)
+                else:
+                    future = executor.submit(self.process_video_optimized, video_path, detector, output_dir)
+                future_to_path[future] = video_path
+
+            for future in as_completed(future_to_path):
                 video_path = future_to_path[future]
                 try:
                     result = future.result()
-                    results[str(video_path)] = result
+                    self.logger.info(f"✅ Finished {video_path.name}")
                 except Exception as e:
                     self.logger.error(f"❌ Error processing {video_path}: {e}")
-                    results[str(video_path)] = {'error': str(e)}
+                    result = {'error': str(e)}
+                yield str(video_path), result
 
-        return results
+    def _iter_shared_decode(self, video_paths: List[Path], detector=None) -> Iterator[tuple]:
+        """
+        Decode videos in worker processes and detect in this one.
+
+        Workers write letterboxed frames into a ``SharedFrameRing`` and send
+        only slot indices and frame metadata back, so pixels are never
+        pickled. Frames are detected in batches straight from the shared
+        slots, which are then recycled; workers block when all slots are busy.
+        """
+        size = self.config.inference_size
+        if not size:
+            raise ValidationError("shared_decode mode needs inference_size for fixed-shape frame slots")
+
+        context = mp.get_context(self.config.worker_start_method)
+        ring = SharedFrameRing(self.config.shared_ring_slots, (size, size, 3), context=context)
+        messages = context.Queue()
+        videos = {str(path): {'detections': [], 'frames': 0, 'start': time.time()} for path in video_paths}
+        self.logger.info(f"🎬 Decoding {len(video_paths)} videos in {self.config.parallel_workers} processes "
+                         f"into {ring.slots} shared frame slots")
+
+        try:
+            with ProcessPoolExecutor(
+                max_workers=self.config.parallel_workers,
+                mp_context=context,
+                initializer=_init_decode_worker,
+                initargs=(self.config, ring.handle(), messages),
+            ) as executor:
+                futures = [executor.submit(_decode_video_to_ring, str(path)) for path in video_paths]
+                try:
+                    yield from self._consume_shared_decode(futures, messages, ring, detector, videos)
+                except BaseException:
+                    # Free the slots of frames still queued so blocked workers can
+                    # finish, otherwise leaving the pool would wait on them forever
+                    for future in futures:
+                        future.cancel()
+                    _drain_ring_messages(messages, ring, futures)
+                    raise
+        finally:
+            ring.close()
+
+    def _consume_shared_decode(self, futures: List[Any], messages: Any, ring: SharedFrameRing, detector,
+                               videos: Dict[str, Dict]) -> Iterator[tuple]:
+        """Detect frames announced by the decode workers and yield each video's result."""
+        size = self.config.inference_size
+        remaining = len(futures)
+        batch = []
+        batch_size = max(1, min(self.config.batch_size, ring.slots))
+
+        while remaining:
+            try:
+                message = messages.get(timeout=1.0)
+            except queue.Empty:
+                message = None
+
+            if message is None:
+                self._detect_shared_batch(batch, ring, detector, videos)
+                batch = []
+                failed = next((future for future in futures if future.done() and future.exception()), None)
+                if failed is not None:
+                    raise failed.exception()
+                continue
+
+            kind, video = message[0], message[1]
+            if kind == 'frame':
+                _, _, slot, shape, frame = message
+                frame.model_image = ring.view(slot, shape)
+                batch.append((video, slot, frame))
+                if len(batch) >= batch_size or messages.empty():
+                    self._detect_shared_batch(batch, ring, detector, videos)
+                    batch = []
+                continue
+
+            # Finish this video's frames before reporting it
+            self._detect_shared_batch(batch, ring, detector, videos)
+            batch = []
+            remaining -= 1
+            state = videos[video]
+            if kind == 'error':
+                self.logger.error(f"❌ Error processing {video}: {message[2]}")
+                yield video, {'error': message[2]}
+                continue
+
+            info = message[2]
+            processing_time = time.time() - state['start']
+            self.logger.info(f"✅ Finished {Path(video).name}")
+            yield video, {
+                'video_path': video,
+                **info,
+                'frames_extracted': state['frames'],
+                'sampling_strategy': self.config.sampling_strategy,
+                'inference_size': size,
+                'detector_calls': state['frames'] if detector else 0,
+                'detections': state['detections'],
+                'processing_time': processing_time,
+                'fps_processed': state['frames'] / processing_time if processing_time > 0 else 0,
+                'multi_video_mode': 'shared_decode',
+            }
+
+    def _detect_shared_batch(self, batch: List[tuple], ring: SharedFrameRing, detector,
+                             videos: Dict[str, Dict]) -> None:
+        """Detect frames read from shared slots, grouped per video, then recycle the slots."""
+        by_video: Dict[str, List[VideoFrame]] = {}
+        for video, _slot, frame in batch:
+            by_video.setdefault(video, []).append(frame)
+
+        try:
+            for video, frames in by_video.items():
+                videos[video]['frames'] += len(frames)
+                if detector:
+                    videos[video]['detections'].extend(self._detect_frames(frames, [None] * len(frames), detector))
+        finally:
+            for _video, slot, frame in batch:
+                frame.model_image = None  # drop the view before the slot is reused
+                ring.release(slot)
 
     def get_video_info(self, video_path: Path) -> Dict:
         """Get detailed video information."""
@@ -462,13 +997,13 @@ class OptimizedVideoProcessor(BaseProcessor):
 
             info = {
                 'path': str(video_path),
-                'duration': float(video_stream.duration * video_stream.time_base),
-                'fps': float(video_stream.rate),
+                'duration': _stream_duration(container, video_stream),
+                'fps': _stream_fps(video_stream),
                 'width': video_stream.width,
                 'height': video_stream.height,
-                'codec': video_stream.codec.name,
+                'codec': video_stream.codec_context.name,
                 'bitrate': video_stream.bit_rate,
-                'total_frames': int(video_stream.duration * video_stream.rate),
+                'total_frames': int(_stream_duration(container, video_stream) * _stream_fps(video_stream)),
                 'file_size': video_path.stat().st_size,
                 'gpu_decoding_supported': self.gpu_available
             }
@@ -481,6 +1016,100 @@ class OptimizedVideoProcessor(BaseProcessor):
             return {'error': str(e)}
 
 
+# Per-process state for multi-video workers, set up by _init_video_worker
+_worker_state: Dict[str, Any] = {}
+
+
+def _cap_library_threads(threads: int) -> None:
+    """Limit intra-op threads so N worker processes don't oversubscribe the CPU."""
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[var] = str(threads)
+    cv2.setNumThreads(threads)
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except Exception:
+        pass
+
+
+def _load_detector(model_path: str, config: VideoProcessingConfig) -> YOLODetector:
+    """YOLODetector backed by a warm model from ModelCache."""
+    detector = YOLODetector(model_path)
+    detector.model = ModelCache(config.model_cache_dir).get_model(model_path, config.model_device)
+    return detector
+
+
+def _init_video_worker(config: VideoProcessingConfig, model_path: Optional[str] = None) -> None:
+    """Process-pool initializer: cap threads and load a warm model once per worker."""
+    _cap_library_threads(config.worker_threads)
+    _worker_state['processor'] = OptimizedVideoProcessor(config)
+    _worker_state['detector'] = _load_detector(model_path, config) if model_path else None
+
+
+def _init_decode_worker(config: VideoProcessingConfig, ring_handle, messages) -> None:
+    """Process-pool initializer for shared_decode: attach to the frame ring."""
+    _cap_library_threads(config.worker_threads)
+    _worker_state['processor'] = OptimizedVideoProcessor(config)
+    _worker_state['ring'] = SharedFrameRing.attach(ring_handle)
+    _worker_state['messages'] = messages
+
+
+def _decode_video_to_ring(video_path: str) -> None:
+    """Decode one video's sampled frames into shared slots, announcing each on the message queue."""
+    processor = _worker_state['processor']
+    ring = _worker_state['ring']
+    messages = _worker_state['messages']
+
+    try:
+        with av.open(video_path) as container:
+            video_stream = container.streams.video[0]
+            duration, fps, total_frames, frame_interval, target_frames = processor._sampling_plan(
+                container, video_stream
+            )
+            decode_stats = {'decoded': 0}
+            for frame in processor._iter_frames(container, video_stream, frame_interval, target_frames,
+                                                decode_stats, keep_full_resolution=False):
+                slot = ring.acquire()
+                try:
+                    shape = ring.write(slot, frame.model_image)
+                except BaseException:
+                    ring.release(slot)  # never announced, so the consumer cannot free it
+                    raise
+                frame.model_image = None  # pixels travel through the ring, not the queue
+                messages.put(('frame', video_path, slot, shape, frame))
+
+        messages.put(('done', video_path, {
+            'duration': duration,
+            'fps': fps,
+            'total_frames': total_frames,
+            'frames_decoded': decode_stats['decoded'],
+        }))
+    except Exception as e:
+        messages.put(('error', video_path, str(e)))
+
+
+def _drain_ring_messages(messages: Any, ring: SharedFrameRing, futures: List[Any]) -> None:
+    """Release the slots of announced frames until every decode task has stopped."""
+    while True:
+        try:
+            message = messages.get(timeout=0.1)
+        except queue.Empty:
+            if all(future.done() for future in futures):
+                return
+            continue
+        if message[0] == 'frame':
+            ring.release(message[2])
+
+
+def _process_video_in_worker(video_path: Path, output_dir: Optional[Path] = None) -> Dict:
+    """Process one video with the worker's processor and warm detector."""
+    result = _worker_state['processor'].process_video_optimized(
+        video_path, _worker_state['detector'], output_dir
+    )
+    result['worker_pid'] = os.getpid()
+    return result
+
+
 def main():
     """Test the optimized video processor."""
     import argparse
@@ -493,6 +1122,12 @@ def main():
     parser.add_argument("--batch-size", type=int, default=32, help="Batch size for processing")
     parser.add_argument("--gpu", action="store_true", help="Enable GPU decoding")
     parser.add_argument("--workers", type=int, help="Number of parallel workers")
+    parser.add_argument("--sampling", choices=["sequential", "seek", "keyframe", "adaptive"], default="sequential",
+                        help="Frame sampling strategy")
+    parser.add_argument("--benchmark", action="store_true", help="Compare sampling strategies and exit")
+    parser.add_argument("--inference-size", type=int, help="Letterbox frames to this model input size")
+    parser.add_argument("--frame-budget", type=int, default=32, help="Frames per video for adaptive sampling")
+    parser.add_argument("--track-every", type=int, help="Tracker mode: run the detector every N sampled frames")
 
     args = parser.parse_args()
 
@@ -502,12 +1137,24 @@ def main():
         max_frames=args.max_frames,
         batch_size=args.batch_size,
         use_gpu_decoding=args.gpu,
-        parallel_workers=args.workers
+        parallel_workers=args.workers,
+        sampling_strategy=args.sampling,
+        inference_size=args.inference_size,
+        frame_budget=args.frame_budget,
+        tracker=TrackerConfig(detect_every=args.track_every) if args.track_every else None
     )
 
     # Create processor
     processor = OptimizedVideoProcessor(config)
 
+    if args.benchmark:
+        results = processor.benchmark_sampling(Path(args.video_path))
+        print("\n📊 Sampling benchmark:")
+        for strategy, stats in results.items():
+            print(f"  {strategy:>10}: {stats['frames_sampled']} sampled, {stats['frames_decoded']} decoded, "
+                  f"{stats['seconds']:.2f}s ({stats['sampled_fps']:.1f} sampled fps)")
+        return
+
     # Process video
     video_path = Path(args.video_path)
     output_dir = Path(args.output) if args.output else None
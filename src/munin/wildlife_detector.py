@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, List, Any
 from pathlib import Path
 
@@ -18,6 +19,7 @@ class Detection:
     label: str
     confidence: float
     bbox: list[float] | None = None  # [x1,y1,x2,y2] in pixels
+    track_id: int | None = None  # set in video tracker mode
 
     def to_detection_result(self) -> DetectionResult:
         """Convert to DetectionResult."""
@@ -29,16 +31,94 @@ class Detection:
             metadata={"original_detection": True}
         )
 
+
+@dataclass
+class CascadeConfig:
+    """Resolution cascade: cheap low-res pass, escalate to full res only when needed."""
+    enabled: bool = False
+    low_imgsz: int = 640
+    high_imgsz: int = 1280
+    candidate_conf: float = 0.1  # low-res pass keeps weak candidates to decide on escalation
+    escalate_below_conf: float = 0.5  # any candidate below this confidence escalates
+    escalate_below_rel_area: float = 0.01  # any candidate smaller than this (box/frame) escalates
+    full_res_frame_seconds: float | None = None  # full-res cost per frame for the time-saved estimate
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> CascadeConfig:
+        """Create from stage configuration."""
+        return cls(**{k: v for k, v in data.items() if k in cls.__dataclass_fields__})
+
+
+@dataclass
+class CascadeStats:
+    """Escalation rate and timing of the resolution cascade."""
+    frames: int = 0
+    escalated: int = 0
+    low_pass_seconds: float = 0.0
+    high_pass_seconds: float = 0.0
+    escalation_reasons: dict[str, int] = field(default_factory=dict)
+
+    def reset(self) -> None:
+        self.frames = 0
+        self.escalated = 0
+        self.low_pass_seconds = 0.0
+        self.high_pass_seconds = 0.0
+        self.escalation_reasons = {}
+
+    def to_dict(self, config: CascadeConfig | None = None) -> dict[str, Any]:
+        """Summary for the run report.
+
+        Time saved is estimated against running every frame at full resolution.
+        The full-resolution cost per frame is the measured time of escalated
+        frames; without escalations it is ``config.full_res_frame_seconds``, or
+        the low-res time scaled by the pixel ratio of the two input sizes.
+        """
+        config = config or CascadeConfig()
+        full_res_frame_seconds = None
+        full_res_cost_source = None
+        if self.escalated:
+            full_res_frame_seconds = self.high_pass_seconds / self.escalated
+            full_res_cost_source = "measured"
+        elif config.full_res_frame_seconds is not None:
+            full_res_frame_seconds = config.full_res_frame_seconds
+            full_res_cost_source = "configured"
+        elif self.frames:
+            pixel_ratio = (config.high_imgsz / config.low_imgsz) ** 2
+            full_res_frame_seconds = self.low_pass_seconds / self.frames * pixel_ratio
+            full_res_cost_source = "scaled_low_res"
+
+        estimated_full_res = None
+        time_saved = None
+        if full_res_frame_seconds is not None:
+            estimated_full_res = full_res_frame_seconds * self.frames
+            time_saved = estimated_full_res - (self.low_pass_seconds + self.high_pass_seconds)
+
+        return {
+            'frames': self.frames,
+            'escalated': self.escalated,
+            'escalation_rate': self.escalated / self.frames if self.frames else 0.0,
+            'escalation_reasons': dict(self.escalation_reasons),
+            'low_pass_seconds': self.low_pass_seconds,
+            'high_pass_seconds': self.high_pass_seconds,
+            'full_res_cost_source': full_res_cost_source,
+            'estimated_full_res_seconds': estimated_full_res,
+            'estimated_time_saved_seconds': time_saved,
+        }
+
+
 class YOLODetector(BaseDetector):
     """
     Ultralytics YOLO detector adapter.
     Works with object detection models (.pt). For wildlife,
     plug in your custom model path trained on deer/boar/elk/etc.
     """
-    def __init__(self, model_path: str, conf: float = 0.35, iou: float = 0.5, **kwargs):
+    def __init__(self, model_path: str, conf: float = 0.35, iou: float = 0.5,
+                 cascade: CascadeConfig | None = None, **kwargs):
         super().__init__(model_path=model_path, **kwargs)
         self.conf = conf
         self.iou = iou
+        self.cascade = cascade or CascadeConfig()
+        self.cascade_stats = CascadeStats()
         self.logger = get_logger(self.__class__.__name__)
 
         # Validate parameters
@@ -91,7 +171,7 @@ class YOLODetector(BaseDetector):
                     source=str(image_path),
                     conf=self.conf,
                     iou=self.iou,
-                    imgsz=1280,
+                    imgsz=self.cascade.high_imgsz,
                     verbose=False
                 )
 
@@ -137,25 +217,72 @@ class YOLODetector(BaseDetector):
 
         return detections
 
-    def predict(self, image_path: Path) -> list[Detection]:
+    def predict(self, image_path: Path | Any) -> list[Detection]:
+        """Detect objects, using the resolution cascade when enabled.
+
+        Args:
+            image_path: Image path, PIL Image or numpy array
+        """
+        source = str(image_path) if isinstance(image_path, (str, Path)) else image_path
+
+        if not self.cascade.enabled:
+            dets, _ = self._predict_at(source, imgsz=self.cascade.high_imgsz, conf=self.conf)
+            return dets
+
+        # Cheap low-resolution pass, keeping weak candidates
+        start = time.perf_counter()
+        candidates, orig_shape = self._predict_at(
+            source, imgsz=self.cascade.low_imgsz, conf=min(self.conf, self.cascade.candidate_conf)
+        )
+        self.cascade_stats.low_pass_seconds += time.perf_counter() - start
+        self.cascade_stats.frames += 1
+
+        reason = self._escalation_reason(candidates, orig_shape)
+        if reason is None:
+            return [d for d in candidates if d.confidence >= self.conf]
+
+        # Full-resolution pass only for ambiguous frames
+        self.cascade_stats.escalated += 1
+        self.cascade_stats.escalation_reasons[reason] = self.cascade_stats.escalation_reasons.get(reason, 0) + 1
+        start = time.perf_counter()
+        dets, _ = self._predict_at(source, imgsz=self.cascade.high_imgsz, conf=self.conf)
+        self.cascade_stats.high_pass_seconds += time.perf_counter() - start
+        return dets
+
+    def _escalation_reason(self, candidates: list[Detection], orig_shape: tuple[int, int] | None) -> str | None:
+        """Return why a frame needs the full-resolution pass, or None if the low-res result stands."""
+        frame_area = orig_shape[0] * orig_shape[1] if orig_shape else None
+
+        for det in candidates:
+            if det.confidence < self.cascade.escalate_below_conf:
+                return "low_confidence"
+            if frame_area and det.bbox:
+                x1, y1, x2, y2 = det.bbox
+                if (x2 - x1) * (y2 - y1) / frame_area < self.cascade.escalate_below_rel_area:
+                    return "small_object"
+        return None
+
+    def _predict_at(self, source: Any, imgsz: int, conf: float) -> tuple[list[Detection], tuple[int, int] | None]:
+        """Run a single prediction pass at the given resolution."""
         results = self.model.predict(
-            source=str(image_path),
-            conf=self.conf,
+            source=source,
+            conf=conf,
             iou=self.iou,
-            imgsz=1280,
+            imgsz=imgsz,
             verbose=False
         )
         dets: list[Detection] = []
         if not results:
-            return dets
+            return dets, None
         r = results[0]
+        orig_shape = tuple(r.orig_shape) if getattr(r, 'orig_shape', None) is not None else None
         names = r.names  # class id -> label
         if r.boxes is None:
-            return dets
+            return dets, orig_shape
         for b in r.boxes:
             cls_id = int(b.cls.item())
             label = names.get(cls_id, str(cls_id))
             conf = float(b.conf.item())
             xyxy = [float(v) for v in b.xyxy[0].tolist()]
             dets.append(Detection(label=label, confidence=conf, bbox=xyxy))
-        return dets
+        return dets, orig_shape
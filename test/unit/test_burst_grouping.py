@@ -0,0 +1,133 @@
+"""
+Unit tests for burst grouping and representative-frame detection.
+"""
+
+import io
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+from PIL import Image
+
+from src.munin.burst_grouping import (
+    BurstConfig,
+    FrameSignature,
+    dhash,
+    frame_signature,
+    group_bursts,
+    hamming,
+)
+from src.munin.cloud.interfaces import StorageLocation
+from src.munin.cloud.runners import LocalRunner
+from src.munin.cloud.storage import LocalFSAdapter
+from src.munin.wildlife_detector import Detection
+
+T0 = datetime(2024, 6, 1, 5, 30, 0)
+
+
+def _scene(seed):
+    rng = np.random.default_rng(seed)
+    return Image.fromarray(rng.integers(0, 255, (48, 64), dtype=np.uint8)).resize((160, 120)).convert("RGB")
+
+
+def _jpeg_with_time(image, timestamp):
+    exif = Image.Exif()
+    exif[0x0132] = timestamp.strftime("%Y:%m:%d %H:%M:%S")  # DateTime
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", exif=exif)
+    return buffer.getvalue()
+
+
+def _signature(name, seconds, frame_hash, camera_id="cam1"):
+    return FrameSignature(key=name, camera_id=camera_id, timestamp=T0 + timedelta(seconds=seconds),
+                          dhash=frame_hash, sort_key=name)
+
+
+class TestBurstGrouping:
+    """Test hashing and grouping."""
+
+    def test_dhash_is_stable_under_small_changes(self):
+        scene = _scene(1)
+        brighter = Image.eval(scene, lambda v: min(255, v + 10))
+        assert hamming(dhash(scene), dhash(brighter)) <= 4
+        assert hamming(dhash(scene), dhash(_scene(2))) > 12
+
+    def test_groups_by_gap_hash_and_camera(self):
+        frames = [
+            _signature("a", 0, 0b1111),
+            _signature("b", 2, 0b1110),
+            _signature("c", 4, 0b1111),
+            _signature("d", 60, 0b1111),  # gap too large
+            _signature("e", 61, (1 << 40) - 1),  # hash too far
+            _signature("f", 1, 0b1111, camera_id="cam2"),
+        ]
+        bursts = group_bursts(frames, BurstConfig(enabled=True))
+
+        assert [[f.key for f in burst.frames] for burst in bursts] == [["a", "b", "c"], ["d"], ["e"], ["f"]]
+        assert bursts[0].representative.key == "b"
+        assert [f.key for f in bursts[0].others] == ["a", "c"]
+
+    def test_frame_signature_reads_exif_time(self):
+        signature = frame_signature(_jpeg_with_time(_scene(1), T0), "k", "cam1")
+        assert signature.timestamp.replace(tzinfo=None) == T0
+
+    def test_header_without_thumbnail_fetches_full_image(self):
+        """A header without an EXIF thumbnail falls back to a draft decode of the whole image."""
+        content = _jpeg_with_time(_scene(1), T0)
+        fetch = MagicMock(return_value=content)
+
+        signature = frame_signature(content[:1024], "k", "cam1", fetch=fetch)
+
+        fetch.assert_called_once_with()
+        assert signature.timestamp.replace(tzinfo=None) == T0
+        assert signature.dhash == frame_signature(content, "k", "cam1").dhash
+
+
+class TestRunnerBursts:
+    """Test representative-frame detection in run_stage1."""
+
+    def _run(self, tmp_path, detections, **stage_config):
+        storage = LocalFSAdapter(base_path=str(tmp_path / "data"))
+        for i in range(3):
+            storage.put(StorageLocation.from_url(f"file://input/cam1/img{i}.jpg"),
+                        _jpeg_with_time(_scene(1), T0 + timedelta(seconds=i)))
+
+        detector = MagicMock(spec=["predict"])
+        detector.predict.return_value = detections
+        provider = MagicMock()
+        provider.load_model.return_value = detector
+
+        runner = LocalRunner(storage, provider)
+        config = {"stage1_model": "detector.pt", "burst": {"enabled": True}, **stage_config}
+        return runner.run_stage1("file://input/cam1", "file://out", config), detector
+
+    def test_empty_representative_propagates(self, tmp_path):
+        manifest, detector = self._run(tmp_path, [])
+
+        assert detector.predict.call_count == 1
+        assert len(manifest) == 2
+        assert all(entry.inference == "propagated" and entry.observation_any is False for entry in manifest)
+        assert len({entry.burst_id for entry in manifest}) == 1
+
+    def test_detection_processes_whole_burst(self, tmp_path):
+        manifest, detector = self._run(tmp_path, [Detection(label="moose", confidence=0.9, bbox=[0, 0, 40, 40])])
+
+        assert detector.predict.call_count == 3
+        assert len(manifest) == 3
+        assert all(entry.inference == "inferred" for entry in manifest)
+
+    def test_planning_reads_headers_only(self, tmp_path):
+        """Burst planning uses ranged header reads; only the representative is read in full."""
+        with patch.object(LocalFSAdapter, "get_view", autospec=True, side_effect=LocalFSAdapter.get_view) as get_view:
+            self._run(tmp_path, [])
+
+        assert [call.args[1].path for call in get_view.call_args_list] == ["input/cam1/img1.jpg"]
+
+    def test_burst_members_skip_prefilter(self, tmp_path):
+        """Only representatives update the prefilter background, so it stays in capture order."""
+        detection = Detection(label="moose", confidence=0.9, bbox=[0, 0, 40, 40])
+        manifest, detector = self._run(tmp_path, [detection], prefilter={"enabled": True})
+
+        assert detector.predict.call_count == 3
+        scored = {entry.source_path.rsplit("/", 1)[-1]: entry.motion_score is not None for entry in manifest}
+        assert scored == {"img0.jpg": False, "img1.jpg": True, "img2.jpg": False}
@@ -0,0 +1,121 @@
+"""
+Unit tests for checkpointed, resumable runs.
+"""
+
+import io
+from unittest.mock import MagicMock
+
+import pytest
+from PIL import Image
+
+from src.munin.classification_engine import ClsResult
+from src.munin.cloud.checkpoint import RunCheckpoint
+from src.munin.cloud.interfaces import StorageLocation
+from src.munin.cloud.runners import LocalRunner
+from src.munin.cloud.storage import LocalFSAdapter
+from src.munin.wildlife_detector import Detection
+
+
+def _jpeg_bytes(color, size=(64, 48)):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color=color).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+class CrashingModel:
+    """Detector/classifier that is interrupted after a number of calls."""
+
+    def __init__(self, result, crash_after=None):
+        self.result = result
+        self.crash_after = crash_after
+        self.calls = 0
+
+    def predict(self, image):
+        if self.crash_after is not None and self.calls >= self.crash_after:
+            raise KeyboardInterrupt  # stands in for a killed process
+        self.calls += 1
+        return self.result
+
+
+def _checkpoint_files(storage, stage):
+    return storage.list(StorageLocation.from_url(f"file://out/{stage}/checkpoint"), "shard-*")
+
+
+@pytest.fixture
+def storage(tmp_path):
+    storage = LocalFSAdapter(base_path=str(tmp_path / "data"))
+    for i in range(7):
+        storage.put(StorageLocation.from_url(f"file://input/cam1/img{i}.jpg"), _jpeg_bytes((i * 30, 90, 60)))
+    return storage
+
+
+def _runner(storage, model):
+    provider = MagicMock()
+    provider.load_model.return_value = model
+    return LocalRunner(storage, provider, max_workers=2)
+
+
+class TestRunCheckpoint:
+    """Test shard and marker bookkeeping."""
+
+    def test_round_trip(self, storage):
+        checkpoint = RunCheckpoint(storage, "file://out/stage1/checkpoint", "abc", every=2)
+        checkpoint.write_shard([{"n": 1}, {"n": 2}], ["a", "b"])
+        checkpoint.write_shard([], ["c"])
+
+        resumed = RunCheckpoint(storage, "file://out/stage1/checkpoint", "abc")
+        rows, done = resumed.load()
+        assert rows == [{"n": 1}, {"n": 2}]
+        assert done == {"a", "b", "c"}
+        assert resumed.to_dict() == {"shards": 2, "resumed_inputs": 3}
+
+    def test_other_run_is_discarded(self, storage):
+        RunCheckpoint(storage, "file://out/stage1/checkpoint", "abc").write_shard([{"n": 1}], ["a"])
+
+        assert RunCheckpoint(storage, "file://out/stage1/checkpoint", "def").load() == ([], set())
+        assert _checkpoint_files(storage, "stage1") == []
+
+    def test_shard_without_marker_is_ignored(self, storage):
+        storage.put(StorageLocation.from_url("file://out/stage1/checkpoint/shard-00000.jsonl"), b'{"n": 1}')
+
+        assert RunCheckpoint(storage, "file://out/stage1/checkpoint", "abc").load() == ([], set())
+
+    def test_chunks(self, storage):
+        checkpoint = RunCheckpoint(storage, "file://out/stage1/checkpoint", "abc", every=3)
+        assert list(checkpoint.chunks([2, 1, 1, 5, 1], size_of=lambda n: n)) == [[2, 1], [1, 5], [1]]
+
+
+class TestResume:
+    """Test that an interrupted run resumes with only the remaining work."""
+
+    config = {"stage1_model": "det.pt", "stage2_model": "cls.pt", "checkpoint_every": 2, "batch_size": 1}
+
+    def test_stage1_resumes_after_crash(self, storage):
+        detection = [Detection(label="moose", confidence=0.9, bbox=[0, 0, 32, 24])]
+        with pytest.raises(KeyboardInterrupt):
+            _runner(storage, CrashingModel(detection, crash_after=5)).run_stage1(
+                "file://input/cam1", "file://out", self.config)
+        assert len(_checkpoint_files(storage, "stage1")) == 4  # two shards, two markers
+
+        detector = CrashingModel(detection)
+        manifest = _runner(storage, detector).run_stage1("file://input/cam1", "file://out", self.config)
+
+        assert detector.calls == 3
+        assert [entry.source_path.rsplit("/", 1)[-1] for entry in manifest] == [f"img{i}.jpg" for i in range(7)]
+        assert _checkpoint_files(storage, "stage1") == []
+
+    def test_stage2_resumes_after_crash(self, storage):
+        detection = [Detection(label="moose", confidence=0.9, bbox=[0, 0, 32, 24])]
+        manifest = _runner(storage, CrashingModel(detection)).run_stage1("file://input/cam1", "file://out",
+                                                                        self.config)
+
+        prediction = ClsResult(label="moose", confidence=0.95)
+        with pytest.raises(KeyboardInterrupt):
+            _runner(storage, CrashingModel(prediction, crash_after=4)).run_stage2(manifest, "file://out", self.config)
+
+        classifier = CrashingModel(prediction)
+        predictions = _runner(storage, classifier).run_stage2(manifest, "file://out", self.config)
+
+        assert classifier.calls == 3
+        assert [p.crop_path for p in predictions] == [entry.crop_path for entry in manifest]
+        assert _checkpoint_files(storage, "stage2") == []
@@ -0,0 +1,162 @@
+"""
+Unit tests for the Stage-1 resolution cascade.
+"""
+
+import io
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from PIL import Image
+
+from src.munin.cloud.interfaces import StorageLocation
+from src.munin.cloud.models import LocalModelProvider
+from src.munin.cloud.runners import LocalRunner
+from src.munin.cloud.storage import LocalFSAdapter
+from src.munin.wildlife_detector import CascadeConfig, CascadeStats, YOLODetector
+
+
+class _Scalar:
+    def __init__(self, value):
+        self.value = value
+
+    def item(self):
+        return self.value
+
+
+class _Coords:
+    def __init__(self, values):
+        self.values = values
+
+    def tolist(self):
+        return self.values
+
+
+def _result(boxes, shape=(1000, 1000)):
+    return SimpleNamespace(
+        names={0: "moose"},
+        orig_shape=shape,
+        boxes=[
+            SimpleNamespace(cls=_Scalar(0), conf=_Scalar(conf), xyxy=[_Coords(xyxy)])
+            for conf, xyxy in boxes
+        ],
+    )
+
+
+class FakeYOLO:
+    """Returns configured boxes per input resolution and records calls."""
+
+    def __init__(self, by_imgsz):
+        self.by_imgsz = by_imgsz
+        self.calls = []
+
+    def predict(self, source, conf, iou, imgsz, verbose):
+        self.calls.append(imgsz)
+        return [_result([b for b in self.by_imgsz[imgsz] if b[0] >= conf])]
+
+
+@pytest.fixture()
+def detector():
+    det = YOLODetector("model.pt", conf=0.35, cascade=CascadeConfig(enabled=True))
+    return det
+
+
+class TestResolutionCascade:
+    """Test escalation decisions and statistics."""
+
+    def test_empty_frame_is_not_escalated(self, detector):
+        detector.model = FakeYOLO({640: [], 1280: []})
+        assert detector.predict("frame.jpg") == []
+        assert detector.model.calls == [640]
+
+    def test_large_confident_animal_stays_low_res(self, detector):
+        detector.model = FakeYOLO({640: [(0.9, [100, 100, 600, 600])], 1280: []})
+        dets = detector.predict("frame.jpg")
+        assert [d.confidence for d in dets] == [0.9]
+        assert detector.model.calls == [640]
+
+    def test_low_confidence_candidate_escalates(self, detector):
+        detector.model = FakeYOLO({
+            640: [(0.9, [100, 100, 600, 600]), (0.2, [700, 700, 800, 800])],
+            1280: [(0.9, [100, 100, 600, 600]), (0.6, [700, 700, 800, 800])],
+        })
+        dets = detector.predict("frame.jpg")
+        assert [d.confidence for d in dets] == [0.9, 0.6]
+        assert detector.model.calls == [640, 1280]
+        assert detector.cascade_stats.escalation_reasons == {"low_confidence": 1}
+
+    def test_small_candidate_escalates(self, detector):
+        detector.model = FakeYOLO({640: [(0.8, [10, 10, 40, 40])], 1280: [(0.85, [10, 10, 40, 40])]})
+        detector.predict("frame.jpg")
+        assert detector.model.calls == [640, 1280]
+        assert detector.cascade_stats.escalation_reasons == {"small_object": 1}
+
+    def test_stats_report_escalation_rate(self, detector):
+        detector.model = FakeYOLO({640: [(0.8, [10, 10, 40, 40])], 1280: []})
+        detector.predict("a.jpg")
+        detector.model = FakeYOLO({640: [], 1280: []})
+        detector.predict("b.jpg")
+
+        stats = detector.cascade_stats.to_dict()
+        assert stats["frames"] == 2
+        assert stats["escalated"] == 1
+        assert stats["escalation_rate"] == 0.5
+        assert stats["estimated_time_saved_seconds"] is not None
+
+    def test_time_saved_without_escalations(self):
+        """With no escalations the saving comes from the configured or scaled full-res cost."""
+        stats = CascadeStats(frames=4, low_pass_seconds=0.4)
+
+        scaled = stats.to_dict(CascadeConfig(enabled=True, low_imgsz=640, high_imgsz=1280))
+        assert scaled["full_res_cost_source"] == "scaled_low_res"
+        assert scaled["estimated_full_res_seconds"] == pytest.approx(1.6)
+        assert scaled["estimated_time_saved_seconds"] == pytest.approx(1.2)
+
+        configured = stats.to_dict(CascadeConfig(enabled=True, full_res_frame_seconds=0.5))
+        assert configured["full_res_cost_source"] == "configured"
+        assert configured["estimated_time_saved_seconds"] == pytest.approx(1.6)
+
+    def test_cascade_disabled_runs_full_resolution(self):
+        detector = YOLODetector("model.pt", conf=0.35)
+        detector.model = FakeYOLO({1280: [(0.9, [0, 0, 10, 10])]})
+        assert len(detector.predict("frame.jpg")) == 1
+        assert detector.model.calls == [1280]
+
+
+class _UltralyticsDetector(FakeYOLO):
+    """Stands in for ``ultralytics.YOLO`` loading a detection model."""
+    task = "detect"
+
+    def __init__(self, model_path):
+        super().__init__({
+            640: [(0.2, [100, 100, 300, 300])],
+            1280: [(0.9, [100, 100, 300, 300])],
+        })
+
+
+class TestRunnerCascade:
+    """Test the cascade through the provider and runner used by the pipeline."""
+
+    def test_escalations_reach_run_report(self, tmp_path):
+        storage = LocalFSAdapter(base_path=str(tmp_path / "data"))
+        buffer = io.BytesIO()
+        Image.new("RGB", (400, 400), (90, 110, 70)).save(buffer, format="JPEG")
+        storage.put(StorageLocation.from_url("file://input/cam1/img0.jpg"), buffer.getvalue())
+
+        provider = LocalModelProvider(cache_path=f"file://{tmp_path / 'models'}")
+        runner = LocalRunner(storage, provider)
+        config = {"stage1_model": "detector.pt", "cascade": {"enabled": True}}
+        with patch("ultralytics.YOLO", _UltralyticsDetector):
+            manifest = runner.run_stage1("file://input/cam1", "file://out", config)
+
+        assert isinstance(provider.load_model("detector.pt"), YOLODetector)
+        assert [entry.det_score for entry in manifest] == [0.9]
+        report = json.loads(storage.get(StorageLocation.from_url("file://out/stage1/run_report.json")))
+        assert report["cascade"]["frames"] == 1
+        assert report["cascade"]["escalation_reasons"] == {"low_confidence": 1}
+
+    def test_unsupported_model_warns(self, caplog):
+        runner = LocalRunner(None, None)
+        runner._configure_cascade(object(), {"cascade": {"enabled": True}})
+        assert "Resolution cascade not applied" in caplog.text
@@ -0,0 +1,117 @@
+"""
+Unit tests for video tracker mode and track-based Stage-3 grouping.
+"""
+
+from unittest.mock import MagicMock
+
+import av
+import numpy as np
+import pytest
+
+from src.munin.cloud.interfaces import ManifestEntry, Stage2Entry
+from src.munin.cloud.stage3_reporting import Stage3Reporter
+from src.munin.frame_tracker import FrameTracker, TrackerConfig, iou
+from src.munin.video_processor import (
+    OptimizedVideoProcessor,
+    VideoFrame,
+    VideoProcessingConfig,
+)
+from src.munin.wildlife_detector import Detection
+
+BACKGROUND = np.random.default_rng(0).integers(60, 120, (240, 320, 3), dtype=np.uint8)
+TEXTURE = np.random.default_rng(1).integers(150, 255, (40, 60, 3), dtype=np.uint8)
+
+
+def _scene(x):
+    """Textured 60x40 block at (x, 100) on a static textured background."""
+    image = BACKGROUND.copy()
+    image[100:140, x:x + 60] = TEXTURE
+    return image
+
+
+def test_iou():
+    assert iou([0, 0, 10, 10], [0, 0, 10, 10]) == 1.0
+    assert iou([0, 0, 10, 10], [5, 0, 15, 10]) == pytest.approx(1 / 3)
+    assert iou([0, 0, 10, 10], [20, 20, 30, 30]) == 0.0
+
+
+def test_propagate_follows_motion_between_detections():
+    tracker = FrameTracker(TrackerConfig(flow_width=160))
+
+    first = tracker.update(_scene(50), (320, 240), [Detection("moose", 0.9, [50, 100, 110, 140])])
+    moved = [tracker.propagate(_scene(50 + 8 * step), (320, 240)) for step in range(1, 4)]
+
+    assert first[0].track_id == 1
+    assert [d[0].track_id for d in moved] == [1, 1, 1]
+    assert moved[-1][0].bbox == pytest.approx([74, 100, 134, 140], abs=3)
+
+
+def test_update_matches_tracks_by_iou_and_ends_stale_tracks():
+    tracker = FrameTracker(TrackerConfig(max_missed=0))
+    frame = _scene(50)
+
+    first = tracker.update(frame, (320, 240), [Detection("moose", 0.9, [50, 100, 110, 140]),
+                                               Detection("fox", 0.8, [200, 20, 240, 60])])
+    second = tracker.update(frame, (320, 240), [Detection("moose", 0.95, [52, 100, 112, 140]),
+                                                Detection("boar", 0.7, [0, 180, 40, 230])])
+
+    assert [d.track_id for d in first] == [1, 2]
+    assert [d.track_id for d in second] == [1, 3]
+    assert [t.track_id for t in tracker.tracks] == [1, 3]
+    assert tracker.stats() == {'tracks': 3, 'detected_frames': 4, 'tracked_frames': 0}
+
+
+def test_content_image_strips_letterbox_padding():
+    frame = VideoFrame(0, 0.0, None, 160, 120, "h264", "yuv420p",
+                       model_image=np.zeros((64, 64, 3), np.uint8), letterbox_scale=0.4, letterbox_pad=(0, 8))
+
+    assert frame.content_image.shape == (48, 64, 3)
+
+
+def test_tracker_mode_detects_every_nth_frame(tmp_path):
+    path = tmp_path / "still.mp4"
+    with av.open(str(path), mode="w") as container:
+        stream = container.add_stream("libx264", rate=10)
+        stream.width, stream.height, stream.pix_fmt = 320, 240, "yuv420p"
+        for _ in range(60):
+            for packet in stream.encode(av.VideoFrame.from_ndarray(_scene(50), format="rgb24")):
+                container.mux(packet)
+        for packet in stream.encode():
+            container.mux(packet)
+
+    processor = OptimizedVideoProcessor(VideoProcessingConfig(
+        sample_interval_seconds=0.5, batch_size=4, use_gpu_decoding=False, tracker=TrackerConfig(detect_every=3)
+    ))
+    detector = MagicMock(spec=["predict"])
+    detector.predict.side_effect = lambda image: [Detection("moose", 0.9, [50, 100, 110, 140])]
+
+    result = processor.process_video_optimized(path, detector)
+
+    assert result["frames_extracted"] == 12
+    assert result["detector_calls"] == detector.predict.call_count == 4
+    assert {d["track_id"] for d in result["frame_detections"]} == {1}
+    assert [d["inference"] for d in result["frame_detections"][:3]] == ["detected", "tracked", "tracked"]
+    assert result["tracking"]["tracks"] == 1
+
+
+def test_stage3_groups_tracked_detections_by_track():
+    def manifest(crop, second, track_id):
+        return ManifestEntry(source_path="clip.mp4", crop_path=crop, camera_id="cam1",
+                             timestamp=f"2024-06-01T05:30:{second:02d}", bbox={}, det_score=0.9,
+                             stage1_model="md", config_hash="h", track_id=track_id)
+
+    manifest_entries = [manifest(f"clip_frame_{i:06d}.jpg", i * 2, 1 if i < 5 else 2) for i in range(10)]
+    predictions = [Stage2Entry(crop_path=m.crop_path, label="moose", confidence=0.9, auto_ok=True,
+                               stage2_model="cls", stage1_model="md", config_hash="h") for m in manifest_entries]
+
+    reporter = Stage3Reporter(min_duration_seconds=1.0)
+
+    def compress():
+        grouped = reporter._group_observations_by_camera_species(predictions, manifest_entries)
+        return reporter._compress_observations_for_species("cam1", "moose", grouped[("cam1", "moose")])
+
+    assert [(o.track_id, o.frame_count) for o in compress()] == [(1, 5), (2, 5)]
+
+    for m in manifest_entries:
+        m.track_id = None
+    assert [(o.track_id, o.frame_count) for o in compress()] == [(None, 10)]
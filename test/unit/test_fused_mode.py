@@ -0,0 +1,141 @@
+"""
+Unit tests for the fused in-memory Stage-1/Stage-2 mode.
+"""
+
+import io
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from PIL import Image
+
+from src.munin.classification_engine import ClsResult
+from src.munin.cloud.interfaces import StorageLocation
+from src.munin.cloud.runners import LocalRunner
+from src.munin.cloud.storage import LocalFSAdapter
+from src.munin.wildlife_detector import Detection
+
+
+def _jpeg_bytes(color=(120, 90, 60), size=(64, 48)):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color=color).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+class AlternatingClassifier:
+    """Confident on every other crop, so half of the crops need review."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def predict_batch(self, crops):
+        results = []
+        for _ in crops:
+            confidence = 0.9 if self.calls % 2 == 0 else 0.2
+            results.append(ClsResult(label="moose", confidence=confidence))
+            self.calls += 1
+        return results
+
+
+def _runner(tmp_path, classifier):
+    storage = LocalFSAdapter(base_path=str(tmp_path / "data"))
+    storage.put(StorageLocation.from_url("file://input/cam1/img1.jpg"), _jpeg_bytes())
+    storage.put(StorageLocation.from_url("file://input/cam1/img2.jpg"), _jpeg_bytes((10, 20, 30)))
+
+    detector = MagicMock(spec=["predict"])
+    detector.predict.return_value = [
+        Detection(label="animal", confidence=0.9, bbox=[0, 0, 30, 30]),
+        Detection(label="animal", confidence=0.8, bbox=[30, 10, 60, 40]),
+    ]
+
+    provider = MagicMock()
+    provider.load_model.side_effect = lambda path: detector if path == "detector.pt" else classifier
+    return storage, LocalRunner(storage, provider)
+
+
+class TestFusedMode:
+    """Test run_fused."""
+
+    stage1_config = {"stage1_model": "detector.pt", "conf_threshold": 0.3}
+    stage2_config = {"stage2_model": "classifier.pt", "conf_threshold": 0.5, "batch_size": 3}
+
+    def test_writes_manifest_and_predictions_in_one_pass(self, tmp_path):
+        classifier = AlternatingClassifier()
+        storage, runner = _runner(tmp_path, classifier)
+
+        manifest, predictions = runner.run_fused("file://input/cam1", "file://out",
+                                                 self.stage1_config, self.stage2_config)
+
+        assert len(manifest) == 4
+        assert [p.crop_path for p in predictions] == [m.crop_path for m in manifest]
+        assert classifier.calls == 4
+
+        manifest_lines = storage.get(StorageLocation.from_url("file://out/stage1/manifest.jsonl")).splitlines()
+        prediction_lines = storage.get(StorageLocation.from_url("file://out/stage2/predictions.jsonl")).splitlines()
+        assert len(manifest_lines) == 4
+        assert len(prediction_lines) == 4
+
+        report = json.loads(storage.get(StorageLocation.from_url("file://out/run_report.json")))
+        assert report["crops"] == 4
+        assert report["crops_saved"] == 2
+
+    def test_only_review_crops_are_persisted(self, tmp_path):
+        storage, runner = _runner(tmp_path, AlternatingClassifier())
+
+        _, predictions = runner.run_fused("file://input/cam1", "file://out",
+                                          self.stage1_config, self.stage2_config)
+
+        for prediction in predictions:
+            saved = storage.exists(StorageLocation.from_url(prediction.crop_path))
+            assert saved == (not prediction.auto_ok)
+
+    def test_save_crops_persists_everything(self, tmp_path):
+        storage, runner = _runner(tmp_path, AlternatingClassifier())
+
+        _, predictions = runner.run_fused("file://input/cam1", "file://out",
+                                          self.stage1_config, self.stage2_config, save_crops=True)
+
+        assert all(storage.exists(StorageLocation.from_url(p.crop_path)) for p in predictions)
+
+    def test_matches_two_stage_run(self, tmp_path):
+        """Fused mode shares Stage-1 with run_stage1, so both produce the same manifest."""
+        stage1_config = {**self.stage1_config, "checkpoint_every": 1, "prefilter": {"enabled": True}}
+
+        storage, runner = _runner(tmp_path / "staged", AlternatingClassifier())
+        staged_manifest = runner.run_stage1("file://input/cam1", "file://out", stage1_config)
+        staged_predictions = runner.run_stage2(staged_manifest, "file://out", self.stage2_config)
+
+        _, runner = _runner(tmp_path / "fused", AlternatingClassifier())
+        fused_manifest, fused_predictions = runner.run_fused("file://input/cam1", "file://out",
+                                                             stage1_config, self.stage2_config)
+
+        def rows(manifest):
+            # The test images carry no EXIF, so timestamps fall back to the processing time
+            return [{**entry.to_dict(), "timestamp": None} for entry in manifest]
+
+        assert staged_manifest
+        assert rows(fused_manifest) == rows(staged_manifest)
+        assert ([(p.crop_path, p.label, p.auto_ok) for p in fused_predictions]
+                == [(p.crop_path, p.label, p.auto_ok) for p in staged_predictions])
+
+    def test_resumes_from_checkpoint(self, tmp_path):
+        """An interrupted fused run keeps its committed shards, manifest and predictions together."""
+        storage, runner = _runner(tmp_path, AlternatingClassifier())
+        detector = runner.model_provider.load_model("detector.pt")
+        detections = detector.predict.return_value
+        detector.predict.side_effect = [detections, KeyboardInterrupt()]
+        stage1_config = {**self.stage1_config, "checkpoint_every": 1}
+
+        with pytest.raises(KeyboardInterrupt):
+            runner.run_fused("file://input/cam1", "file://out", stage1_config, self.stage2_config)
+
+        detector.predict.side_effect = None
+        detector.predict.reset_mock()
+        manifest, predictions = runner.run_fused("file://input/cam1", "file://out",
+                                                 stage1_config, self.stage2_config)
+
+        assert detector.predict.call_count == 1
+        assert len(manifest) == 4
+        assert [p.crop_path for p in predictions] == [m.crop_path for m in manifest]
+        report = json.loads(storage.get(StorageLocation.from_url("file://out/run_report.json")))
+        assert report["checkpoint"]["resumed_inputs"] == 1
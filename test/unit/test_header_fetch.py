@@ -0,0 +1,122 @@
+"""
+Unit tests for ranged header reads and EXIF metadata from image headers.
+"""
+
+import io
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import boto3
+import piexif
+import pytest
+from moto import mock_aws
+from PIL import Image
+
+from src.munin.cloud.interfaces import HEADER_BYTES, StorageLocation
+from src.munin.cloud.metadata import iter_image_metadata
+from src.munin.cloud.runners import LocalRunner
+from src.munin.cloud.storage import LocalFSAdapter, S3Adapter
+from src.munin.exif_extractor import (
+    exif_from_bytes,
+    get_gps_from_exif,
+    get_timestamp_from_exif,
+)
+
+
+def _jpeg_with_exif(taken="2024:06:01 05:30:00", size=(640, 480)):
+    exif = piexif.dump({
+        "0th": {},
+        "Exif": {piexif.ExifIFD.DateTimeOriginal: taken.encode()},
+        "GPS": {
+            piexif.GPSIFD.GPSLatitudeRef: b"N",
+            piexif.GPSIFD.GPSLatitude: ((59, 1), (30, 1), (0, 1)),
+            piexif.GPSIFD.GPSLongitudeRef: b"E",
+            piexif.GPSIFD.GPSLongitude: ((18, 1), (15, 1), (0, 1)),
+        },
+    })
+    # Noise keeps the encoded image larger than the header read
+    image = Image.effect_noise(size, 80).convert("RGB")
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", exif=exif, quality=95)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def local_storage(tmp_path):
+    storage = LocalFSAdapter(base_path=str(tmp_path))
+    storage.put(StorageLocation.from_url("file://input/cam1/a.jpg"), _jpeg_with_exif())
+    storage.put(StorageLocation.from_url("file://input/cam1/b.jpg"), b"not an image")
+    return storage
+
+
+class TestGetRange:
+    """Test ranged reads on local and S3 storage."""
+
+    def test_local(self, local_storage):
+        location = StorageLocation.from_url("file://input/cam1/b.jpg")
+        assert local_storage.get_range(location, 4, 2) == b"an"
+        assert local_storage.get_range(location, 10, 100) == b"ge"
+
+    def test_s3(self, monkeypatch):
+        monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+        monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+        with mock_aws():
+            boto3.client("s3", region_name="eu-north-1").create_bucket(
+                Bucket="traps", CreateBucketConfiguration={"LocationConstraint": "eu-north-1"}
+            )
+            storage = S3Adapter(base_path="s3://traps", region="eu-north-1")
+            location = StorageLocation.from_url("s3://traps/a.jpg")
+            storage.put(location, b"0123456789")
+
+            assert storage.get_range(location, 2, 3) == b"234"
+            assert storage.get_headers([location], size=4) == [b"0123"]
+
+    def test_get_headers_keeps_errors(self, local_storage):
+        headers = local_storage.get_headers([StorageLocation.from_url("file://input/cam1/b.jpg"),
+                                             StorageLocation.from_url("file://input/missing.jpg")])
+        assert headers[0] == b"not an image"
+        assert isinstance(headers[1], Exception)
+
+
+class TestExifFromHeader:
+    """Test EXIF parsing from a truncated header."""
+
+    def test_truncated_header(self):
+        content = _jpeg_with_exif()
+        assert len(content) > HEADER_BYTES
+
+        exif = exif_from_bytes(content[:HEADER_BYTES])
+        assert get_timestamp_from_exif(exif) == datetime(2024, 6, 1, 5, 30, tzinfo=timezone.utc)
+        latitude, longitude = get_gps_from_exif(exif)
+        assert latitude == pytest.approx(59.5)
+        assert longitude == pytest.approx(18.25)
+
+    def test_not_an_image(self):
+        assert exif_from_bytes(b"not an image") == {}
+
+
+class TestImageMetadata:
+    """Test metadata for a whole prefix."""
+
+    def test_prefix(self, local_storage):
+        metadata = list(iter_image_metadata(local_storage, "file://input"))
+
+        assert [m.location.path for m in metadata] == ["input/cam1/a.jpg", "input/cam1/b.jpg"]
+        assert metadata[0].timestamp == datetime(2024, 6, 1, 5, 30, tzinfo=timezone.utc)
+        assert metadata[0].latitude == pytest.approx(59.5)
+        assert metadata[0].header_bytes == HEADER_BYTES
+        assert metadata[1].timestamp is None
+        assert metadata[1].error is None
+
+    def test_missing_image(self, local_storage):
+        [metadata] = iter_image_metadata(local_storage, [StorageLocation.from_url("file://input/missing.jpg")])
+        assert metadata.error
+
+
+class TestRunnerTimestamp:
+    """Test that Stage-1 timestamps come from EXIF."""
+
+    def test_extract_timestamp(self, local_storage):
+        runner = LocalRunner(local_storage, MagicMock())
+        assert runner._extract_timestamp(StorageLocation.from_url("file://input/cam1/a.jpg")) == \
+            "2024-06-01T05:30:00+00:00"
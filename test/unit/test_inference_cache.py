@@ -0,0 +1,116 @@
+"""
+Unit tests for the content-hash keyed inference cache.
+"""
+
+import io
+import logging
+import os
+from unittest.mock import MagicMock
+
+from PIL import Image
+
+from src.munin.classification_engine import ClsResult
+from src.munin.cloud.inference_cache import InferenceCache
+from src.munin.cloud.interfaces import StorageLocation
+from src.munin.cloud.runners import LocalRunner
+from src.munin.cloud.storage import LocalFSAdapter
+from src.munin.wildlife_detector import Detection
+
+
+def _jpeg_bytes(color=(120, 90, 60), size=(64, 48)):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color=color).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+class TestInferenceCache:
+    """Test cache keys, storage and eviction."""
+
+    def test_key_depends_on_content_model_and_config(self):
+        """Any change in content, model or config gives a different key."""
+        key = InferenceCache.make_key("content", "model", {"image_size": 640})
+        assert key == InferenceCache.make_key("content", "model", {"image_size": 640})
+        assert key != InferenceCache.make_key("other", "model", {"image_size": 640})
+        assert key != InferenceCache.make_key("content", "model2", {"image_size": 640})
+        assert key != InferenceCache.make_key("content", "model", {"image_size": 1280})
+
+    def test_get_put_roundtrip_and_stats(self, tmp_path):
+        """Stored results are returned and hits/misses are counted."""
+        cache = InferenceCache(str(tmp_path / "cache.sqlite"))
+        assert cache.get("k") is None
+        cache.put("k", [["moose", 0.9, 1.0, 2.0, 3.0, 4.0]])
+        assert cache.get("k") == [["moose", 0.9, 1.0, 2.0, 3.0, 4.0]]
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["entries"] == 1
+
+    def test_eviction_keeps_recently_used_entries(self, tmp_path):
+        """Least recently used entries are evicted once the size cap is exceeded."""
+        cache = InferenceCache(str(tmp_path / "cache.sqlite"), max_size_mb=0.01)
+        cache.SIZE_CHECK_INTERVAL = 1
+
+        cache.put("hot", "x")
+        for i in range(200):
+            cache.get("hot")
+            cache.put(f"cold-{i}", os.urandom(200).hex())
+
+        stats = cache.stats()
+        assert stats["evictions"] > 0
+        assert stats["size_bytes"] <= stats["max_size_bytes"]
+        assert cache.get("hot") == "x"
+
+
+class TestRunnerInferenceCache:
+    """Test that unchanged inputs skip the model on re-runs."""
+
+    def test_stage1_and_stage2_rerun_uses_cache(self, tmp_path):
+        storage = LocalFSAdapter(base_path=str(tmp_path / "data"))
+        storage.put(StorageLocation.from_url("file://input/cam1/img1.jpg"), _jpeg_bytes())
+        storage.put(StorageLocation.from_url("file://input/cam1/img2.jpg"), _jpeg_bytes((10, 20, 30)))
+
+        detector = MagicMock(spec=["predict"])
+        detector.predict.return_value = [Detection(label="moose", confidence=0.9, bbox=[5, 5, 40, 40])]
+        classifier = MagicMock(spec=["predict"])
+        classifier.predict.return_value = ClsResult(label="moose", confidence=0.95)
+
+        provider = MagicMock()
+        provider.load_model.side_effect = lambda path: detector if path == "detector.pt" else classifier
+        provider.get_model_hash.return_value = "hash"
+
+        cache = InferenceCache(str(tmp_path / "cache.sqlite"))
+        runner = LocalRunner(storage, provider, inference_cache=cache)
+        stage1_config = {"stage1_model": "detector.pt", "conf_threshold": 0.3}
+        stage2_config = {"stage2_model": "classifier.pt"}
+
+        for _ in range(2):
+            manifest = runner.run_stage1("file://input/cam1", "file://out", stage1_config)
+            predictions = runner.run_stage2(manifest, "file://out", stage2_config)
+
+        assert detector.predict.call_count == 2
+        assert classifier.predict.call_count == 2
+        assert len(manifest) == 2
+        assert [p.label for p in predictions] == ["moose", "moose"]
+        assert cache.stats()["hits"] == 4
+
+    def test_unhashable_model_is_not_cached(self, tmp_path, caplog):
+        """A model whose file cannot be hashed bypasses the cache with a warning."""
+        storage = LocalFSAdapter(base_path=str(tmp_path / "data"))
+        storage.put(StorageLocation.from_url("file://input/cam1/img1.jpg"), _jpeg_bytes())
+
+        detector = MagicMock(spec=["predict"])
+        detector.predict.return_value = []
+        provider = MagicMock()
+        provider.load_model.return_value = detector
+        provider.get_model_hash.return_value = "unknown"
+
+        cache = InferenceCache(str(tmp_path / "cache.sqlite"))
+        runner = LocalRunner(storage, provider, inference_cache=cache)
+        with caplog.at_level(logging.WARNING, logger="wildlife_pipeline.cloud.runners"):
+            for _ in range(2):
+                runner.run_stage1("file://input/cam1", "file://out", {"stage1_model": "detector.pt"})
+
+        assert detector.predict.call_count == 2
+        assert cache.stats()["entries"] == 0
+        assert "could not be hashed" in caplog.text
@@ -0,0 +1,135 @@
+"""
+Unit tests for the local dynamic-batching inference server.
+"""
+
+import os
+import threading
+import time
+from multiprocessing import AuthenticationError
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.munin.cloud.inference_server import (
+    InferenceClient,
+    InferenceServer,
+    InferenceServerConfig,
+    RemoteModel,
+    key_path,
+)
+
+
+class DoublingModel:
+    """Fake batched model that records the batch sizes it sees."""
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def predict_batch(self, payloads):
+        self.batch_sizes.append(len(payloads))
+        time.sleep(0.01)
+        return [payload * 2 for payload in payloads]
+
+
+@pytest.fixture()
+def server(tmp_path):
+    model = DoublingModel()
+    provider = MagicMock()
+    provider.load_model.return_value = model
+    config = InferenceServerConfig(
+        address=str(tmp_path / "inference.sock"),
+        max_batch_size=8,
+        max_queue_delay_ms=50,
+    )
+    with InferenceServer(provider, config) as srv:
+        srv.model = model
+        yield srv
+
+
+class TestInferenceServer:
+    """Test request coalescing and statistics."""
+
+    def test_single_request(self, server):
+        """A single request is answered by the shared model."""
+        client = InferenceClient(server.config.address, server.config.authkey)
+        assert RemoteModel(client, "detector.pt").predict(21) == 42
+
+    def test_concurrent_requests_are_batched(self, server):
+        """Requests from many workers are coalesced into batches."""
+        client = InferenceClient(server.config.address, server.config.authkey)
+        results = {}
+
+        def worker(value):
+            results[value] = client.predict("detector.pt", value)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == {i: i * 2 for i in range(16)}
+        assert max(server.model.batch_sizes) > 1
+        assert max(server.model.batch_sizes) <= 8
+
+        stats = client.stats()["detector.pt"]
+        assert stats["requests"] == 16
+        assert stats["batch_size"]["count"] == len(server.model.batch_sizes)
+        assert stats["request_latency_ms"]["count"] == 16
+
+    def test_model_errors_are_propagated(self, server):
+        """Inference errors are raised on the client."""
+        server.model.predict_batch = MagicMock(side_effect=ValueError("bad input"))
+        client = InferenceClient(server.config.address, server.config.authkey)
+
+        with pytest.raises(RuntimeError, match="bad input"):
+            client.predict("detector.pt", 1)
+
+    def test_predict_batch_is_one_server_batch(self, server):
+        """RemoteModel.predict_batch sends one request that the server runs as one batch."""
+        client = InferenceClient(server.config.address, server.config.authkey)
+
+        assert RemoteModel(client, "detector.pt").predict_batch([1, 2, 3, 4, 5]) == [2, 4, 6, 8, 10]
+        assert server.model.batch_sizes == [5]
+        assert client.stats()["detector.pt"]["requests"] == 1
+
+    def test_large_batch_is_split_at_max_batch_size(self, server):
+        """A batch request larger than max_batch_size runs in several model calls, in order."""
+        client = InferenceClient(server.config.address, server.config.authkey)
+
+        assert client.predict_batch("detector.pt", list(range(10))) == [i * 2 for i in range(10)]
+        assert server.model.batch_sizes == [8, 2]
+
+
+class TestInferenceServerSecurity:
+    """Test that the socket and its key stay private to the current user."""
+
+    def test_generated_key_and_socket_are_private(self, server):
+        """Without a configured authkey the server writes a random key only the owner can read."""
+        key_file = key_path(server.config.address)
+
+        assert server.config.authkey is None
+        assert len(server.authkey) == 32
+        assert os.stat(key_file).st_mode & 0o777 == 0o600
+        assert os.stat(server.config.address).st_mode & 0o777 == 0o600
+        assert os.stat(os.path.dirname(server.config.address)).st_mode & 0o077 == 0
+
+    def test_wrong_key_is_rejected(self, server):
+        """Clients must know the per-run key."""
+        client = InferenceClient(server.config.address, b"munin")
+        with pytest.raises(AuthenticationError):
+            client.predict("detector.pt", 1)
+
+        # The server keeps accepting clients that do know it
+        assert InferenceClient(server.config.address).predict("detector.pt", 21) == 42
+
+    def test_shared_directory_is_refused(self, tmp_path):
+        """The server does not listen in a directory other users can enter."""
+        shared = tmp_path / "shared"
+        shared.mkdir(mode=0o777)
+        shared.chmod(0o777)
+        server = InferenceServer(MagicMock(), InferenceServerConfig(address=str(shared / "inference.sock")))
+
+        with pytest.raises(PermissionError):
+            server.start()
+        assert not (shared / "inference.sock.key").exists()
@@ -0,0 +1,166 @@
+"""
+Unit tests for Parquet/JSONL manifest and predictions files.
+"""
+
+import io
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pyarrow.parquet as pq
+import pytest
+import yaml
+from PIL import Image
+
+from src.munin.cloud.interfaces import ManifestEntry, Stage2Entry, StorageLocation
+from src.munin.cloud.manifest_io import (
+    MANIFEST_SCHEMA,
+    STAGE2_MANIFEST_COLUMNS,
+    EntryWriter,
+    find_entries_file,
+    read_entries,
+    write_entries,
+)
+from src.munin.cloud.runners import LocalRunner
+from src.munin.cloud.storage import LocalFSAdapter
+from src.munin.wildlife_detector import Detection
+
+
+def _manifest_entry(i, **kwargs):
+    values = {
+        "source_path": f"file://input/cam1/img{i}.jpg",
+        "crop_path": f"file://out/crops/img{i}_0.jpg",
+        "camera_id": "cam1",
+        "timestamp": "2024-06-01T05:30:00+00:00",
+        "bbox": [1.0, 2.0, 30.0, 40.0],
+        "det_score": 0.9,
+        "stage1_model": "det.pt",
+        "config_hash": "abc",
+        "image_width": 640,
+        "image_height": 480,
+        "stage1_label": "moose",
+        "observation_any": True,
+        "track_id": i,
+    }
+    values.update(kwargs)
+    return ManifestEntry(**values)
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return LocalFSAdapter(base_path=str(tmp_path))
+
+
+class TestRoundTrip:
+    """Test that both formats return the entries that were written."""
+
+    @pytest.mark.parametrize("suffix", ["parquet", "jsonl"])
+    def test_manifest(self, storage, suffix):
+        entries = [_manifest_entry(i) for i in range(5)]
+        entries.append(_manifest_entry(5, crop_path="", bbox={}, det_score=0.0, observation_any=False,
+                                       motion_score=0.01, stage1_label=None, track_id=None))
+        path = f"file://out/stage1/manifest.{suffix}"
+
+        write_entries(storage, path, entries, ManifestEntry, row_group_size=2)
+
+        assert read_entries(storage, path, ManifestEntry) == entries
+
+    @pytest.mark.parametrize("suffix", ["parquet", "jsonl"])
+    def test_predictions(self, storage, suffix):
+        entries = [
+            Stage2Entry(crop_path="file://out/crops/a.jpg", label="moose", confidence=0.97, auto_ok=True,
+                        stage2_model="cls.pt", stage1_model="det.pt", config_hash="abc"),
+            Stage2Entry(crop_path="file://out/crops/b.jpg", label="roe_deer", confidence=0.9, auto_ok=True,
+                        stage2_model=None, stage1_model="det.pt", config_hash="abc", auto_ok_reason="stage1_gate"),
+        ]
+        path = f"file://out/stage2/predictions.{suffix}"
+        write_entries(storage, path, entries, Stage2Entry)
+        assert read_entries(storage, path, Stage2Entry) == entries
+
+    def test_dict_bbox_is_stored_as_list(self, storage):
+        entry = _manifest_entry(0, bbox={"x1": 1.0, "y1": 2.0, "x2": 3.0, "y2": 4.0})
+        write_entries(storage, "file://m.parquet", [entry], ManifestEntry)
+        assert read_entries(storage, "file://m.parquet", ManifestEntry)[0].bbox == [1.0, 2.0, 3.0, 4.0]
+
+
+class TestParquetLayout:
+    """Test the explicit schema, row groups and column projection."""
+
+    def test_row_groups_and_schema(self, storage, tmp_path):
+        with EntryWriter(storage, "file://out/manifest.parquet", ManifestEntry, row_group_size=4) as writer:
+            for i in range(10):
+                writer.write([_manifest_entry(i)])
+
+        parquet_file = pq.ParquetFile(tmp_path / "out/manifest.parquet")
+        assert parquet_file.metadata.num_row_groups == 3
+        assert parquet_file.metadata.num_rows == 10
+        assert parquet_file.schema_arrow.equals(MANIFEST_SCHEMA)
+
+    def test_column_projection(self, storage):
+        write_entries(storage, "file://m.parquet", [_manifest_entry(i) for i in range(3)], ManifestEntry)
+
+        entries = read_entries(storage, "file://m.parquet", ManifestEntry, STAGE2_MANIFEST_COLUMNS)
+
+        assert [entry.crop_path for entry in entries] == [f"file://out/crops/img{i}_0.jpg" for i in range(3)]
+        assert entries[0].det_score == 0.9
+        assert entries[0].stage1_label == "moose"
+        assert entries[0].source_path is None
+        assert entries[0].track_id is None
+
+    def test_writer_without_close_stores_nothing(self, storage, tmp_path):
+        with pytest.raises(RuntimeError), EntryWriter(storage, "file://m.parquet", ManifestEntry) as writer:
+            writer.write([_manifest_entry(0)])
+            raise RuntimeError
+        assert not storage.exists(StorageLocation.from_url("file://m.parquet"))
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.parametrize("suffix", ["parquet", "jsonl"])
+    def test_rows_reach_storage_before_close(self, storage, tmp_path, suffix):
+        writer = EntryWriter(storage, f"file://out/manifest.{suffix}", ManifestEntry, row_group_size=100)
+        writer.write(_manifest_entry(i) for i in range(1000))
+
+        partial, = (tmp_path / "out").glob(f".manifest.{suffix}.*.tmp")
+        assert partial.stat().st_size > 0
+        assert not (tmp_path / "out" / f"manifest.{suffix}").exists()
+
+        writer.close()
+        assert [path.name for path in (tmp_path / "out").iterdir()] == [f"manifest.{suffix}"]
+        assert len(read_entries(storage, f"file://out/manifest.{suffix}", ManifestEntry)) == 1000
+
+
+class TestFindEntriesFile:
+    """Test output discovery."""
+
+    def test_prefers_parquet(self, storage):
+        assert find_entries_file(storage, "file://out/stage1/manifest") is None
+        write_entries(storage, "file://out/stage1/manifest.jsonl", [_manifest_entry(0)], ManifestEntry)
+        assert find_entries_file(storage, "file://out/stage1/manifest") == "file://out/stage1/manifest.jsonl"
+        write_entries(storage, "file://out/stage1/manifest.parquet", [_manifest_entry(0)], ManifestEntry)
+        assert find_entries_file(storage, "file://out/stage1/manifest") == "file://out/stage1/manifest.parquet"
+
+
+def test_runner_writes_each_format(storage):
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 48), color=(90, 60, 30)).save(buffer, format="JPEG")
+    for i in range(3):
+        storage.put(StorageLocation.from_url(f"file://input/cam1/img{i}.jpg"), buffer.getvalue())
+    detector = MagicMock(spec=["predict"])
+    detector.predict.return_value = [Detection(label="moose", confidence=0.9, bbox=[0, 0, 32, 24])]
+    provider = MagicMock()
+    provider.load_model.return_value = detector
+
+    runner = LocalRunner(storage, provider, manifest_formats=("parquet", "jsonl"))
+    manifest = runner.run_stage1("file://input/cam1", "file://out", {"stage1_model": "det.pt", "checkpoint_every": 0})
+
+    assert read_entries(storage, "file://out/stage1/manifest.parquet", ManifestEntry) == manifest
+    assert read_entries(storage, "file://out/stage1/manifest.jsonl", ManifestEntry) == manifest
+
+
+@pytest.mark.parametrize("profile", ["local", "cloud"])
+def test_profiles_keep_jsonl_export(profile):
+    """Profiles write Parquet next to the JSONL manifest existing consumers read."""
+    profile_path = Path(__file__).parents[2] / "conf" / "profiles" / f"{profile}.yaml"
+    manifest = yaml.safe_load(profile_path.read_text())["pipeline"]["manifest"]
+
+    assert set(manifest["formats"]) == {"parquet", "jsonl"}
+    assert manifest["stage1_path"].endswith(".jsonl")
+    assert manifest["stage2_path"].endswith(".jsonl")
@@ -0,0 +1,216 @@
+"""
+Unit tests for the model variant registry and variant selection.
+"""
+
+import io
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from src.munin.cloud.interfaces import ManifestEntry, StorageLocation
+from src.munin.cloud.models import (
+    LocalModelProvider,
+    ModelVariant,
+    ModelVariantRegistry,
+    OnnxModel,
+)
+from src.munin.cloud.runners import LocalRunner
+from src.munin.cloud.storage import LocalFSAdapter
+
+NAMES = "{0: 'moose', 1: 'fox'}"
+
+
+def _variant(name, precision, latency_ms, accuracy, stage="stage2"):
+    return ModelVariant(
+        name=name,
+        stage=stage,
+        path=f"models/{name}.onnx",
+        precision=precision,
+        model_hash="abc123",
+        latency_ms=latency_ms,
+        accuracy=accuracy,
+        base_model="yolo_cls",
+    )
+
+
+def _jpeg_bytes(color, size=(64, 64)):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color=color).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+def _save_model(graph, path):
+    onnx = pytest.importorskip("onnx")
+    pytest.importorskip("onnxruntime")
+    model = onnx.helper.make_model(graph, opset_imports=[onnx.helper.make_opsetid("", 13)])
+    model.ir_version = 8
+    onnx.helper.set_model_props(model, {"names": NAMES})
+    onnx.save(model, str(path))
+    return str(path)
+
+
+def _classifier_onnx(path):
+    """Two-class classifier over mean channel values: red crops are 'moose', blue ones 'fox'."""
+    onnx = pytest.importorskip("onnx")
+    helper, numpy_helper = onnx.helper, onnx.numpy_helper
+    weights = np.array([[10.0, 0.0], [0.0, 0.0], [0.0, 10.0]], dtype=np.float32)
+    graph = helper.make_graph(
+        [
+            helper.make_node("ReduceMean", ["images"], ["pooled"], axes=[2, 3], keepdims=0),
+            helper.make_node("MatMul", ["pooled", "weights"], ["logits"]),
+            helper.make_node("Softmax", ["logits"], ["output0"], axis=1),
+        ],
+        "classifier",
+        [helper.make_tensor_value_info("images", onnx.TensorProto.FLOAT, ["batch", 3, 16, 16])],
+        [helper.make_tensor_value_info("output0", onnx.TensorProto.FLOAT, ["batch", 2])],
+        initializer=[numpy_helper.from_array(weights, "weights")],
+    )
+    return _save_model(graph, path)
+
+
+def _detector_onnx(path):
+    """YOLO-style detector output (1, 4 + 2 classes, 3 anchors) with one confident moose box."""
+    onnx = pytest.importorskip("onnx")
+    helper, numpy_helper = onnx.helper, onnx.numpy_helper
+    raw = np.array([[
+        [16.0, 17.0, 8.0],   # cx
+        [16.0, 17.0, 8.0],   # cy
+        [16.0, 16.0, 4.0],   # w
+        [16.0, 16.0, 4.0],   # h
+        [0.9, 0.8, 0.05],    # moose
+        [0.05, 0.1, 0.1],    # fox
+    ]], dtype=np.float32)
+    graph = helper.make_graph(
+        [
+            helper.make_node("ReduceMean", ["images"], ["mean"], axes=[1, 2, 3], keepdims=1),
+            helper.make_node("Reshape", ["mean", "shape"], ["per_image"]),
+            helper.make_node("Mul", ["per_image", "zero"], ["zeros"]),
+            helper.make_node("Add", ["zeros", "raw"], ["output0"]),
+        ],
+        "detector",
+        [helper.make_tensor_value_info("images", onnx.TensorProto.FLOAT, [1, 3, 32, 32])],
+        [helper.make_tensor_value_info("output0", onnx.TensorProto.FLOAT, [1, 6, 3])],
+        initializer=[
+            numpy_helper.from_array(np.array([-1, 1, 1], dtype=np.int64), "shape"),
+            numpy_helper.from_array(np.array(0.0, dtype=np.float32), "zero"),
+            numpy_helper.from_array(raw, "raw"),
+        ],
+    )
+    return _save_model(graph, path)
+
+
+class TestModelVariantRegistry:
+    """Test variant registration and selection."""
+
+    def test_registry_persists_variants(self, tmp_path):
+        """Registered variants are written to disk and reloaded."""
+        registry_path = tmp_path / "variants.yaml"
+        registry = ModelVariantRegistry(str(registry_path))
+        registry.register(_variant("cls_fp32", "fp32", 20.0, 0.95))
+
+        reloaded = ModelVariantRegistry(str(registry_path))
+        assert [v.name for v in reloaded.variants()] == ["cls_fp32"]
+        assert reloaded.variants()[0].latency_ms == 20.0
+
+    def test_select_fastest_above_floor(self, tmp_path):
+        """The fastest variant meeting the accuracy floor is selected."""
+        registry = ModelVariantRegistry(str(tmp_path / "variants.yaml"))
+        registry.register(_variant("cls_fp32", "fp32", 20.0, 0.95))
+        registry.register(_variant("cls_int8", "int8", 6.0, 0.91))
+        registry.register(_variant("cls_fp16", "fp16", 12.0, 0.94))
+
+        assert registry.select("stage2", accuracy_floor=0.90).name == "cls_int8"
+        assert registry.select("stage2", accuracy_floor=0.93).name == "cls_fp16"
+        assert registry.select("stage2", accuracy_floor=0.99) is None
+        assert registry.select("stage1") is None
+
+    def test_select_ignores_unmeasured_variants_with_floor(self, tmp_path):
+        """Variants without accuracy only qualify when no floor is set."""
+        registry = ModelVariantRegistry(str(tmp_path / "variants.yaml"))
+        registry.register(_variant("cls_int8", "int8", 6.0, None))
+        registry.register(_variant("cls_fp32", "fp32", 20.0, 0.95))
+
+        assert registry.select("stage2", accuracy_floor=0.9).name == "cls_fp32"
+        assert registry.select("stage2").name == "cls_int8"
+
+    def test_runner_resolves_registered_variant(self, tmp_path):
+        """LocalRunner uses the selected variant and falls back to the configured model."""
+        registry_path = tmp_path / "variants.yaml"
+        registry = ModelVariantRegistry(str(registry_path))
+        registry.register(_variant("cls_int8", "int8", 6.0, 0.91))
+
+        runner = LocalRunner(MagicMock(), MagicMock())
+        config = {'variant_registry': str(registry_path), 'accuracy_floor': 0.9}
+        assert runner._resolve_model_path(config, 'stage2', 'yolo_cls') == "models/cls_int8.onnx"
+
+        config['accuracy_floor'] = 0.95
+        assert runner._resolve_model_path(config, 'stage2', 'yolo_cls') == "yolo_cls"
+
+
+class TestOnnxVariants:
+    """Test that registered ONNX variants run through the stages."""
+
+    def test_classifier_batch(self, tmp_path):
+        """An exported classifier returns one ClsResult per crop with exported class names."""
+        model = OnnxModel(_classifier_onnx(tmp_path / "cls.onnx"))
+
+        results = model.predict_batch([Image.new("RGB", (40, 20), (200, 0, 0)),
+                                       Image.new("RGB", (16, 16), (0, 0, 200))])
+
+        assert [r.label for r in results] == ["moose", "fox"]
+        assert results[0].confidence > 0.5
+
+    def test_detector_nms_and_rescale(self, tmp_path):
+        """Overlapping boxes are suppressed and boxes are scaled to the input image."""
+        model = OnnxModel(_detector_onnx(tmp_path / "det.onnx"), conf=0.25)
+
+        detections = model.predict(Image.new("RGB", (64, 64)))
+
+        assert len(detections) == 1
+        assert detections[0].label == "moose"
+        assert detections[0].bbox == pytest.approx([16.0, 16.0, 48.0, 48.0])
+
+    def test_stage2_with_registered_onnx_variant(self, tmp_path):
+        """run_stage2 classifies crops with the selected ONNX variant."""
+        registry_path = tmp_path / "variants.yaml"
+        registry = ModelVariantRegistry(str(registry_path))
+        variant = _variant("cls_int8", "int8", 6.0, 0.93)
+        variant.path = _classifier_onnx(tmp_path / "cls_int8.onnx")
+        registry.register(variant)
+
+        storage = LocalFSAdapter(base_path=str(tmp_path / "data"))
+        entries = []
+        for i, color in enumerate([(200, 0, 0), (0, 0, 200)]):
+            url = f"file://out/stage1/crops/img{i}_0.jpg"
+            storage.put(StorageLocation.from_url(url), _jpeg_bytes(color))
+            entries.append(ManifestEntry(
+                source_path=f"file://input/cam1/img{i}.jpg", crop_path=url, camera_id="cam1",
+                timestamp="2024-01-01T00:00:00", bbox={"x1": 0, "y1": 0, "x2": 64, "y2": 64},
+                det_score=0.9, stage1_model="detector.pt", config_hash="abc",
+            ))
+
+        runner = LocalRunner(storage, LocalModelProvider(cache_path=f"file://{tmp_path}/models"))
+        config = {"stage2_model": "yolo_cls.pt", "variant_registry": str(registry_path), "accuracy_floor": 0.9}
+        predictions = runner.run_stage2(entries, "file://out", config)
+
+        assert [p.label for p in predictions] == ["moose", "fox"]
+
+    def test_stage1_with_registered_onnx_variant(self, tmp_path):
+        """run_stage1 detects with the selected ONNX variant and writes its crops."""
+        registry_path = tmp_path / "variants.yaml"
+        registry = ModelVariantRegistry(str(registry_path))
+        variant = _variant("det_fp32", "fp32", 30.0, None, stage="stage1")
+        variant.path = _detector_onnx(tmp_path / "det_fp32.onnx")
+        registry.register(variant)
+
+        storage = LocalFSAdapter(base_path=str(tmp_path / "data"))
+        storage.put(StorageLocation.from_url("file://input/cam1/img0.jpg"), _jpeg_bytes((90, 120, 60)))
+
+        runner = LocalRunner(storage, LocalModelProvider(cache_path=f"file://{tmp_path}/models"))
+        config = {"stage1_model": "megadetector.pt", "variant_registry": str(registry_path)}
+        manifest = runner.run_stage1("file://input/cam1", "file://out", config)
+
+        assert [entry.stage1_label for entry in manifest] == ["moose"]
+        assert manifest[0].bbox == pytest.approx([16.0, 16.0, 48.0, 48.0])
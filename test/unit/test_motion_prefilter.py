@@ -0,0 +1,133 @@
+"""
+Unit tests for the per-camera motion prefilter.
+"""
+
+import io
+import json
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+from PIL import Image
+
+from src.munin.cloud.interfaces import StorageLocation
+from src.munin.cloud.runners import LocalRunner
+from src.munin.cloud.storage import LocalFSAdapter
+from src.munin.motion_prefilter import (
+    MotionPrefilter,
+    MotionPrefilterConfig,
+    calibration_report,
+)
+from src.munin.wildlife_detector import Detection
+
+
+def _frame(brightness=100, animal=False):
+    pixels = np.full((120, 160), brightness, dtype=np.uint8)
+    if animal:
+        pixels[40:90, 50:110] = 250
+    return Image.fromarray(pixels).convert("RGB")
+
+
+def _jpeg_bytes(image):
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+class TestMotionPrefilter:
+    """Test background scoring."""
+
+    def test_static_frames_are_skipped(self):
+        prefilter = MotionPrefilter(MotionPrefilterConfig(enabled=True))
+        assert prefilter.score("cam1", _frame()).reason == "warmup"
+        result = prefilter.score("cam1", _frame())
+        assert not result.passed
+        assert result.reason == "static"
+
+    def test_animal_passes(self):
+        prefilter = MotionPrefilter(MotionPrefilterConfig(enabled=True))
+        prefilter.score("cam1", _frame())
+        result = prefilter.score("cam1", _frame(animal=True))
+        assert result.passed
+        assert result.reason == "motion"
+
+    def test_global_light_change_is_skipped(self):
+        """A whole-frame brightness shift is not motion."""
+        prefilter = MotionPrefilter(MotionPrefilterConfig(enabled=True))
+        prefilter.score("cam1", _frame(100))
+        assert not prefilter.score("cam1", _frame(160)).passed
+
+    def test_backgrounds_are_per_camera(self):
+        prefilter = MotionPrefilter(MotionPrefilterConfig(enabled=True))
+        prefilter.score("cam1", _frame())
+        assert prefilter.score("cam2", _frame(animal=True)).reason == "warmup"
+        assert prefilter.stats()["cameras"]["cam1"] == {"passed": 1, "skipped": 0}
+
+
+class TestCalibrationReport:
+    """Test recall reporting on a labelled set."""
+
+    def test_recall_per_threshold(self, tmp_path):
+        frames = []
+        for i, animal in enumerate([False, False, True, False, True]):
+            path = tmp_path / "cam1" / f"img{i}.jpg"
+            path.parent.mkdir(exist_ok=True)
+            _frame(animal=animal).save(path)
+            frames.append((path, "cam1", animal))
+
+        report = calibration_report(frames, MotionPrefilterConfig(enabled=True), [0.01, 0.9])
+
+        assert report["animal_frames"] == 2
+        low, high = report["thresholds"]
+        assert low["recall"] == 1.0
+        assert high["recall"] == 0.0
+        assert high["missed_animal_frames"] == 2
+
+
+class TestRunnerPrefilter:
+    """Test that skipped frames bypass Stage-1 but stay in the manifest."""
+
+    def test_skipped_frames_are_recorded(self, tmp_path):
+        storage = LocalFSAdapter(base_path=str(tmp_path / "data"))
+        for i, animal in enumerate([False, False, True]):
+            storage.put(StorageLocation.from_url(f"file://input/cam1/img{i}.jpg"),
+                        _jpeg_bytes(_frame(animal=animal)))
+
+        detector = MagicMock(spec=["predict"])
+        detector.predict.return_value = [Detection(label="moose", confidence=0.9, bbox=[50, 40, 110, 90])]
+        provider = MagicMock()
+        provider.load_model.return_value = detector
+
+        runner = LocalRunner(storage, provider)
+        config = {"stage1_model": "detector.pt", "prefilter": {"enabled": True}}
+        manifest = runner.run_stage1("file://input/cam1", "file://out", config)
+
+        skipped = [entry for entry in manifest if entry.observation_any is False]
+        assert len(skipped) == 1
+        assert skipped[0].source_path.endswith("img1.jpg")
+        assert skipped[0].crop_path == ""
+        assert detector.predict.call_count == 2
+
+        report = json.loads(storage.get(StorageLocation.from_url("file://out/stage1/run_report.json")))
+        assert report["prefilter"]["skipped"] == 1
+        assert report["prefilter"]["cameras"] == {"cam1": {"passed": 2, "skipped": 1}}
+
+    def test_skipped_frames_are_not_fully_decoded(self, tmp_path):
+        """Only frames that pass the prefilter's thumbnail check are decoded in full."""
+        storage = LocalFSAdapter(base_path=str(tmp_path / "data"))
+        for i, animal in enumerate([False, False, True]):
+            storage.put(StorageLocation.from_url(f"file://input/cam1/img{i}.jpg"),
+                        _jpeg_bytes(_frame(animal=animal)))
+
+        detector = MagicMock(spec=["predict"])
+        detector.predict.return_value = []
+        provider = MagicMock()
+        provider.load_model.return_value = detector
+
+        runner = LocalRunner(storage, provider)
+        config = {"stage1_model": "detector.pt", "prefilter": {"enabled": True}}
+        with patch.object(LocalRunner, "_decode_frame", autospec=True,
+                          side_effect=LocalRunner._decode_frame) as decode:
+            runner.run_stage1("file://input/cam1", "file://out", config)
+
+        decoded = sorted(call.args[1].location.path for call in decode.call_args_list)
+        assert decoded == ["input/cam1/img0.jpg", "input/cam1/img2.jpg"]
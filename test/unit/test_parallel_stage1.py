@@ -0,0 +1,108 @@
+"""
+Unit tests for the parallel Stage-1 pipeline in LocalRunner.
+"""
+
+import io
+import json
+import random
+import time
+from unittest.mock import MagicMock
+
+from PIL import Image
+
+from src.munin.cloud.interfaces import StorageLocation
+from src.munin.cloud.metrics import StageThroughput
+from src.munin.cloud.runners import LocalRunner
+from src.munin.cloud.storage import LocalFSAdapter
+from src.munin.wildlife_detector import Detection
+
+
+def _jpeg_bytes(color, size=(64, 48)):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color=color).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+class JitteryStorage(LocalFSAdapter):
+    """Local storage whose reads and writes finish in random order."""
+
+    def __init__(self, *args, fail_puts_for=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fail_puts_for = fail_puts_for
+
+    def get(self, location):
+        time.sleep(random.uniform(0, 0.01))
+        return super().get(location)
+
+    def put(self, location, data):
+        if any(name in location.path for name in self.fail_puts_for):
+            raise OSError("disk full")
+        time.sleep(random.uniform(0, 0.01))
+        return super().put(location, data)
+
+
+class BatchDetector:
+    """Records batch sizes and returns one box per image."""
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def predict_batch(self, images):
+        self.batch_sizes.append(len(images))
+        return [[Detection(label="moose", confidence=0.9, bbox=[0, 0, 32, 24])] for _ in images]
+
+
+def _runner(tmp_path, count, detector, **storage_kwargs):
+    storage = JitteryStorage(base_path=str(tmp_path / "data"), **storage_kwargs)
+    for i in range(count):
+        storage.put(StorageLocation.from_url(f"file://input/cam1/img{i:02d}.jpg"), _jpeg_bytes((i * 10, 90, 60)))
+    provider = MagicMock()
+    provider.load_model.return_value = detector
+    return storage, LocalRunner(storage, provider, max_workers=4)
+
+
+class TestParallelStage1:
+    """Test loads, batched detection and crop writes in run_stage1."""
+
+    def test_manifest_order_is_deterministic(self, tmp_path):
+        detector = BatchDetector()
+        storage, runner = _runner(tmp_path, 11, detector)
+
+        manifest = runner.run_stage1("file://input/cam1", "file://out", {"stage1_model": "det.pt", "batch_size": 4})
+
+        assert detector.batch_sizes == [4, 4, 3]
+        assert [entry.source_path.rsplit("/", 1)[-1] for entry in manifest] == [f"img{i:02d}.jpg" for i in range(11)]
+        for entry in manifest:
+            assert storage.exists(StorageLocation.from_url(entry.crop_path))
+
+    def test_report_has_per_step_throughput(self, tmp_path):
+        storage, runner = _runner(tmp_path, 3, BatchDetector())
+        runner.run_stage1("file://input/cam1", "file://out", {"stage1_model": "det.pt"})
+
+        report = json.loads(storage.get(StorageLocation.from_url("file://out/stage1/run_report.json")))
+        assert set(report["throughput"]) == {"load", "detect", "write"}
+        assert report["throughput"]["load"]["images"] == 3
+        assert report["throughput"]["write"]["images"] == 3
+        assert report["inputs_per_second"] > 0
+
+    def test_failed_crop_write_drops_the_image(self, tmp_path):
+        storage, runner = _runner(tmp_path, 3, BatchDetector(), fail_puts_for=("img01_0",))
+
+        manifest = runner.run_stage1("file://input/cam1", "file://out", {"stage1_model": "det.pt"})
+
+        assert [entry.source_path.rsplit("/", 1)[-1] for entry in manifest] == ["img00.jpg", "img02.jpg"]
+
+
+class TestStageThroughput:
+    """Test the per-step throughput counters."""
+
+    def test_rates_per_step(self):
+        throughput = StageThroughput()
+        throughput.observe("load", 10, 2.0)
+        throughput.observe("load", 10, 2.0)
+        with throughput.measure("detect", 4):
+            pass
+
+        stats = throughput.to_dict()
+        assert stats["load"] == {"images": 20, "busy_seconds": 4.0, "images_per_second": 5.0}
+        assert stats["detect"]["images"] == 4
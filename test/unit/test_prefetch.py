@@ -0,0 +1,124 @@
+"""
+Unit tests for the backpressure-aware BatchPrefetcher.
+"""
+
+import threading
+import time
+
+import pytest
+
+from src.common.utils.prefetch import BatchPrefetcher, batched
+
+
+def test_batched():
+    assert list(batched(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(batched([], 3)) == []
+
+
+def test_ordered_results_with_multiple_workers():
+    def slow_sum(batch):
+        time.sleep(0.02 * (3 - batch[0] % 3))  # later batches finish first
+        return sum(batch)
+
+    prefetcher = BatchPrefetcher(slow_sum, batch_size=2, workers=3)
+
+    assert list(prefetcher.map(range(10))) == [1, 5, 9, 13, 17]
+    assert prefetcher.stats.batches == 5
+    assert prefetcher.stats.items == 10
+
+
+def test_unordered_yields_every_batch():
+    prefetcher = BatchPrefetcher(lambda batch: batch[0], workers=4, ordered=False)
+
+    assert sorted(prefetcher.map(range(20))) == list(range(20))
+
+
+def test_slow_consumer_applies_backpressure_without_dropping():
+    pulled = []
+
+    def source():
+        for i in range(50):
+            pulled.append(i)
+            yield i
+
+    prefetcher = BatchPrefetcher(lambda batch: batch[0], workers=2, prefetch=3)
+    results = []
+    for result in prefetcher.map(source()):
+        if result == 0:
+            time.sleep(0.2)
+            # Feeder is blocked: three batches in flight plus the one it holds
+            assert len(pulled) <= 5
+        results.append(result)
+
+    assert results == list(range(50))
+    assert prefetcher.stats.max_in_flight <= 3
+    assert prefetcher.stats.producer_blocked_seconds > 0.1
+
+
+def test_worker_error_is_raised_in_consumer():
+    def fail_on_three(batch):
+        if batch[0] == 3:
+            raise ValueError("bad frame")
+        return batch[0]
+
+    results = []
+    with pytest.raises(ValueError, match="bad frame"):
+        for result in BatchPrefetcher(fail_on_three, workers=2).map(range(10)):
+            results.append(result)
+
+    assert results == [0, 1, 2]
+
+
+def test_source_error_is_raised_after_earlier_batches():
+    def source():
+        yield 1
+        yield 2
+        raise RuntimeError("decoder failed")
+
+    results = []
+    with pytest.raises(RuntimeError, match="decoder failed"):
+        for result in BatchPrefetcher(lambda batch: batch[0]).map(source()):
+            results.append(result)
+
+    assert results == [1, 2]
+
+
+def test_slow_producer_is_end_of_stream_not_timeout():
+    def source():
+        for i in range(2):
+            time.sleep(0.3)
+            yield i
+
+    prefetcher = BatchPrefetcher(lambda batch: batch[0])
+
+    assert list(prefetcher.map(source())) == [0, 1]
+    assert prefetcher.stats.consumer_wait_seconds > 0.5
+
+
+def test_early_exit_stops_feeder():
+    prefetcher = BatchPrefetcher(lambda batch: batch[0], workers=2)
+    before = threading.active_count()
+
+    for result in prefetcher.map(range(1000)):
+        if result == 5:
+            break
+
+    time.sleep(0.3)
+    assert threading.active_count() <= before
+
+
+def test_early_exit_cancels_queued_batches():
+    started = []
+
+    def slow(batch):
+        started.append(batch[0])
+        time.sleep(0.05)
+        return batch[0]
+
+    prefetcher = BatchPrefetcher(slow, workers=1, prefetch=8)
+    for result in prefetcher.map(range(100)):
+        if result == 0:
+            break
+
+    # Only the batches a worker had already picked up ran; the queued ones were cancelled
+    assert len(started) <= 2
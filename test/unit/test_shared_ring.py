@@ -0,0 +1,65 @@
+"""
+Unit tests for the shared-memory frame ring.
+"""
+
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from src.common.utils.shared_ring import SharedFrameRing
+
+_ring = None
+
+
+def _attach(handle):
+    global _ring
+    _ring = SharedFrameRing.attach(handle)
+
+
+def _write_frame(value):
+    slot = _ring.acquire(timeout=5)
+    return slot, _ring.write(slot, np.full((4, 6, 3), value, dtype=np.uint8))
+
+
+def test_write_and_view_share_memory():
+    with SharedFrameRing(slots=2, shape=(4, 6, 3)) as ring:
+        slot = ring.acquire()
+        shape = ring.write(slot, np.arange(36, dtype=np.uint8).reshape(2, 6, 3))
+
+        view = ring.view(slot, shape)
+        assert view.shape == (2, 6, 3)
+        assert view[1, 5, 2] == 35
+        ring.view(slot, shape)[0, 0, 0] = 99
+        assert view[0, 0, 0] == 99
+        del view
+
+
+def test_acquire_blocks_until_release():
+    with SharedFrameRing(slots=1, shape=(2, 2)) as ring:
+        slot = ring.acquire()
+        with pytest.raises(TimeoutError):
+            ring.acquire(timeout=0.05)
+        ring.release(slot)
+        assert ring.acquire(timeout=1) == slot
+
+
+def test_rejects_frames_that_do_not_fit():
+    with SharedFrameRing(slots=1, shape=(2, 2)) as ring:
+        with pytest.raises(ValueError):
+            ring.write(0, np.zeros((3, 3), dtype=np.uint8))
+        with pytest.raises(ValueError):
+            ring.write(0, np.zeros((2, 2), dtype=np.float32))
+
+
+def test_worker_processes_write_slots_read_zero_copy():
+    context = mp.get_context("spawn")
+    with SharedFrameRing(slots=4, shape=(4, 6, 3), context=context) as ring:
+        with ProcessPoolExecutor(max_workers=2, mp_context=context,
+                                 initializer=_attach, initargs=(ring.handle(),)) as executor:
+            written = list(executor.map(_write_frame, [10, 20, 30]))
+
+        values = sorted(int(ring.view(slot, shape)[0, 0, 0]) for slot, shape in written)
+        assert values == [10, 20, 30]
+        assert len({slot for slot, _ in written}) == 3
@@ -0,0 +1,119 @@
+"""
+Unit tests for batched Stage-2 classification.
+"""
+
+import io
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import numpy as np
+from PIL import Image
+
+from src.munin.classification_engine import ClsResult, YOLOClassifier
+from src.munin.cloud.interfaces import ManifestEntry, StorageLocation
+from src.munin.cloud.runners import LocalRunner
+from src.munin.cloud.storage import LocalFSAdapter
+
+
+def _jpeg_bytes(color=(120, 90, 60), size=(32, 32)):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color=color).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+def _manifest_entry(crop_path):
+    return ManifestEntry(
+        source_path="file://input/cam1/img.jpg",
+        crop_path=crop_path,
+        camera_id="cam1",
+        timestamp="2024-01-01T00:00:00",
+        bbox={"x1": 0, "y1": 0, "x2": 32, "y2": 32},
+        det_score=0.9,
+        stage1_model="detector.pt",
+        config_hash="abc",
+    )
+
+
+class FakeUltralyticsCls:
+    """Stands in for an ultralytics classification model."""
+
+    def __init__(self):
+        self.sources = []
+
+    def predict(self, source, conf, verbose):
+        self.sources.append(source)
+        return [
+            SimpleNamespace(probs=SimpleNamespace(top1=i % 2, top1conf=0.9), names={0: "moose", 1: "fox"})
+            for i in range(len(source))
+        ]
+
+
+class BatchClassifier:
+    """Records the size of every batch it is asked to classify."""
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def predict_batch(self, crops):
+        self.batch_sizes.append(len(crops))
+        return [ClsResult(label="moose", confidence=0.8) for _ in crops]
+
+
+class TestPredictBatch:
+    """Test YOLOClassifier.predict_batch."""
+
+    def _classifier(self):
+        classifier = YOLOClassifier.__new__(YOLOClassifier)
+        classifier.model = FakeUltralyticsCls()
+        classifier.conf = 0.5
+        return classifier
+
+    def test_list_of_arrays_is_one_call(self):
+        """A list of crops is classified in a single model call, in order."""
+        classifier = self._classifier()
+        crops = [np.zeros((32, 32, 3), dtype=np.uint8) for _ in range(3)]
+
+        results = classifier.predict_batch(crops)
+
+        assert [r.label for r in results] == ["moose", "fox", "moose"]
+        assert len(classifier.model.sources) == 1
+
+    def test_rgb_arrays_are_passed_as_bgr(self):
+        """Crops are decoded as RGB but ultralytics expects BGR numpy input."""
+        classifier = self._classifier()
+        crop = np.zeros((4, 4, 3), dtype=np.uint8)
+        crop[..., 0] = 255
+
+        classifier.predict_batch(np.stack([crop]))
+
+        assert classifier.model.sources[0][0][0, 0].tolist() == [0, 0, 255]
+
+    def test_empty_batch(self):
+        """An empty batch does not call the model."""
+        classifier = self._classifier()
+        assert classifier.predict_batch([]) == []
+        assert classifier.model.sources == []
+
+
+class TestRunnerStage2Batching:
+    """Test that run_stage2 classifies crops in batches."""
+
+    def test_entries_are_grouped_into_batches(self, tmp_path):
+        storage = LocalFSAdapter(base_path=str(tmp_path / "data"))
+        entries = []
+        for i in range(5):
+            url = f"file://out/stage1/crops/img{i}_0.jpg"
+            storage.put(StorageLocation.from_url(url), _jpeg_bytes((i * 40, 90, 60)))
+            entries.append(_manifest_entry(url))
+        entries.append(_manifest_entry("file://out/stage1/crops/missing.jpg"))
+
+        classifier = BatchClassifier()
+        provider = MagicMock()
+        provider.load_model.return_value = classifier
+
+        runner = LocalRunner(storage, provider, max_workers=2)
+        predictions = runner.run_stage2(entries, "file://out", {"stage2_model": "cls.pt", "batch_size": 2})
+
+        assert classifier.batch_sizes == [2, 2, 1]
+        assert [p.crop_path for p in predictions] == [e.crop_path for e in entries[:5]]
+        assert all(p.auto_ok for p in predictions)
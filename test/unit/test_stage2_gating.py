@@ -0,0 +1,152 @@
+"""
+Unit tests for confidence-gated Stage-2 skipping.
+"""
+
+import io
+import json
+from unittest.mock import MagicMock
+
+import pytest
+import yaml
+from PIL import Image
+
+from src.common.exceptions import ConfigurationError
+from src.munin.classification_engine import ClsResult
+from src.munin.cloud.config import CloudConfig
+from src.munin.cloud.gating import Stage2GatingPolicy
+from src.munin.cloud.interfaces import ManifestEntry, Stage2Entry, StorageLocation
+from src.munin.cloud.runners import LocalRunner
+from src.munin.cloud.storage import LocalFSAdapter
+
+
+def _jpeg_bytes(size=(32, 32)):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color=(120, 90, 60)).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+def _manifest_entry(crop_path, label, score):
+    return ManifestEntry(
+        source_path="file://input/cam1/img.jpg",
+        crop_path=crop_path,
+        camera_id="cam1",
+        timestamp="2024-01-01T00:00:00",
+        bbox={"x1": 0, "y1": 0, "x2": 32, "y2": 32},
+        det_score=score,
+        stage1_model="detector.pt",
+        config_hash="abc",
+        stage1_label=label,
+    )
+
+
+class TestStage2GatingPolicy:
+    """Test the gating policy itself."""
+
+    def test_loads_species_config(self):
+        """The shipped species config gates the mapped Swedish species."""
+        policy = Stage2GatingPolicy.from_yaml("conf/species.yaml")
+        assert set(policy.thresholds) >= {"moose", "boar", "roedeer", "fox", "badger"}
+
+    def test_skip_reason(self):
+        policy = Stage2GatingPolicy(thresholds={"moose": 0.85})
+        assert policy.skip_reason("moose", 0.9) == "stage1_confident:moose>=0.85"
+        assert policy.skip_reason("moose", 0.5) is None
+        assert policy.skip_reason("animal", 0.99) is None
+        assert policy.skip_reason(None, 0.99) is None
+
+    def test_disabled_policy_is_not_built(self):
+        assert Stage2GatingPolicy.from_config({"gating": {"enabled": False, "species": {"moose": 0.8}}}) is None
+        assert Stage2GatingPolicy.from_config({}) is None
+
+
+class TestRunnerGating:
+    """Test that run_stage2 skips the classifier for gated detections."""
+
+    def test_gated_entries_skip_classifier(self, tmp_path):
+        storage = LocalFSAdapter(base_path=str(tmp_path / "data"))
+        entries = [
+            _manifest_entry("file://out/stage1/crops/a_0.jpg", "moose", 0.95),
+            _manifest_entry("file://out/stage1/crops/b_0.jpg", "animal", 0.95),
+            _manifest_entry("file://out/stage1/crops/c_0.jpg", "fox", 0.5),
+            _manifest_entry("file://out/stage1/crops/d_0.jpg", "badger", 0.92),
+        ]
+        for entry in entries:
+            storage.put(StorageLocation.from_url(entry.crop_path), _jpeg_bytes())
+
+        classifier = MagicMock(spec=["predict"])
+        classifier.predict.return_value = ClsResult(label="fox", confidence=0.7)
+        provider = MagicMock()
+        provider.load_model.return_value = classifier
+
+        runner = LocalRunner(storage, provider)
+        config = {
+            "stage2_model": "cls.pt",
+            "gating": {"species": {"moose": 0.85, "fox": 0.9, "badger": 0.9}},
+        }
+        predictions = runner.run_stage2(entries, "file://out", config)
+
+        assert classifier.predict.call_count == 2
+        assert [p.crop_path for p in predictions] == [e.crop_path for e in entries]
+
+        gated = predictions[0]
+        assert gated.stage2_model is None
+        assert gated.label == "moose"
+        assert gated.auto_ok
+        assert gated.auto_ok_reason == "stage1_confident:moose>=0.85"
+        assert predictions[1].stage2_model == "cls.pt"
+        assert predictions[1].auto_ok_reason == "stage2_confident"
+
+        report = json.loads(storage.get(StorageLocation.from_url("file://out/stage2/run_report.json")))
+        assert report["stage2_gating"]["stage2_calls_avoided"] == 2
+        assert report["stage2_gating"]["fraction_avoided"] == 0.5
+
+    def test_old_predictions_still_load(self):
+        """Predictions written before gating existed have no auto_ok_reason."""
+        entry = Stage2Entry.from_dict({
+            "crop_path": "c.jpg", "label": "fox", "confidence": 0.9, "auto_ok": True,
+            "stage2_model": "cls.pt", "stage1_model": "det.pt", "config_hash": "abc",
+        })
+        assert entry.auto_ok_reason is None
+
+
+class TestGatingConfig:
+    """Test how profiles point at the species config."""
+
+    def _profile(self, tmp_path, gating):
+        profile_dir = tmp_path / "conf" / "profiles"
+        profile_dir.mkdir(parents=True)
+        (tmp_path / "conf" / "species.yaml").write_text("stage2_gating:\n  species:\n    moose: 0.85\n")
+        profile = profile_dir / "local.yaml"
+        profile.write_text(
+            "storage:\n  adapter: local\n"
+            f"  base_path: file://{tmp_path}/data\n"
+            "queue:\n  adapter: none\n"
+            f"model:\n  provider: local\n  cache_path: file://{tmp_path}/models\n"
+            "runner:\n  type: local\n"
+            f"pipeline:\n  stage2:\n    gating: {gating}\n"
+        )
+        return str(profile)
+
+    def test_gating_path_is_relative_to_profile(self, tmp_path, monkeypatch):
+        """A relative gating path resolves against the profile file, not the working directory."""
+        profile = self._profile(tmp_path, "../species.yaml")
+        monkeypatch.chdir(tmp_path / "conf" / "profiles")
+
+        config = CloudConfig("local", config_path=profile)
+
+        gating = config.get_stage2_config()["gating"]
+        assert gating == str(tmp_path / "conf" / "species.yaml")
+        assert Stage2GatingPolicy.from_config(config.get_stage2_config()).thresholds == {"moose": 0.85}
+
+    def test_missing_gating_file_fails_at_load(self, tmp_path):
+        """A gating path that does not exist is reported when the config is loaded."""
+        profile = self._profile(tmp_path, "missing.yaml")
+
+        with pytest.raises(ConfigurationError, match="gating"):
+            CloudConfig("local", config_path=profile)
+
+    def test_shipped_profiles_do_not_gate(self):
+        """Gating is opt-in in the shipped profiles."""
+        for profile in ("local", "cloud"):
+            with open(f"conf/profiles/{profile}.yaml") as f:
+                assert "gating" not in (yaml.safe_load(f)["pipeline"]["stage2"])
@@ -0,0 +1,176 @@
+"""
+Unit tests for concurrent StorageAdapter.get_many/put_many, S3 retries and streamed uploads.
+"""
+
+import os
+import threading
+import time
+
+import boto3
+import pytest
+from botocore.exceptions import ClientError, EndpointConnectionError, ReadTimeoutError
+from moto import mock_aws
+
+from src.munin.cloud.interfaces import StorageLocation
+from src.munin.cloud.storage import LocalFSAdapter, S3Adapter
+
+
+def _client_error(status, code):
+    return ClientError({"Error": {"Code": code}, "ResponseMetadata": {"HTTPStatusCode": status}}, "GetObject")
+
+
+@pytest.fixture
+def s3_storage(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    with mock_aws():
+        boto3.client("s3", region_name="eu-north-1").create_bucket(
+            Bucket="traps", CreateBucketConfiguration={"LocationConstraint": "eu-north-1"}
+        )
+        yield S3Adapter(base_path="s3://traps", region="eu-north-1", max_concurrency=4, retry_backoff=0.0)
+
+
+class TestS3Many:
+    """Test batched requests on a pooled S3 client."""
+
+    def test_put_many_then_get_many_keeps_order(self, s3_storage):
+        locations = [StorageLocation.from_url(f"s3://traps/crops/{i}.jpg") for i in range(20)]
+        assert s3_storage.put_many((location, f"crop {i}".encode()) for i, location in enumerate(locations)) == \
+            [None] * 20
+
+        assert s3_storage.get_many(locations) == [f"crop {i}".encode() for i in range(20)]
+
+    def test_missing_object(self, s3_storage):
+        s3_storage.put(StorageLocation.from_url("s3://traps/a.jpg"), b"a")
+        locations = [StorageLocation.from_url("s3://traps/a.jpg"), StorageLocation.from_url("s3://traps/missing.jpg")]
+
+        results = s3_storage.get_many(locations, return_exceptions=True)
+        assert results[0] == b"a"
+        assert isinstance(results[1], ClientError)
+        with pytest.raises(ClientError):
+            s3_storage.get_many(locations)
+
+    def test_throttling_is_retried(self, s3_storage, monkeypatch):
+        s3_storage.put(StorageLocation.from_url("s3://traps/a.jpg"), b"a")
+        get_object = s3_storage.client.get_object
+        calls = []
+
+        def flaky_get_object(**kwargs):
+            calls.append(kwargs)
+            if len(calls) < 3:
+                raise _client_error(503, "SlowDown")
+            return get_object(**kwargs)
+
+        monkeypatch.setattr(s3_storage.client, "get_object", flaky_get_object)
+        assert s3_storage.get(StorageLocation.from_url("s3://traps/a.jpg")) == b"a"
+        assert len(calls) == 3
+
+    def test_not_found_is_not_retried(self, s3_storage, monkeypatch):
+        calls = []
+
+        def missing(**kwargs):
+            calls.append(kwargs)
+            raise _client_error(404, "NoSuchKey")
+
+        monkeypatch.setattr(s3_storage.client, "get_object", missing)
+        with pytest.raises(ClientError):
+            s3_storage.get(StorageLocation.from_url("s3://traps/missing.jpg"))
+        assert len(calls) == 1
+
+
+    def test_connection_errors_are_retried(self, s3_storage, monkeypatch):
+        s3_storage.put(StorageLocation.from_url("s3://traps/a.jpg"), b"a")
+        get_object = s3_storage.client.get_object
+        errors = [EndpointConnectionError(endpoint_url="https://s3"), ReadTimeoutError(endpoint_url="https://s3")]
+
+        def flaky_get_object(**kwargs):
+            if errors:
+                raise errors.pop(0)
+            return get_object(**kwargs)
+
+        monkeypatch.setattr(s3_storage.client, "get_object", flaky_get_object)
+        assert s3_storage.get(StorageLocation.from_url("s3://traps/a.jpg")) == b"a"
+        assert errors == []
+
+    def test_programming_errors_are_not_retried(self, s3_storage, monkeypatch):
+        calls = []
+
+        def broken(**kwargs):
+            calls.append(kwargs)
+            raise TypeError("unexpected keyword")
+
+        monkeypatch.setattr(s3_storage.client, "get_object", broken)
+        with pytest.raises(TypeError):
+            s3_storage.get(StorageLocation.from_url("s3://traps/a.jpg"))
+        assert len(calls) == 1
+
+    def test_empty_range_skips_request(self, s3_storage, monkeypatch):
+        monkeypatch.setattr(s3_storage.client, "get_object", lambda **kwargs: pytest.fail("unexpected request"))
+        assert s3_storage.get_range(StorageLocation.from_url("s3://traps/a.jpg"), 10, 0) == b""
+
+
+class TestOpenWrite:
+    """Test streamed S3 uploads."""
+
+    def test_multipart_upload(self, s3_storage, monkeypatch):
+        monkeypatch.setattr(s3_storage, "multipart_part_size", 5 * 1024 * 1024)
+        content = os.urandom(11 * 1024 * 1024)
+        location = StorageLocation.from_url("s3://traps/out/manifest.parquet")
+
+        with s3_storage.open_write(location) as stream:
+            for start in range(0, len(content), 1024 * 1024):
+                stream.write(content[start:start + 1024 * 1024])
+            assert len(s3_storage.client.list_multipart_uploads(Bucket="traps")["Uploads"]) == 1
+
+        assert s3_storage.get(location) == content
+        etag = s3_storage.client.head_object(Bucket="traps", Key="out/manifest.parquet")["ETag"]
+        assert etag.strip('"').endswith("-3")
+
+    def test_small_object_is_one_put(self, s3_storage):
+        location = StorageLocation.from_url("s3://traps/out/manifest.jsonl")
+        with s3_storage.open_write(location) as stream:
+            stream.write(b'{"crop_path": "a"}')
+        assert s3_storage.get(location) == b'{"crop_path": "a"}'
+        assert "Uploads" not in s3_storage.client.list_multipart_uploads(Bucket="traps")
+
+    def test_abort_discards_parts(self, s3_storage, monkeypatch):
+        monkeypatch.setattr(s3_storage, "multipart_part_size", 5 * 1024 * 1024)
+        location = StorageLocation.from_url("s3://traps/out/manifest.parquet")
+
+        with pytest.raises(RuntimeError), s3_storage.open_write(location) as stream:
+            stream.write(os.urandom(6 * 1024 * 1024))
+            raise RuntimeError
+
+        assert "Uploads" not in s3_storage.client.list_multipart_uploads(Bucket="traps")
+        with pytest.raises(ClientError):
+            s3_storage.get(location)
+
+
+class TestConcurrencyLimit:
+    """Test that get_many never exceeds the adapter's concurrency limit."""
+
+    def test_bounded(self, tmp_path):
+        class SlowStorage(LocalFSAdapter):
+            max_concurrency = 3
+
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self.active = 0
+                self.peak = 0
+                self.lock = threading.Lock()
+
+            def get(self, location):
+                with self.lock:
+                    self.active += 1
+                    self.peak = max(self.peak, self.active)
+                time.sleep(0.01)
+                with self.lock:
+                    self.active -= 1
+                return super().get(location)
+
+        storage = SlowStorage(base_path=str(tmp_path))
+        locations = [StorageLocation.from_url(f"file://in/{i}.jpg") for i in range(12)]
+        storage.put_many((location, b"x") for location in locations)
+
+        assert storage.get_many(locations) == [b"x"] * 12
+        assert storage.peak == 3
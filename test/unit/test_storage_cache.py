@@ -0,0 +1,158 @@
+"""
+Unit tests for the local read-through storage cache.
+"""
+
+import multiprocessing
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from src.munin.cloud.interfaces import StorageLocation
+from src.munin.cloud.storage import LocalFSAdapter, S3Adapter
+from src.munin.cloud.storage_cache import CachingStorageAdapter
+
+
+class CountingAdapter(LocalFSAdapter):
+    """Local adapter that counts reads reaching storage."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.gets = 0
+
+    def get(self, location):
+        self.gets += 1
+        return super().get(location)
+
+
+@pytest.fixture
+def remote(tmp_path):
+    return CountingAdapter(base_path=str(tmp_path / "remote"))
+
+
+def _cache(tmp_path, storage, **kwargs):
+    return CachingStorageAdapter(storage, str(tmp_path / "cache"), **kwargs)
+
+
+def _read_many(cache_dir, remote_dir, count):
+    cache = CachingStorageAdapter(LocalFSAdapter(base_path=remote_dir), cache_dir)
+    for i in range(count):
+        assert cache.get(StorageLocation.from_url(f"file://crops/{i % 4}.jpg")) == f"crop {i % 4}".encode()
+
+
+class TestCachingStorageAdapter:
+    """Test hits, validation and eviction."""
+
+    def test_repeated_reads_hit(self, tmp_path, remote):
+        location = StorageLocation.from_url("file://crops/a.jpg")
+        remote.put(location, b"crop a")
+        cache = _cache(tmp_path, remote)
+
+        assert [cache.get(location) for _ in range(3)] == [b"crop a"] * 3
+        assert remote.gets == 1
+        stats = cache.stats()
+        assert (stats['hits'], stats['misses'], stats['entries']) == (2, 1, 1)
+        assert stats['bytes_from_cache'] == 12
+
+    def test_changed_object_is_refetched(self, tmp_path, remote):
+        location = StorageLocation.from_url("file://manifest.jsonl")
+        remote.put(location, b"v1")
+        cache = _cache(tmp_path, remote)
+        assert cache.get(location) == b"v1"
+
+        remote.put(location, b"version 2")  # written by another process, bypassing the cache
+        assert cache.get(location) == b"version 2"
+        assert cache.stats()['stale'] == 1
+        assert remote.gets == 2
+
+    def test_put_invalidates(self, tmp_path, remote):
+        location = StorageLocation.from_url("file://a.jpg")
+        cache = _cache(tmp_path, remote, validate=False)
+        cache.put(location, b"one")
+        assert cache.get(location) == b"one"
+        cache.put(location, b"two")
+        assert cache.get(location) == b"two"
+
+    def test_open_write_invalidates_on_close(self, tmp_path, remote):
+        location = StorageLocation.from_url("file://manifest.jsonl")
+        cache = _cache(tmp_path, remote, validate=False)
+        cache.put(location, b"v1")
+        assert cache.get(location) == b"v1"
+
+        with cache.open_write(location) as stream:
+            stream.write(b"version 2")
+            assert cache.get(location) == b"v1"
+        assert cache.get(location) == b"version 2"
+
+    def test_identical_content_is_stored_once(self, tmp_path, remote):
+        cache = _cache(tmp_path, remote)
+        for name in ("a", "b"):
+            remote.put(StorageLocation.from_url(f"file://{name}.jpg"), b"same")
+            cache.get(StorageLocation.from_url(f"file://{name}.jpg"))
+
+        assert cache.stats()['entries'] == 2
+        assert cache.stats()['size_bytes'] == 4
+
+    def test_lru_eviction(self, tmp_path, remote):
+        cache = _cache(tmp_path, remote, max_size_mb=3.5 / 1024)  # room for three 1 KB objects
+        cache.SIZE_CHECK_INTERVAL = 1
+        locations = [StorageLocation.from_url(f"file://{i}.bin") for i in range(4)]
+        for i, location in enumerate(locations):
+            remote.put(location, bytes([i]) * 1024)
+
+        for location in locations[:3]:
+            cache.get(location)
+        cache.get(locations[0])  # most recently used
+        cache.get(locations[3])
+
+        stats = cache.stats()
+        assert stats['evictions'] == 1
+        assert stats['size_bytes'] <= 3 * 1024
+        remote.gets = 0
+        cache.get(locations[0])
+        assert remote.gets == 0
+        cache.get(locations[1])  # least recently used was evicted
+        assert remote.gets == 1
+
+    def test_get_range_uses_cached_content(self, tmp_path, remote):
+        location = StorageLocation.from_url("file://a.jpg")
+        remote.put(location, b"0123456789")
+        cache = _cache(tmp_path, remote)
+        assert cache.get_range(location, 2, 3) == b"234"
+        cache.get(location)
+        assert cache.get_range(location, 5, 100) == b"56789"
+
+    def test_shared_by_processes(self, tmp_path):
+        remote = LocalFSAdapter(base_path=str(tmp_path / "remote"))
+        for i in range(4):
+            remote.put(StorageLocation.from_url(f"file://crops/{i}.jpg"), f"crop {i}".encode())
+
+        context = multiprocessing.get_context("spawn")
+        workers = [context.Process(target=_read_many, args=(str(tmp_path / "cache"), str(tmp_path / "remote"), 20))
+                   for _ in range(3)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=60)
+        assert [worker.exitcode for worker in workers] == [0, 0, 0]
+
+        assert _cache(tmp_path, remote).stats()['entries'] == 4
+
+
+def test_s3_etag_validation(tmp_path, monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    with mock_aws():
+        boto3.client("s3", region_name="eu-north-1").create_bucket(
+            Bucket="traps", CreateBucketConfiguration={"LocationConstraint": "eu-north-1"}
+        )
+        s3 = S3Adapter(base_path="s3://traps", region="eu-north-1")
+        location = StorageLocation.from_url("s3://traps/crops/a.jpg")
+        s3.put(location, b"abc")
+        cache = _cache(tmp_path, s3)
+
+        assert cache.get(location) == b"abc"
+        assert cache.get(location) == b"abc"
+        s3.put(location, b"xyz")  # same size, new ETag
+        assert cache.get(location) == b"xyz"
+        assert (cache.stats()['hits'], cache.stats()['stale']) == (1, 1)
@@ -0,0 +1,95 @@
+"""
+Unit tests for streaming StorageAdapter.iter_list.
+"""
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from src.munin.cloud.interfaces import StorageAdapter, StorageLocation
+from src.munin.cloud.storage import LocalFSAdapter, S3Adapter
+
+FILES = ["cam1/a.jpg", "cam1/b.JPG", "cam1/night/c.png", "cam1/notes.txt", "cam1.jpeg", "cam2/d.Jpeg"]
+IMAGES = (".jpg", ".jpeg", ".png")
+
+
+class ListOnlyAdapter(StorageAdapter):
+    """Adapter that only implements the list-based API."""
+
+    def __init__(self, paths):
+        self.paths = paths
+
+    def list(self, location, pattern="*"):
+        return [StorageLocation.from_url(f"file://{path}") for path in self.paths]
+
+    def get(self, location):
+        raise NotImplementedError
+
+    def put(self, location, content):
+        raise NotImplementedError
+
+    def exists(self, location):
+        return False
+
+    def delete(self, location):
+        pass
+
+
+@pytest.fixture
+def local_storage(tmp_path):
+    storage = LocalFSAdapter(base_path=str(tmp_path))
+    for path in FILES:
+        storage.put(StorageLocation.from_url(f"file://input/{path}"), b"x")
+    return storage
+
+
+class TestLocalIterList:
+    """Test the local directory walk."""
+
+    def test_recursive_case_insensitive_in_path_order(self, local_storage):
+        paths = [f.path for f in local_storage.iter_list(StorageLocation.from_url("file://input"), IMAGES)]
+        assert paths == ["input/cam1.jpeg", "input/cam1/a.jpg", "input/cam1/b.JPG", "input/cam1/night/c.png",
+                         "input/cam2/d.Jpeg"]
+        assert paths == sorted(paths)
+
+    def test_non_recursive(self, local_storage):
+        paths = [f.path for f in local_storage.iter_list(StorageLocation.from_url("file://input/cam1"),
+                                                         recursive=False)]
+        assert paths == ["input/cam1/a.jpg", "input/cam1/b.JPG", "input/cam1/notes.txt"]
+
+    def test_missing_prefix_is_empty(self, local_storage):
+        assert list(local_storage.iter_list(StorageLocation.from_url("file://nothing"))) == []
+
+    def test_fallback_uses_list(self):
+        adapter = ListOnlyAdapter(["in/b.PNG", "in/a.jpg", "in/c.txt"])
+        assert [f.path for f in adapter.iter_list(StorageLocation.from_url("file://in"), IMAGES)] == \
+            ["in/a.jpg", "in/b.PNG"]
+
+
+class TestS3IterList:
+    """Test ListObjectsV2 pagination against a mocked bucket."""
+
+    @pytest.fixture
+    def s3_storage(self, monkeypatch):
+        monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+        monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+        with mock_aws():
+            client = boto3.client("s3", region_name="eu-north-1")
+            client.create_bucket(Bucket="traps", CreateBucketConfiguration={"LocationConstraint": "eu-north-1"})
+            for path in FILES:
+                client.put_object(Bucket="traps", Key=f"input/{path}", Body=b"x")
+            client.put_object(Bucket="traps", Key="input-other/e.jpg", Body=b"x")
+
+            storage = S3Adapter(base_path="s3://traps", region="eu-north-1")
+            storage.list_page_size = 2
+            yield storage
+
+    def test_pages_through_prefix(self, s3_storage):
+        urls = [f.url for f in s3_storage.iter_list(StorageLocation.from_url("s3://traps/input"), IMAGES)]
+        assert urls == ["s3://traps/input/cam1.jpeg", "s3://traps/input/cam1/a.jpg", "s3://traps/input/cam1/b.JPG",
+                        "s3://traps/input/cam1/night/c.png", "s3://traps/input/cam2/d.Jpeg"]
+
+    def test_non_recursive(self, s3_storage):
+        paths = [f.path for f in s3_storage.iter_list(StorageLocation.from_url("s3://traps/input/cam1"),
+                                                      recursive=False)]
+        assert paths == ["traps/input/cam1/a.jpg", "traps/input/cam1/b.JPG", "traps/input/cam1/notes.txt"]
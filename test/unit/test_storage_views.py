@@ -0,0 +1,98 @@
+"""
+Unit tests for zero-copy memory-mapped storage reads.
+"""
+
+import hashlib
+import io
+import threading
+
+import pytest
+from PIL import Image
+
+from src.common.utils.file_utils import ViewReader, map_file
+from src.munin.cloud.interfaces import StorageLocation
+from src.munin.cloud.storage import LocalFSAdapter
+from src.munin.exif_extractor import exif_from_bytes
+
+
+def _jpeg_bytes(size=(320, 240)):
+    buffer = io.BytesIO()
+    Image.effect_noise(size, 60).convert("RGB").save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return LocalFSAdapter(base_path=str(tmp_path))
+
+
+class TestGetView:
+    """Test LocalFSAdapter.get_view."""
+
+    def test_matches_get(self, storage):
+        location = StorageLocation.from_url("file://input/a.jpg")
+        storage.put(location, _jpeg_bytes())
+
+        view = storage.get_view(location)
+        assert view.readonly
+        assert view == storage.get(location)
+        assert hashlib.sha256(view).hexdigest() == hashlib.sha256(storage.get(location)).hexdigest()
+
+    def test_read_only(self, storage):
+        location = StorageLocation.from_url("file://a.bin")
+        storage.put(location, b"abc")
+        view = storage.get_view(location)
+        with pytest.raises(TypeError):
+            view[0] = 0
+
+        copy = bytearray(view)
+        copy[0] = ord("x")
+        assert copy == b"xbc"
+        assert storage.get(location) == b"abc"
+
+    def test_empty_file(self, tmp_path):
+        (tmp_path / "empty").write_bytes(b"")
+        assert map_file(tmp_path / "empty") == b""
+
+    def test_missing_file(self, storage):
+        with pytest.raises(FileNotFoundError):
+            storage.get_view(StorageLocation.from_url("file://missing.jpg"))
+
+
+class TestViewReader:
+    """Test decoding directly from a view."""
+
+    def test_decode(self, storage):
+        location = StorageLocation.from_url("file://a.jpg")
+        storage.put(location, _jpeg_bytes())
+
+        image = Image.open(ViewReader(storage.get_view(location)))
+        image.load()
+        assert image.size == (320, 240)
+        assert exif_from_bytes(storage.get_view(location)) == {}
+
+    def test_independent_positions(self):
+        view = memoryview(b"0123456789")
+        readers = [ViewReader(view) for _ in range(2)]
+        readers[0].seek(4)
+        assert readers[0].read(3) == b"456"
+        assert readers[1].read(2) == b"01"
+        assert readers[0].seek(-2, io.SEEK_END) == 8
+        assert readers[0].read() == b"89"
+
+    def test_concurrent_decodes(self, storage):
+        location = StorageLocation.from_url("file://a.jpg")
+        storage.put(location, _jpeg_bytes())
+        view = storage.get_view(location)
+        expected = Image.open(io.BytesIO(storage.get(location))).tobytes()
+        results = []
+
+        def decode():
+            results.append(Image.open(ViewReader(view)).tobytes() == expected)
+
+        threads = [threading.Thread(target=decode) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert results == [True] * 4
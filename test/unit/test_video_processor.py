@@ -0,0 +1,338 @@
+"""
+Unit tests for frame sampling and streaming in OptimizedVideoProcessor.
+"""
+
+import os
+import threading
+from unittest.mock import MagicMock
+
+import av
+import cv2
+import numpy as np
+import pytest
+import torch
+from PIL import Image
+
+from src.common.exceptions import ValidationError
+from src.common.utils.shared_ring import SharedFrameRing
+from src.munin import video_processor
+from src.munin.video_processor import (
+    OptimizedVideoProcessor,
+    VideoProcessingConfig,
+    select_activity_peaks,
+)
+from src.munin.wildlife_detector import Detection
+
+FPS = 30
+SECONDS = 12
+
+
+def _encode(path, render):
+    """Encode SECONDS of H.264 with a keyframe every 2 seconds and B-frames."""
+    container = av.open(str(path), mode="w")
+    stream = container.add_stream("libx264", rate=FPS)
+    stream.width, stream.height = 160, 120
+    stream.pix_fmt = "yuv420p"
+    stream.codec_context.gop_size = 2 * FPS
+    stream.options = {"bf": "2", "sc_threshold": "0"}
+    for i in range(SECONDS * FPS):
+        for packet in stream.encode(av.VideoFrame.from_ndarray(render(i), format="rgb24")):
+            container.mux(packet)
+    for packet in stream.encode():
+        container.mux(packet)
+    container.close()
+    return path
+
+
+@pytest.fixture(scope="module")
+def video_path(tmp_path_factory):
+    """Clip whose brightness changes every frame."""
+    return _encode(
+        tmp_path_factory.mktemp("video") / "clip.mp4",
+        lambda i: np.full((120, 160, 3), (i * 3) % 255, dtype=np.uint8),
+    )
+
+
+@pytest.fixture(scope="module")
+def animal_pass_path(tmp_path_factory):
+    """Static scene with a bright block crossing it between 4.3 s and 4.8 s."""
+    background = np.random.default_rng(0).integers(60, 120, (120, 160, 3), dtype=np.uint8)
+
+    def render(i):
+        image = background.copy()
+        t = i / FPS
+        if 4.3 <= t <= 4.8:
+            x = int((t - 4.3) / 0.5 * 130)
+            image[40:80, x:x + 30] = 240
+        return image
+
+    return _encode(tmp_path_factory.mktemp("video") / "pass.mp4", render)
+
+
+def _sample(video_path, strategy, interval=1.0, target_frames=10):
+    processor = OptimizedVideoProcessor(VideoProcessingConfig(
+        sample_interval_seconds=interval, sampling_strategy=strategy, use_gpu_decoding=False
+    ))
+    stats = {"decoded": 0}
+    with av.open(str(video_path)) as container:
+        stream = container.streams.video[0]
+        frames = processor._extract_frames_gpu_optimized(
+            container, stream, int(FPS * interval), target_frames, stats
+        )
+    return frames, stats
+
+
+def test_sequential_extracts_target_frames(video_path):
+    frames, _ = _sample(video_path, "sequential")
+
+    assert [f.frame_number for f in frames] == list(range(0, 10 * FPS, FPS))
+
+
+def test_seek_matches_sequential_with_fewer_decodes(video_path):
+    sequential, sequential_stats = _sample(video_path, "sequential", interval=3.0, target_frames=4)
+    seek, seek_stats = _sample(video_path, "seek", interval=3.0, target_frames=4)
+
+    assert len(seek) == len(sequential) == 4
+    for a, b in zip(seek, sequential):
+        assert abs(a.frame_number - b.frame_number) <= 1
+    assert seek_stats["decoded"] < sequential_stats["decoded"]
+
+
+def test_keyframe_strategy_decodes_only_keyframes(video_path):
+    frames, stats = _sample(video_path, "keyframe", interval=2.0, target_frames=6)
+
+    assert [f.frame_number for f in frames] == list(range(0, 12 * FPS, 2 * FPS))
+    assert stats["decoded"] == len(frames)
+
+
+def test_benchmark_sampling_reports_each_strategy(video_path):
+    processor = OptimizedVideoProcessor(VideoProcessingConfig(sample_interval_seconds=3.0, use_gpu_decoding=False))
+
+    report = processor.benchmark_sampling(video_path, ["sequential", "seek"])
+
+    assert set(report) == {"sequential", "seek"}
+    assert report["seek"]["frames_decoded"] < report["sequential"]["frames_decoded"]
+
+
+def test_stream_batch_size_respects_memory_limit():
+    processor = OptimizedVideoProcessor(VideoProcessingConfig(batch_size=32, memory_limit_gb=0.5, use_gpu_decoding=False))
+
+    # 4K RGB frame plus its PIL copy is ~50 MB; two prefetched batches plus
+    # the one being detected and the one being saved must fit in 0.5 GB
+    assert processor._stream_batch_size(3840, 2160) == 2
+    assert processor._stream_batch_size(160, 120) == 32
+
+
+def test_process_video_streams_batches_to_detector_and_disk(video_path, tmp_path):
+    processor = OptimizedVideoProcessor(VideoProcessingConfig(
+        sample_interval_seconds=1.0, batch_size=4, use_gpu_decoding=False
+    ))
+    detector = MagicMock(spec=["predict_batch"])
+    detector.predict_batch.side_effect = lambda images: [len(images)]
+
+    result = processor.process_video_optimized(video_path, detector, tmp_path / "frames")
+
+    assert result["frames_extracted"] == SECONDS
+    assert result["stream_batch_size"] == 4
+    assert result["detections"] == [4, 4, 4]
+    saved = sorted(p.name for p in (tmp_path / "frames").iterdir())
+    assert saved == [f"clip_frame_{i:06d}.jpg" for i in range(SECONDS)]
+
+
+def test_inference_size_letterboxes_in_decoder(video_path):
+    processor = OptimizedVideoProcessor(VideoProcessingConfig(
+        sample_interval_seconds=2.0, inference_size=64, use_gpu_decoding=False
+    ))
+    with av.open(str(video_path)) as container:
+        stream = container.streams.video[0]
+        frames = list(processor._iter_frames(container, stream, 2 * FPS, 3, keep_full_resolution=False))
+
+    frame = frames[0]
+    assert frame.image is None
+    assert frame.model_image.shape == (64, 64, 3)
+    assert frame.letterbox_scale == pytest.approx(0.4)
+    assert frame.letterbox_pad == (0, 8)
+    assert (frame.model_image[:8] == 114).all()
+    assert frame.to_source_bbox([16, 18, 32, 28]) == pytest.approx([40, 25, 80, 50])
+
+
+def test_full_resolution_kept_only_when_saving(video_path, tmp_path):
+    processor = OptimizedVideoProcessor(VideoProcessingConfig(
+        sample_interval_seconds=4.0, inference_size=64, use_gpu_decoding=False
+    ))
+    detector = MagicMock(spec=["predict"])
+    detector.predict.side_effect = lambda image: [Detection("moose", 0.9, [0, 8, 64, 56])]
+
+    result = processor.process_video_optimized(video_path, detector)
+
+    assert result["full_resolution_kept"] is False
+    assert detector.predict.call_args.args[0].size == (64, 64)
+    assert result["detections"][0].bbox == pytest.approx([0, 0, 160, 120])
+
+    saved = processor.process_video_optimized(video_path, detector, tmp_path / "frames")
+    assert saved["full_resolution_kept"] is True
+    with Image.open(tmp_path / "frames" / "clip_frame_000000.jpg") as image:
+        assert image.size == (160, 120)
+
+
+def test_select_activity_peaks_spaces_strongest_peaks():
+    activity = [(0.0, 0.0), (0.5, 0.2), (0.6, 0.3), (0.7, 0.1), (2.0, 0.05), (3.0, 0.4), (3.1, 0.0)]
+
+    assert select_activity_peaks(activity, budget=2, min_gap_seconds=1.0) == [0.6, 3.0]
+    assert select_activity_peaks(activity, budget=5, min_gap_seconds=1.0, threshold=0.1) == [0.6, 3.0]
+    assert select_activity_peaks([(0.0, 0.0), (1.0, 0.0)], budget=3, min_gap_seconds=1.0) == [0.0]
+
+
+@pytest.mark.parametrize("source", ["auto", "luminance"])
+def test_adaptive_sampling_catches_short_pass(animal_pass_path, source):
+    fixed, _ = _sample(animal_pass_path, "seek", interval=1.0, target_frames=SECONDS)
+    processor = OptimizedVideoProcessor(VideoProcessingConfig(
+        sampling_strategy="adaptive", activity_source=source, use_gpu_decoding=False
+    ))
+    with av.open(str(animal_pass_path)) as container:
+        stream = container.streams.video[0]
+        adaptive = list(processor._iter_frames(container, stream, FPS, 4))
+
+    in_pass = range(int(4.3 * FPS), int(4.8 * FPS) + 1)
+    assert not any(f.frame_number in in_pass for f in fixed)
+    assert [f.frame_number in in_pass for f in adaptive] == [True]
+
+
+def test_process_pool_streams_results_per_video(video_path, animal_pass_path):
+    processor = OptimizedVideoProcessor(VideoProcessingConfig(
+        sample_interval_seconds=4.0, parallel_workers=2, use_gpu_decoding=False, multi_video_mode="process"
+    ))
+
+    results = list(processor.iter_process_videos([video_path, animal_pass_path]))
+
+    assert {path for path, _ in results} == {str(video_path), str(animal_pass_path)}
+    for _, result in results:
+        assert result["frames_extracted"] == 3
+        assert result["worker_pid"] != os.getpid()
+
+
+def test_worker_initializer_loads_warm_model_and_caps_threads(monkeypatch):
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        monkeypatch.setenv(var, "8")
+    cv2_threads, torch_threads = cv2.getNumThreads(), torch.get_num_threads()
+    model = object()
+    get_model = MagicMock(return_value=model)
+    monkeypatch.setattr(video_processor.ModelCache, "get_model", get_model)
+
+    try:
+        video_processor._init_video_worker(
+            VideoProcessingConfig(worker_threads=1, model_device="cpu", use_gpu_decoding=False), "detector.pt"
+        )
+        assert cv2.getNumThreads() == 1
+        assert torch.get_num_threads() == 1
+        assert os.environ["OMP_NUM_THREADS"] == "1"
+    finally:
+        cv2.setNumThreads(cv2_threads)
+        torch.set_num_threads(torch_threads)
+
+    get_model.assert_called_once_with("detector.pt", "cpu")
+    assert video_processor._worker_state["detector"].model is model
+
+
+def test_shared_decode_mode_detects_from_shared_slots(video_path, animal_pass_path):
+    processor = OptimizedVideoProcessor(VideoProcessingConfig(
+        sample_interval_seconds=2.0, inference_size=64, multi_video_mode="shared_decode",
+        parallel_workers=2, shared_ring_slots=2, use_gpu_decoding=False
+    ))
+    seen = []
+
+    def predict(image):
+        seen.append(image.size)
+        return [Detection("moose", 0.9, [0, 8, 64, 56])]
+
+    detector = MagicMock(spec=["predict"])
+    detector.predict.side_effect = predict
+
+    results = dict(processor.iter_process_videos([video_path, animal_pass_path], detector))
+
+    assert set(results) == {str(video_path), str(animal_pass_path)}
+    for result in results.values():
+        assert result["frames_extracted"] == result["detector_calls"] == 6
+        assert result["detections"][0].bbox == pytest.approx([0, 0, 160, 120])
+    assert seen == [(64, 64)] * 12
+
+
+def test_shared_decode_requires_inference_size(video_path):
+    processor = OptimizedVideoProcessor(VideoProcessingConfig(multi_video_mode="shared_decode", use_gpu_decoding=False))
+
+    with pytest.raises(ValidationError):
+        list(processor.iter_process_videos([video_path]))
+
+
+def test_defaults_keep_sequential_sampling_and_threads():
+    """Seek sampling and the process pool are opt-in."""
+    config = VideoProcessingConfig()
+    assert config.sampling_strategy == "sequential"
+    assert config.multi_video_mode == "thread"
+
+
+def _run_with_deadline(func, seconds=60):
+    """Run func on a thread and fail instead of hanging the suite."""
+    outcome = {}
+
+    def target():
+        try:
+            outcome["result"] = func()
+        except BaseException as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(seconds)
+    assert not thread.is_alive(), "shared decode hung"
+    return outcome
+
+
+def _recording_ring_close(monkeypatch):
+    """Record how many slots are free when the ring is closed."""
+    free_at_close = []
+    close = SharedFrameRing.close
+
+    def recording_close(ring):
+        free_at_close.append(ring._free.qsize())
+        close(ring)
+
+    monkeypatch.setattr(SharedFrameRing, "close", recording_close)
+    return free_at_close
+
+
+def test_shared_decode_worker_failure_releases_slots(video_path, animal_pass_path, monkeypatch):
+    """A frame that fails after taking a slot gives the slot back, so the next video does not block."""
+    def failing_write(ring, slot, frame):
+        raise ValueError("write failed")
+
+    monkeypatch.setattr(SharedFrameRing, "write", failing_write)  # inherited by the forked workers
+    free_at_close = _recording_ring_close(monkeypatch)
+    processor = OptimizedVideoProcessor(VideoProcessingConfig(
+        sample_interval_seconds=2.0, inference_size=64, multi_video_mode="shared_decode",
+        parallel_workers=1, shared_ring_slots=1, use_gpu_decoding=False, worker_start_method="fork"
+    ))
+
+    outcome = _run_with_deadline(lambda: dict(processor.iter_process_videos([video_path, animal_pass_path])))
+
+    assert outcome["result"] == {
+        str(video_path): {"error": "write failed"},
+        str(animal_pass_path): {"error": "write failed"},
+    }
+    assert free_at_close == [1]
+
+
+def test_shared_decode_detector_failure_does_not_hang(video_path, animal_pass_path, monkeypatch):
+    """When detection fails, queued frames are released so the decode workers can finish."""
+    free_at_close = _recording_ring_close(monkeypatch)
+    processor = OptimizedVideoProcessor(VideoProcessingConfig(
+        sample_interval_seconds=2.0, inference_size=64, multi_video_mode="shared_decode",
+        parallel_workers=2, shared_ring_slots=2, use_gpu_decoding=False
+    ))
+    detector = MagicMock(spec=["predict"])
+    detector.predict.side_effect = RuntimeError("detector failed")
+
+    outcome = _run_with_deadline(lambda: dict(processor.iter_process_videos([video_path, animal_pass_path], detector)))
+
+    assert isinstance(outcome["error"], RuntimeError)
+    assert free_at_close == [2]